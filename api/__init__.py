@@ -0,0 +1 @@
+# Marks api/ as a package.
\ No newline at end of file
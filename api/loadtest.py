@@ -0,0 +1,131 @@
+import json
+import time
+import logging
+import argparse
+import threading
+import http.client
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Slices requested for every mart in addition to the whole mart, unknown filter columns answer 400
+SLICES = ("", "region=Kyiv", "year=2022", "report=Theft", "region=Kyiv,Lviv&year=2021,2022")
+FORMATS = ("json", "csv", "arrow")
+
+
+def percentile(values: list[float], q: float) -> float:
+    "Nearest-rank percentile of sorted values."
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Client:
+    "Keep-alive connection per thread, remembering ETags of responses for conditional requests."
+
+    def __init__(self, host: str, port: int, conditional: bool, use_gzip: bool) -> None:
+        self.host = host
+        self.port = port
+        self.conditional = conditional
+        self.use_gzip = use_gzip
+        self.etags: dict[str, str] = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def get(self, path: str) -> tuple[int, int, float]:
+        """Requests a path.
+
+        Returns:
+            tuple[int, int, float]: Status, body size (bytes) and latency (seconds).
+        """
+
+        if not hasattr(self.local, "connection"):
+            self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+        headers = {}
+        if self.use_gzip:
+            headers["Accept-Encoding"] = "gzip"
+        if self.conditional and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+
+        start = time.perf_counter()
+        try:
+            self.local.connection.request("GET", path, headers=headers)
+            response = self.local.connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self.local.connection.close()
+            del self.local.connection
+            return 0, 0, time.perf_counter() - start
+        latency = time.perf_counter() - start
+
+        etag = response.getheader("ETag")
+        if etag is not None:
+            with self.lock:
+                self.etags[path] = etag
+
+        return response.status, len(body), latency
+
+
+def build_paths(client: Client) -> list[str]:
+    "Lists every mart in every format and slice, using the /marts index of the server."
+    connection = http.client.HTTPConnection(client.host, client.port, timeout=60)
+    connection.request("GET", "/marts")
+    marts = json.loads(connection.getresponse().read())["marts"]
+    connection.close()
+
+    paths = []
+    for mart in marts:
+        columns = set(mart["columns"])
+        for query in SLICES:
+            # Skip slices on columns the mart does not have
+            filters = {part.split("=")[0] for part in query.split("&") if part}
+            if "year" in filters and not {"year", "date"} & columns:
+                continue
+            if filters - {"year"} - columns:
+                continue
+            for fmt in FORMATS:
+                paths.append(f"/marts/{mart['name']}?format={fmt}" + (f"&{query}" if query else ""))
+
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of the mart API (api/server.py), which must be running.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the API (default: http://127.0.0.1:8000).")
+    parser.add_argument("--requests", type=int, default=2000, help="Number of requests (default: 2000).")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients (default: 16).")
+    parser.add_argument("--conditional", action="store_true", help="Revalidate with If-None-Match (expects 304).")
+    parser.add_argument("--gzip", action="store_true", help="Accept gzip-encoded responses.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    url = urlsplit(args.url)
+    client = Client(url.hostname or "127.0.0.1", url.port or 80, args.conditional, args.gzip)
+    paths = build_paths(client)
+    logger.info(f"Requesting {len(paths)} paths {args.requests:,} times with {args.concurrency} clients.")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(client.get, (paths[i % len(paths)] for i in range(args.requests))))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _, _ in results)
+    latencies = sorted(latency * 1000 for _, _, latency in results)
+    received = sum(size for _, size, _ in results)
+
+    logger.info(f"Completed {len(results):,} requests in {elapsed:.2f}s ({len(results) / elapsed:,.0f} req/s).")
+    logger.info(f"Statuses: {', '.join(f'{status}: {count:,}' for status, count in sorted(statuses.items()))}.")
+    logger.info(f"Received: {received / 1024**2:,.1f} MB.")
+    logger.info(
+        "Latency (ms): "
+        f"p50 {percentile(latencies, 0.50):.1f}, "
+        f"p95 {percentile(latencies, 0.95):.1f}, "
+        f"p99 {percentile(latencies, 0.99):.1f}, "
+        f"max {latencies[-1]:.1f}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+import io
+import os
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARTS_DIR = os.path.join(project_root, "data", "marts")
+
+# Response formats (query parameter 'format') and their content types
+FORMATS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Query parameters filtering rows of a mart, values are repeated or comma separated
+FILTERS = ("region", "year", "report")
+
+# Years accepted by the 'year' filter (years of dates), others answer 400
+YEAR_RANGE = (1, 9999)
+
+# Smaller bodies are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# Default size of the in-memory cache of rendered responses (bytes)
+CACHE_MAX_BYTES = 64 * 1024**2
+
+# Clients may keep responses, but must revalidate them (conditional GET with ETag)
+CACHE_CONTROL = "public, no-cache"
+
+
+class RequestError(Exception):
+    "Client error, answered with its HTTP status and message."
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MartStore:
+    """Reads marts (parquet files of the marts directory) on first request and keeps them in memory,
+    reloading a mart when its file changes, e.g. after a pipeline run.
+
+    Arrow IPC copies (.arrow) are memory-mapped when present and not older than the parquet file,
+    as in the app. Each mart is identified by the sha256 of the file it is read from,
+    which ETags are derived from.
+    """
+
+    def __init__(self, marts_dir: str = MARTS_DIR) -> None:
+        self.marts_dir = marts_dir
+        self._marts: dict[str, tuple[tuple[str, int, int], str, pa.Table]] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        "Returns names of available marts, e.g. 'region-total'."
+        return sorted(f[:-len(".parquet")] for f in os.listdir(self.marts_dir) if f.endswith(".parquet"))
+
+    def get(self, name: str) -> tuple[str, pa.Table]:
+        """Returns content hash and data of a mart.
+
+        Args:
+            name (str): Mart name, i.e. parquet file name without extension.
+
+        Raises:
+            RequestError: If the mart does not exist.
+
+        Returns:
+            tuple[str, pa.Table]: sha256 of the file read (.arrow or .parquet) and mart data.
+        """
+
+        # Only listed names are turned into paths, e.g. '../' never reaches the filesystem
+        if name not in self.names():
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Mart '{name}' does not exist.")
+
+        path = os.path.join(self.marts_dir, f"{name}.parquet")
+        ipc_path = os.path.join(self.marts_dir, f"{name}.arrow")
+        if os.path.exists(ipc_path) and os.path.getmtime(ipc_path) >= os.path.getmtime(path):
+            path = ipc_path
+        stat = os.stat(path)
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._marts.get(name)
+            if cached is not None and cached[0] == signature:
+                return cached[1], cached[2]
+
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    digest.update(chunk)
+
+            if path == ipc_path:
+                table = feather.read_table(path, memory_map=True)
+            else:
+                table = pq.read_table(path)
+
+            self._marts[name] = (signature, digest.hexdigest(), table)
+            logger.info(f"Loaded mart '{name}' ({table.num_rows:,} rows).")
+
+            return digest.hexdigest(), table
+
+
+class ResponseCache:
+    "Thread-safe LRU cache of rendered response bodies, bounded by their total size."
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        "Returns body and its content encoding ('gzip' or 'identity'), None if not cached."
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: bytes, encoding: str) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key)[0])
+            self._entries[key] = (body, encoding)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def parse_filters(query: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Collects filter values of the query string, e.g. '?region=Kyiv,Lviv&year=2022'.
+
+    Returns:
+        dict[str, list[str]]: Sorted unique values of each filter present in the query.
+    """
+
+    filters = {}
+    for name in FILTERS:
+        values = {v.strip() for raw in query.get(name, []) for v in raw.split(",") if v.strip()}
+        if values:
+            filters[name] = sorted(values)
+
+    return filters
+
+
+def validate_filters(table: pa.Table, filters: dict[str, list[str]]) -> None:
+    """Checks that a mart can be filtered, before a cached or '304 Not Modified' response could hide the error.
+
+    Raises:
+        RequestError: If the mart has no column to filter on or a year is not a number in YEAR_RANGE.
+    """
+
+    for name, values in filters.items():
+        if name == "year":
+            try:
+                years = [int(v) for v in values]
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "'year' must be a number.") from None
+            # Larger numbers do not fit the int64 filter array (OverflowError)
+            if not all(YEAR_RANGE[0] <= year <= YEAR_RANGE[1] for year in years):
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"'year' must be between {YEAR_RANGE[0]} and {YEAR_RANGE[1]}.")
+            if "year" not in table.column_names and "date" not in table.column_names:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Mart has neither 'year' nor 'date' column.")
+        elif name not in table.column_names:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Mart has no '{name}' column.")
+
+
+def filter_table(table: pa.Table, filters: dict[str, list[str]]) -> pa.Table:
+    "Keeps rows matching every (validated) filter, 'year' matches a 'year' column or the year of 'date'."
+
+    mask = None
+    for name, values in filters.items():
+        if name == "year":
+            years = pa.array([int(v) for v in values], pa.int64())
+            if "year" in table.column_names:
+                column = pc.cast(table["year"], pa.int64())
+            else:
+                column = pc.cast(pc.year(table["date"]), pa.int64())
+            condition = pc.is_in(column, value_set=years)
+        else:
+            condition = pc.is_in(pc.cast(table[name], pa.string()), value_set=pa.array(values, pa.string()))
+
+        mask = condition if mask is None else pc.and_(mask, condition)
+
+    return table if mask is None else table.filter(mask)
+
+
+def json_default(value: Any) -> str:
+    "Serializes dates and timestamps of marts as ISO 8601 strings."
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Checks whether an Accept-Encoding header allows a gzip response.
+
+    Codings are weighted by q-values (e.g. 'gzip;q=0' forbids gzip),
+    '*' covers codings that are not listed.
+
+    Args:
+        accept_encoding (str): Accept-Encoding header, empty if missing.
+
+    Returns:
+        bool: True if gzip has a q-value above 0.
+    """
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+def render(table: pa.Table, fmt: str) -> bytes:
+    """Serializes mart rows into the requested format.
+
+    Args:
+        table (pa.Table): Mart rows.
+        fmt (str): Key of FORMATS.
+
+    Returns:
+        bytes: Response body.
+    """
+
+    if fmt == "csv":
+        buffer = io.BytesIO()
+        pv.write_csv(table, buffer)
+        return buffer.getvalue()
+
+    if fmt == "arrow":
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    return json.dumps(
+        {"columns": table.column_names, "rows": table.num_rows, "data": table.to_pylist()},
+        default=json_default,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+class MartRequestHandler(BaseHTTPRequestHandler):
+    """Serves marts read-only:
+
+    - GET /marts >>> names, row counts, columns and ETags of all marts (JSON);
+    - GET /marts/<name>?format=json|csv|arrow&region=...&year=...&report=... >>> mart rows.
+
+    Responses carry an ETag derived from the mart content hash and the request, so clients
+    revalidate with If-None-Match and get '304 Not Modified' until the mart changes.
+    """
+
+    # Keep-alive connections, every response has a Content-Length
+    protocol_version = "HTTP/1.1"
+    server: "MartServer"
+
+    def do_GET(self) -> None:
+        self.respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self.respond(send_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def respond(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        try:
+            if parts == ["marts"] or not parts:
+                etag, content_type, build = self.index()
+            elif len(parts) == 2 and parts[0] == "marts":
+                etag, content_type, build = self.mart(parts[1], parse_qs(url.query))
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown path '{url.path}', see /marts.")
+        except RequestError as e:
+            body = json.dumps({"error": str(e)}).encode("utf-8")
+            self.send(e.status, body, {"Content-Type": FORMATS["json"]}, send_body)
+            return
+
+        use_gzip = accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        # Each representation (plain or gzip) has its own strong ETag
+        etag = f'"{etag}-gzip"' if use_gzip else f'"{etag}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+        if_none_match = self.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            self.send(HTTPStatus.NOT_MODIFIED, b"", headers, send_body=False)
+            return
+
+        entry = self.server.cache.get(etag)
+        if entry is None:
+            body, encoding = build(), "identity"
+            if use_gzip and len(body) >= GZIP_MIN_BYTES:
+                body, encoding = gzip.compress(body, compresslevel=6), "gzip"
+            self.server.cache.put(etag, body, encoding)
+        else:
+            body, encoding = entry
+
+        headers["Content-Type"] = content_type
+        if encoding == "gzip":
+            headers["Content-Encoding"] = "gzip"
+        self.send(HTTPStatus.OK, body, headers, send_body)
+
+    def index(self) -> tuple[str, str, Any]:
+        "Lists marts, the ETag covers content hashes of all marts."
+        marts = []
+        for name in self.server.store.names():
+            sha256, table = self.server.store.get(name)
+            marts.append({"name": name, "rows": table.num_rows, "columns": table.column_names, "etag": sha256[:32]})
+
+        etag = hashlib.sha256("".join(m["etag"] for m in marts).encode()).hexdigest()[:32]
+        body = json.dumps({"formats": list(FORMATS), "filters": list(FILTERS), "marts": marts}).encode("utf-8")
+
+        return etag, FORMATS["json"], lambda: body
+
+    def mart(self, name: str, query: dict[str, list[str]]) -> tuple[str, str, Any]:
+        "Validates mart request, rows are only filtered and rendered if not cached."
+        fmt = query.get("format", ["json"])[-1]
+        if fmt not in FORMATS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown format '{fmt}', use one of: {', '.join(FORMATS)}.")
+
+        sha256, table = self.server.store.get(name)
+        filters = parse_filters(query)
+        validate_filters(table, filters)
+
+        request_key = json.dumps([sha256, fmt, filters], sort_keys=True)
+        etag = hashlib.sha256(request_key.encode()).hexdigest()[:32]
+
+        return etag, FORMATS[fmt], lambda: render(filter_table(table, filters), fmt)
+
+    def send(self, status: HTTPStatus, body: bytes, headers: dict[str, str], send_body: bool) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+
+class MartServer(ThreadingHTTPServer):
+    "Threaded HTTP server sharing one mart store and response cache between request threads."
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], marts_dir: str = MARTS_DIR, cache_bytes: int = CACHE_MAX_BYTES) -> None:
+        super().__init__(address, MartRequestHandler)
+        self.store = MartStore(marts_dir)
+        self.cache = ResponseCache(cache_bytes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serves marts of the data/marts directory over HTTP (read-only).")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000).")
+    parser.add_argument("--marts-dir", default=MARTS_DIR, help="Directory with mart parquet files.")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_MAX_BYTES // 1024**2, help="Size of the response cache (MB).")
+    parser.add_argument("--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    server = MartServer((args.host, args.port), args.marts_dir, args.cache_mb * 1024**2)
+    logger.info(f"Serving marts of '{args.marts_dir}' at http://{args.host}:{server.server_port}/marts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,11 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-
-from src.visualizations import generate_events_barchart
-from src.visualizations import generate_reports_scatterplot
-from src.visualizations import generate_reports_piechart
-from src.visualizations import generate_weapons_scatterplot
-from src.visualizations import generate_region_total_table
-from src.visualizations import generate_weaponcategory_total_table
-from src.visualizations import generate_rank_region_population
-from src.visualizations import generate_region_total_linechart
-from src.visualizations import generate_region_weapons_polarchart
-from src.visualizations import generate_region_report_10y_linechart
+
+from src import visualizations as viz
 from src.utils import modification_date  
+from src.utils import fragment
 from src.utils import current_total_records  
+from src.utils import load_startup_data
+from src.utils import insight_int, insight_float, insight_str
 
 
 # ========================#
@@ -48,19 +40,50 @@ font_family = 'Montserrat, sans-serif'
 # ====================#
 # --------DATA--------#
 
-region_total = pd.read_parquet("data/marts/region-total.parquet").astype({"region":"str"})
-top = region_total.nlargest(5, "total")
-bot = region_total.nsmallest(5, "total")
+# All marts are read concurrently once per process
+data = load_startup_data()
+
+region_total = data["region-total"].astype({"region":"str"})
 
-model_weaponcategory_total = pd.read_parquet("data/marts/weaponcategory-total.parquet").astype({"weaponcategory":"str"}).set_index('weaponcategory')
-model_region_year_total = pd.read_parquet("data/marts/region-year-total.parquet").astype({"region":"str"})
-date_report_total = pd.read_parquet("data/marts/date-report-total.parquet").astype({"report":"str"})
-# population = pd.read_csv("data/raw/ua-population.csv").iloc[:,[0,-2,-1]]
+model_weaponcategory_total = data["weaponcategory-total"].astype({"weaponcategory":"str"}).set_index('weaponcategory')
+date_report_total = data["date-report-total"].astype({"report":"str"})
+region_rate_ranks = (
+    data["region-year-per-capita"]
+    .astype({"region":"str"})
+    .drop_duplicates("region")
+    .set_index("region")["rate_rank"]
+    .sort_values(kind="stable")
+)
 
 # File modification year
 current_date = modification_date("data/marts/region-total.parquet","date")
 
 
+# =========================#
+# --------FRAGMENTS--------#
+
+# Widgets and the charts depending on them, changing a widget reruns only its fragment
+
+@fragment
+def daily_reports_scatterplot():
+    # Narrower ranges are drawn at full resolution
+    first_yr, last_yr = st.slider(
+        label='Years',
+        min_value=1991,
+        max_value=int(modification_date("data/marts/region-total.parquet",'year')),
+        value=(1991, int(modification_date("data/marts/region-total.parquet",'year'))),
+        label_visibility='collapsed',
+        )
+    viz.generate_reports_scatterplot('daily', years=(first_yr, last_yr))
+
+
+@fragment
+def reports_piechart():
+    year = st.selectbox(label='', options=range(1991, int(modification_date("data/marts/region-total.parquet",'year'))+1), label_visibility='hidden')
+
+    viz.generate_reports_piechart(year)
+
+
 # ====================#
 # --------PAGE--------#
 
@@ -94,7 +117,7 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
     # --------SECTION 1--------#
 
     # Barchart
-    generate_events_barchart()
+    viz.generate_events_barchart()
 
 
     # =========================#
@@ -179,28 +202,18 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
     
     with sec3_col1:
         
-        generate_region_total_table(region_total.set_index('region'))
+        viz.generate_region_total_table(region_total.set_index('region'))
         
     with sec3_col2:
         
-        total_prev = (
-            model_region_year_total[model_region_year_total["date"].dt.year < 2014]
-            .groupby(["region"])["total"]
-            .sum()
-            .reset_index()["total"]
-            .sum()
-        )
-        total_2014 = (
-            model_region_year_total[model_region_year_total["date"].dt.year == 2014]
-            .groupby(["region"])["total"]
-            .sum()
-            .reset_index()["total"]
-            .sum()
-        )
+        # Figures are precomputed by the insights model (data/models/insights.sql)
+        total_prev = insight_int("records_before_2014")
+        total_2014 = insight_int("records_2014")
         pct_diff_2014 = int(total_2014 / total_prev * 100)
         diff_2014 = (total_2014 - total_prev)
         
-        diff_2021_22 = model_region_year_total[model_region_year_total["date"].dt.year == 2021]["total"].sum() - model_region_year_total[model_region_year_total["date"].dt.year == 2022]["total"].sum()
+        total_2021 = insight_int("records_2021")
+        diff_2021_22 = total_2021 - insight_int("records_2022")
 
         st.markdown(
             # <div class='total-metric-item' style='font-family:{font_family}'>
@@ -214,46 +227,46 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
                     which would explain this anomaly took place during that period, except for the <span style='color: {clr_main}'>large-scale police reform in 2015</span>.
                 </ul>
                 <ul>
-                    <span style='color: {clr_main}'>Simferopol</span> (Crimea) region accounts for around <span title="{int(top[top['region']=='Simferopol']['total']):,} records" style='color: {clr_main}'>{int(round(top[top['region']=='Simferopol']['total_pct'], 2)*100)}%</span> of all records. 
+                    <span style='color: {clr_main}'>Simferopol</span> (Crimea) region accounts for around <span title="{insight_int('simferopol_total'):,} records" style='color: {clr_main}'>{int(round(insight_float('simferopol_total_pct'), 2)*100)}%</span> of all records. 
                     The main contributor to this high percentage was the <span style='color: {clr_main}'>2014</span> annexation, meaning that all 
                     <span style='color: {clr_main}'>weapons registered</span> there were likely <span style='color: {clr_main}'>labeled as lost or stolen</span>.
-                    The same applies to the <span style='color: {clr_main}'>Donetsk</span> region, which makes up approximately <span title="{int(top[top['region']=='Donetsk']['total']):,} records" style='color: {clr_main}'>{int(round(top[top['region']=='Donetsk']['total_pct'], 2)*100)}%</span> of all records. 
+                    The same applies to the <span style='color: {clr_main}'>Donetsk</span> region, which makes up approximately <span title="{insight_int('donetsk_total'):,} records" style='color: {clr_main}'>{int(round(insight_float('donetsk_total_pct'), 2)*100)}%</span> of all records. 
                 </ul>
                 <ul>
                     Russian <span style='color: {clr_main}'>full-scale invasion</span> of Ukraine in February 2022 contributed to yet <span style='color: {clr_main}'>another surge</span> in the number of lost and stolen weapons, 
-                    with nearly <span title='{abs(diff_2021_22):,} records' style='color: {clr_main}'>{abs(diff_2021_22 / model_region_year_total[model_region_year_total["date"].dt.year == 2021]["total"].sum() * 100):.0f}% more records</span> than in 2021. Several peaks can be observed during that year, 
+                    with nearly <span title='{abs(diff_2021_22):,} records' style='color: {clr_main}'>{abs(diff_2021_22 / total_2021 * 100):.0f}% more records</span> than in 2021. Several peaks can be observed during that year, 
                     representing a rapidly changing combat environment, as Ukraine regains control over the large portions of its territory. These peaks are swiftly followed by a significant decline, suggesting a normalization in the number of reported incidents, returning to prior levels. However, 
                     the graph then reveals a steady and continuous rise in the following months, representing a <span style='color: {clr_main}'>persistent increase in reported cases</span> of weapons loss and theft over time.
                 </ul>
                 <ul>
-                    The <span style='color: {clr_main}'>tiniest</span> share of the country records has the <span style='color: {clr_main}'>{bot.iloc[0,0]}</span> region, 
-                    around <span title="{bot.iloc[0]['total']:,} records" style='color: {clr_main}'>{round(bot.iloc[0]['total_pct'], 3)*100:.1f}%</span>. 
-                    It is closely followed by <span style='color: {clr_main}'>{bot.iloc[1,0]}</span>, accounting for 
-                    <span title="{bot.iloc[1]['total']:,} records" style='color: {clr_main}'>{round(bot.iloc[1]['total_pct'], 3)*100:.1f}%</span> of all reports.
+                    The <span style='color: {clr_main}'>tiniest</span> share of the country records has the <span style='color: {clr_main}'>{insight_str('smallest_region_1')}</span> region, 
+                    around <span title="{insight_int('smallest_region_1_total'):,} records" style='color: {clr_main}'>{round(insight_float('smallest_region_1_total_pct'), 3)*100:.1f}%</span>. 
+                    It is closely followed by <span style='color: {clr_main}'>{insight_str('smallest_region_2')}</span>, accounting for 
+                    <span title="{insight_int('smallest_region_2_total'):,} records" style='color: {clr_main}'>{round(insight_float('smallest_region_2_total_pct'), 3)*100:.1f}%</span> of all reports.
                 </ul>
                 <ul>
-                    <span style='color: {clr_main}'>{region_total.loc[region_total['theft_pct'].idxmin()]['region']}</span> has the 
+                    <span style='color: {clr_main}'>{insight_str('lowest_theft_region')}</span> has the 
                     <span style='color: {clr_main}'>lowest</span> percentage of <span style='color: {clr_main}'>theft</span> reports, 
-                    only <span title="{region_total.loc[region_total['theft_pct'].idxmin()]['theft']:,} records" 
-                    style='color:{clr_main}'>{int(round(region_total.loc[region_total['theft_pct'].idxmin(),'theft_pct'], 2)*100)}%</span>, and the 
+                    only <span title="{insight_int('lowest_theft_region_theft'):,} records" 
+                    style='color:{clr_main}'>{int(round(insight_float('lowest_theft_region_theft_pct'), 2)*100)}%</span>, and the 
                     <span style='color: {clr_main}'>highest loss</span> percentage, nearly 
-                    <span title="{region_total.loc[region_total['loss_pct'].idxmax()]['loss']:,} records" 
-                    style='color:{clr_main}'>{int(round(region_total.loc[region_total['loss_pct'].idxmax(),'loss_pct'], 2)*100)}%</span>.
-                    By contrast, <span style='color: {clr_main}'>{region_total.loc[region_total['theft_pct'].idxmax()]['region']} </span>
-                    has around <span title="{region_total.loc[region_total['theft_pct'].idxmax()]['theft']:,} records" 
-                    style='color:{clr_main}'>{int(round(region_total.loc[region_total['theft_pct'].idxmax(),'theft_pct'], 2)*100)}%</span> 
+                    <span title="{insight_int('highest_loss_region_loss'):,} records" 
+                    style='color:{clr_main}'>{int(round(insight_float('highest_loss_region_loss_pct'), 2)*100)}%</span>.
+                    By contrast, <span style='color: {clr_main}'>{insight_str('highest_theft_region')} </span>
+                    has around <span title="{insight_int('highest_theft_region_theft'):,} records" 
+                    style='color:{clr_main}'>{int(round(insight_float('highest_theft_region_theft_pct'), 2)*100)}%</span> 
                     of its records being <span style='color: {clr_main}'>theft</span> reports,
                     the <span style='color: {clr_main}'>highest</span> number among all regions.
                 </ul>
                 <ul>
                     The <span style='color: {clr_main}'>two</span> most "popular" 
                     <span style='color: {clr_main}'>weapon categories</span>, which are making up almost 
-                    <span title='{model_weaponcategory_total.loc[model_weaponcategory_total.index[:2],'total'].sum():,} records' 
-                    style='color:{clr_main}'>{(model_weaponcategory_total.loc[model_weaponcategory_total.index[:2],'total'].sum()/model_weaponcategory_total.loc[:,'total'].sum())*100:.0f}%</span> of all records, are 
-                    <span title='{model_weaponcategory_total.loc[model_weaponcategory_total.index[0],'total'].sum():,} records' 
-                    style='color: {clr_main}'>{model_weaponcategory_total.index[0]}</span> and 
-                    <span title='{model_weaponcategory_total.loc[model_weaponcategory_total.index[1],'total'].sum():,} records' 
-                    style='color: {clr_main}'>{model_weaponcategory_total.index[1]}</span>.
+                    <span title='{insight_int('top_categories_total'):,} records' 
+                    style='color:{clr_main}'>{insight_float('top_categories_total_pct')*100:.0f}%</span> of all records, are 
+                    <span title='{insight_int('top_category_1_total'):,} records' 
+                    style='color: {clr_main}'>{insight_str('top_category_1')}</span> and 
+                    <span title='{insight_int('top_category_2_total'):,} records' 
+                    style='color: {clr_main}'>{insight_str('top_category_2')}</span>.
                 </ul>
             </div>
             """,
@@ -280,22 +293,20 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
         tab1, tab2, tab3, tab4 = st.tabs(['Yearly','Monthly', 'Weekly','Daily'])
         # Scatter plots
         with tab1:
-            generate_reports_scatterplot('yearly')
+            viz.generate_reports_scatterplot('yearly')
         
         with tab2:
-            generate_reports_scatterplot('monthly')
+            viz.generate_reports_scatterplot('monthly')
         
         with tab3:
-            generate_reports_scatterplot('weekly')
+            viz.generate_reports_scatterplot('weekly')
         
         with tab4:
-            generate_reports_scatterplot('daily')
+            daily_reports_scatterplot()
     
     with sec4_col2:
         
-        year = st.selectbox(label='', options=np.arange(1991, int(modification_date("data/marts/region-total.parquet",'year'))+1, 1), label_visibility='hidden')
-    
-        generate_reports_piechart(year)
+        reports_piechart()
         
         
     # =========================#
@@ -315,7 +326,7 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
 
     with sec5_col1:
         # Table
-        generate_weaponcategory_total_table(model_weaponcategory_total)
+        viz.generate_weaponcategory_total_table(model_weaponcategory_total)
 
         # Weapon categories explanations
         st.markdown(
@@ -343,7 +354,7 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
         
     with sec5_col2:
         # "Scatterplot"
-        generate_weapons_scatterplot()
+        viz.generate_weapons_scatterplot()
 
 
     # =========================#
@@ -356,7 +367,7 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
             Regional Records<br>
             <span style='font-size:14px; color:{clr_secondary_font}; display: inline-block;'>
                 Administrative centers here represent entire regions (oblasts)<br>
-                Ranked by the total number of records, where #1 region has the most records in Ukraine
+                Ranked by the median yearly number of records per 100k residents over complete years, where #1 region has the highest rate in Ukraine
             </span>
         </div>
         """,
@@ -364,454 +375,21 @@ with st.spinner("Please wait a few seconds while I prepare everything...🔥"):
         )
 
     with st.container():
-        
-        # Cherkasy
-        a1, a2, a3, a4, _ = st.columns(
-            
-            # (0.3, 0.1, 0.3, 0.25, 0.3)
-            (1,1,1,1,0.1)
-        )
-        
-        with a1:
-            generate_rank_region_population("Cherkasy")
-
-        with a2:
-            generate_region_total_linechart("Cherkasy")
-
-        with a3:
-            generate_region_weapons_polarchart('Cherkasy')
-        
-        with a4:
-            generate_region_report_10y_linechart("Cherkasy")
-
-
-        # Chernihiv
-        b1, b2, b3, b4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with b1:
-            generate_rank_region_population("Chernihiv")
-
-        with b2:
-            generate_region_total_linechart("Chernihiv")
-
-        with b3:
-            generate_region_weapons_polarchart('Chernihiv')
-        
-        with b4:
-            generate_region_report_10y_linechart("Chernihiv")
-
-
-        # Chernivtsi
-        c1, c2, c3, c4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with c1:
-            generate_rank_region_population("Chernivtsi")
-
-        with c2:
-            generate_region_total_linechart("Chernivtsi")
-
-        with c3:
-            generate_region_weapons_polarchart('Chernivtsi')
-        
-        with c4:
-            generate_region_report_10y_linechart("Chernivtsi")
-
-
-        # Dnipro
-        d1, d2, d3, d4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with d1:
-            generate_rank_region_population("Dnipro")
-
-        with d2:
-            generate_region_total_linechart("Dnipro")
-
-        with d3:
-            generate_region_weapons_polarchart('Dnipro')
-        
-        with d4:
-            generate_region_report_10y_linechart("Dnipro")
-
-
-        # Donetsk
-        e1, e2, e3, e4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with e1:
-            generate_rank_region_population("Donetsk")
-
-        with e2:
-            generate_region_total_linechart("Donetsk")
-
-        with e3:
-            generate_region_weapons_polarchart('Donetsk')
-        
-        with e4:
-            generate_region_report_10y_linechart("Donetsk")
-
-
-        # Ivano-Frankivsk
-        f1, f2, f3, f4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with f1:
-            generate_rank_region_population("Ivano-Frankivsk")
-
-        with f2:
-            generate_region_total_linechart("Ivano-Frankivsk")
-
-        with f3:
-            generate_region_weapons_polarchart('Ivano-Frankivsk')
-        
-        with f4:
-            generate_region_report_10y_linechart("Ivano-Frankivsk")
-
-
-        # Kharkiv
-        g1, g2, g3, g4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with g1:
-            generate_rank_region_population("Kharkiv")
-
-        with g2:
-            generate_region_total_linechart("Kharkiv")
-
-        with g3:
-            generate_region_weapons_polarchart('Kharkiv')
-        
-        with g4:
-            generate_region_report_10y_linechart("Kharkiv")
-
-
-        # Kherson
-        h1, h2, h3, h4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with h1:
-            generate_rank_region_population("Kherson")
-
-        with h2:
-            generate_region_total_linechart("Kherson")
-
-        with h3:
-            generate_region_weapons_polarchart('Kherson')
-        
-        with h4:
-            generate_region_report_10y_linechart("Kherson")
 
+        # One row per region, ordered by records per 100k residents (region-year-per-capita mart)
+        for region in region_rate_ranks.index:
+            c1, c2, c3, c4, _ = st.columns(
+                (1,1,1,1,0.1)
+            )
 
-        # Khmelnytskyi
-        i1, i2, i3, i4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with i1:
-            generate_rank_region_population("Khmelnytskyi")
-
-        with i2:
-            generate_region_total_linechart("Khmelnytskyi")
-
-        with i3:
-            generate_region_weapons_polarchart('Khmelnytskyi')
-        
-        with i4:
-            generate_region_report_10y_linechart("Khmelnytskyi")
-
+            with c1:
+                viz.generate_rank_region_population(region)
 
-        # Kropyvnytskyi
-        j1, j2, j3, j4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with j1:
-            generate_rank_region_population("Kropyvnytskyi")
-
-        with j2:
-            generate_region_total_linechart("Kropyvnytskyi")
-
-        with j3:
-            generate_region_weapons_polarchart('Kropyvnytskyi')
-        
-        with j4:
-            generate_region_report_10y_linechart("Kropyvnytskyi")
+            with c2:
+                viz.generate_region_total_linechart(region)
 
+            with c3:
+                viz.generate_region_weapons_polarchart(region)
 
-        # Kyiv
-        k1, k2, k3, k4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with k1:
-            generate_rank_region_population("Kyiv")
-
-        with k2:
-            generate_region_total_linechart("Kyiv")
-
-        with k3:
-            generate_region_weapons_polarchart('Kyiv')
-        
-        with k4:
-            generate_region_report_10y_linechart("Kyiv")
-
-
-        # Luhansk
-        l1, l2, l3, l4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with l1:
-            generate_rank_region_population("Luhansk")
-
-        with l2:
-            generate_region_total_linechart("Luhansk")
-
-        with l3:
-            generate_region_weapons_polarchart('Luhansk')
-        
-        with l4:
-            generate_region_report_10y_linechart("Luhansk")
-
-
-        # Lutsk
-        m1, m2, m3, m4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with m1:
-            generate_rank_region_population("Lutsk")
-
-        with m2:
-            generate_region_total_linechart("Lutsk")
-
-        with m3:
-            generate_region_weapons_polarchart('Lutsk')
-        
-        with m4:
-            generate_region_report_10y_linechart("Lutsk")
-
-
-        # Lviv
-        n1, n2, n3, n4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with n1:
-            generate_rank_region_population("Lviv")
-
-        with n2:
-            generate_region_total_linechart("Lviv")
-
-        with n3:
-            generate_region_weapons_polarchart('Lviv')
-        
-        with n4:
-            generate_region_report_10y_linechart("Lviv")
-
-
-        # Mykolaiv
-        o1, o2, o3, o4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with o1:
-            generate_rank_region_population("Mykolaiv")
-
-        with o2:
-            generate_region_total_linechart("Mykolaiv")
-
-        with o3:
-            generate_region_weapons_polarchart('Mykolaiv')
-        
-        with o4:
-            generate_region_report_10y_linechart("Mykolaiv")
-
-
-        # Odesa
-        p1, p2, p3, p4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with p1:
-            generate_rank_region_population("Odesa")
-
-        with p2:
-            generate_region_total_linechart("Odesa")
-
-        with p3:
-            generate_region_weapons_polarchart('Odesa')
-        
-        with p4:
-            generate_region_report_10y_linechart("Odesa")
-
-
-        # Poltava
-        q1, q2, q3, q4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with q1:
-            generate_rank_region_population("Poltava")
-
-        with q2:
-            generate_region_total_linechart("Poltava")
-
-        with q3:
-            generate_region_weapons_polarchart('Poltava')
-        
-        with q4:
-            generate_region_report_10y_linechart("Poltava")
-
-
-        # Rivne
-        r1, r2, r3, r4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with r1:
-            generate_rank_region_population("Rivne")
-
-        with r2:
-            generate_region_total_linechart("Rivne")
-
-        with r3:
-            generate_region_weapons_polarchart('Rivne')
-        
-        with r4:
-            generate_region_report_10y_linechart("Rivne")
-
-
-        # Simferopol
-        s1, s2, s3, s4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with s1:
-            generate_rank_region_population("Simferopol")
-
-        with s2:
-            generate_region_total_linechart("Simferopol")
-
-        with s3:
-            generate_region_weapons_polarchart('Simferopol')
-        
-        with s4:
-            generate_region_report_10y_linechart("Simferopol")
-
-
-        # Sumy
-        t1, t2, t3, t4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with t1:
-            generate_rank_region_population("Sumy")
-
-        with t2:
-            generate_region_total_linechart("Sumy")
-
-        with t3:
-            generate_region_weapons_polarchart('Sumy')
-        
-        with t4:
-            generate_region_report_10y_linechart("Sumy")
-
-
-        # Ternopil
-        u1, u2, u3, u4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with u1:
-            generate_rank_region_population("Ternopil")
-
-        with u2:
-            generate_region_total_linechart("Ternopil")
-
-        with u3:
-            generate_region_weapons_polarchart('Ternopil')
-        
-        with u4:
-            generate_region_report_10y_linechart("Ternopil")
-
-
-        # Uzhhorod
-        v1, v2, v3, v4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with v1:
-            generate_rank_region_population("Uzhhorod")
-
-        with v2:
-            generate_region_total_linechart("Uzhhorod")
-
-        with v3:
-            generate_region_weapons_polarchart('Uzhhorod')
-        
-        with v4:
-            generate_region_report_10y_linechart("Uzhhorod")
-
-
-        # Vinnytsia
-        w1, w2, w3, w4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with w1:
-            generate_rank_region_population("Vinnytsia")
-
-        with w2:
-            generate_region_total_linechart("Vinnytsia")
-
-        with w3:
-            generate_region_weapons_polarchart('Vinnytsia')
-        
-        with w4:
-            generate_region_report_10y_linechart("Vinnytsia")
-
-
-        # Zaporizhzhia
-        x1, x2, x3, x4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with x1:
-            generate_rank_region_population("Zaporizhzhia")
-
-        with x2:
-            generate_region_total_linechart("Zaporizhzhia")
-
-        with x3:
-            generate_region_weapons_polarchart('Zaporizhzhia')
-        
-        with x4:
-            generate_region_report_10y_linechart("Zaporizhzhia")
-
-
-        # Zhytomyr
-        y1, y2, y3, y4, _ = st.columns(
-            (1,1,1,1,0.1),
-        )
-    
-        with y1:
-            generate_rank_region_population("Zhytomyr")
-
-        with y2:
-            generate_region_total_linechart("Zhytomyr")
-
-        with y3:
-            generate_region_weapons_polarchart('Zhytomyr')
-        
-        with y4:
-            generate_region_report_10y_linechart("Zhytomyr")
\ No newline at end of file
+            with c4:
+                viz.generate_region_report_10y_linechart(region)
@@ -0,0 +1,139 @@
+WITH Grains AS (
+    -- Time grain, its length and number of preceding periods the baseline is computed on
+    SELECT * FROM (VALUES
+        ('day', INTERVAL 1 DAY, 90),
+        ('week', INTERVAL 1 WEEK, 52),
+        ('month', INTERVAL 1 MONTH, 24),
+        ('year', INTERVAL 1 YEAR, 10)
+    ) AS Grains(grain, step, baseline_periods)
+),
+
+DayCounts AS (
+    SELECT
+        DATE_TRUNC('day', date) AS date,
+        region,
+        report,
+        COUNT(report) AS total
+    FROM
+        weapons
+    GROUP BY
+        1,
+        2,
+        3
+),
+
+PeriodCounts AS (
+    -- Series plotted by the app: totals of the whole country at every grain per report type
+    -- and for both ('All'), yearly totals of each region for both report types
+    SELECT
+        Grains.grain,
+        DATE_TRUNC(Grains.grain, DayCounts.date) AS date,
+        'All' AS region,
+        COALESCE(DayCounts.report, 'All') AS report,
+        SUM(DayCounts.total) AS total
+    FROM
+        DayCounts,
+        Grains
+    GROUP BY GROUPING SETS (
+        (Grains.grain, DATE_TRUNC(Grains.grain, DayCounts.date), DayCounts.report),
+        (Grains.grain, DATE_TRUNC(Grains.grain, DayCounts.date))
+    )
+
+    UNION ALL
+
+    SELECT
+        'year' AS grain,
+        DATE_TRUNC('year', date) AS date,
+        region,
+        'All' AS report,
+        SUM(total) AS total
+    FROM
+        DayCounts
+    GROUP BY
+        1,
+        2,
+        3
+),
+
+Grid AS (
+    -- Every series in every period, so that periods without records take part in the baseline
+    SELECT
+        Series.grain,
+        Series.region,
+        Series.report,
+        Grains.baseline_periods,
+        UNNEST(GENERATE_SERIES(Periods.first_period, Periods.last_period, Grains.step)) AS date
+    FROM
+        (SELECT DISTINCT grain, region, report FROM PeriodCounts) AS Series
+        JOIN (
+            SELECT grain, MIN(date) AS first_period, MAX(date) AS last_period FROM PeriodCounts GROUP BY grain
+        ) AS Periods
+            USING (grain)
+        JOIN Grains
+            USING (grain)
+),
+
+Baselines AS (
+    SELECT
+        Grid.grain,
+        Grid.region,
+        Grid.report,
+        CAST(Grid.date AS TIMESTAMP) AS date,
+        COALESCE(PeriodCounts.total, 0) AS total,
+        -- Median and median absolute deviation of the preceding periods, the current one is excluded
+        MEDIAN(COALESCE(PeriodCounts.total, 0)) OVER baseline AS rolling_median,
+        MAD(COALESCE(PeriodCounts.total, 0)) OVER baseline AS rolling_mad,
+        COUNT(*) OVER baseline AS history_periods,
+        Grid.baseline_periods
+    FROM
+        Grid
+        LEFT JOIN PeriodCounts
+            ON PeriodCounts.grain = Grid.grain
+            AND PeriodCounts.region = Grid.region
+            AND PeriodCounts.report = Grid.report
+            AND PeriodCounts.date = Grid.date
+    WINDOW baseline AS (
+        PARTITION BY Grid.grain, Grid.region, Grid.report
+        ORDER BY Grid.date
+        ROWS BETWEEN Grid.baseline_periods PRECEDING AND 1 PRECEDING
+    )
+),
+
+Scores AS (
+    SELECT
+        grain,
+        region,
+        report,
+        date,
+        CAST(total AS BIGINT) AS total,
+        rolling_median,
+        rolling_mad,
+        -- Modified z-score (Iglewicz and Hoaglin), MAD is floored at one record,
+        -- so that sparse series (mostly empty periods) are not flagged on every record
+        CAST(0.6745 * (total - rolling_median) / GREATEST(rolling_mad, 1) AS FLOAT) AS robust_z,
+        -- Scores of series with less than half of the baseline history are not reliable
+        history_periods * 2 >= baseline_periods AS scored
+    FROM
+        Baselines
+)
+
+SELECT
+    grain,
+    region,
+    report,
+    date,
+    total,
+    rolling_median,
+    rolling_mad,
+    robust_z,
+    COALESCE(scored AND robust_z > 3.5, FALSE) AS is_anomaly
+FROM
+    Scores
+-- Periods without records are never anomalies and are not plotted
+WHERE
+    total > 0
+ORDER BY
+    grain ASC,
+    region ASC,
+    report ASC,
+    date ASC;
@@ -3,7 +3,7 @@ SELECT
     report,
     COUNT(report) AS total
 FROM 
-    read_parquet('{processed_path}')
+    weapons
 GROUP BY
     1,2
 ORDER BY
@@ -0,0 +1,105 @@
+-- Figures quoted in the TL;DR section of the app, one row per key (number or text value)
+WITH AllRecords AS (
+    SELECT
+        COUNT(report) AS grand_total
+    FROM
+        weapons
+),
+
+RegionTotals AS (
+    SELECT
+        region,
+        COUNT(report) AS total,
+        COUNT(report) FILTER (WHERE report = 'Loss') AS loss,
+        COUNT(report) FILTER (WHERE report = 'Theft') AS theft,
+        CAST(COUNT(report) AS DOUBLE) / AllRecords.grand_total AS total_pct,
+        CAST(COUNT(report) FILTER (WHERE report = 'Loss') AS DOUBLE) / COUNT(report) AS loss_pct,
+        CAST(COUNT(report) FILTER (WHERE report = 'Theft') AS DOUBLE) / COUNT(report) AS theft_pct
+    FROM
+        weapons,
+        AllRecords
+    GROUP BY
+        region,
+        AllRecords.grand_total
+),
+
+RegionRanks AS (
+    -- Region names break ties, so that every rank is taken by exactly one region
+    SELECT
+        *,
+        ROW_NUMBER() OVER (ORDER BY total ASC, region ASC) AS smallest_rank,
+        ROW_NUMBER() OVER (ORDER BY theft_pct ASC, region ASC) AS lowest_theft_rank,
+        ROW_NUMBER() OVER (ORDER BY theft_pct DESC, region ASC) AS highest_theft_rank,
+        ROW_NUMBER() OVER (ORDER BY loss_pct DESC, region ASC) AS highest_loss_rank
+    FROM
+        RegionTotals
+),
+
+YearTotals AS (
+    -- Filters on the 'year' partition key, so that partitions after 2022 are not read
+    SELECT
+        COUNT(report) FILTER (WHERE year < 2014) AS before_2014,
+        COUNT(report) FILTER (WHERE year = 2014) AS in_2014,
+        COUNT(report) FILTER (WHERE year = 2021) AS in_2021,
+        COUNT(report) FILTER (WHERE year = 2022) AS in_2022
+    FROM
+        weapons
+    WHERE
+        year <= 2022
+),
+
+CategoryRanks AS (
+    SELECT
+        weaponcategory,
+        COUNT(report) AS total,
+        ROW_NUMBER() OVER (ORDER BY COUNT(report) DESC, weaponcategory ASC) AS category_rank
+    FROM
+        weapons
+    GROUP BY
+        weaponcategory
+),
+
+Insights AS (
+    -- Years
+    SELECT 'records_before_2014' AS key, before_2014 AS number, NULL AS text FROM YearTotals
+    UNION ALL SELECT 'records_2014', in_2014, NULL FROM YearTotals
+    UNION ALL SELECT 'records_2021', in_2021, NULL FROM YearTotals
+    UNION ALL SELECT 'records_2022', in_2022, NULL FROM YearTotals
+
+    -- Regions named in the text
+    UNION ALL SELECT 'simferopol_total', total, NULL FROM RegionTotals WHERE region = 'Simferopol'
+    UNION ALL SELECT 'simferopol_total_pct', total_pct, NULL FROM RegionTotals WHERE region = 'Simferopol'
+    UNION ALL SELECT 'donetsk_total', total, NULL FROM RegionTotals WHERE region = 'Donetsk'
+    UNION ALL SELECT 'donetsk_total_pct', total_pct, NULL FROM RegionTotals WHERE region = 'Donetsk'
+
+    -- Regions with the smallest number of records
+    UNION ALL SELECT 'smallest_region_' || smallest_rank, NULL, region FROM RegionRanks WHERE smallest_rank <= 2
+    UNION ALL SELECT 'smallest_region_' || smallest_rank || '_total', total, NULL FROM RegionRanks WHERE smallest_rank <= 2
+    UNION ALL SELECT 'smallest_region_' || smallest_rank || '_total_pct', total_pct, NULL FROM RegionRanks WHERE smallest_rank <= 2
+
+    -- Regions with extreme shares of report types
+    UNION ALL SELECT 'lowest_theft_region', NULL, region FROM RegionRanks WHERE lowest_theft_rank = 1
+    UNION ALL SELECT 'lowest_theft_region_theft', theft, NULL FROM RegionRanks WHERE lowest_theft_rank = 1
+    UNION ALL SELECT 'lowest_theft_region_theft_pct', theft_pct, NULL FROM RegionRanks WHERE lowest_theft_rank = 1
+    UNION ALL SELECT 'highest_loss_region', NULL, region FROM RegionRanks WHERE highest_loss_rank = 1
+    UNION ALL SELECT 'highest_loss_region_loss', loss, NULL FROM RegionRanks WHERE highest_loss_rank = 1
+    UNION ALL SELECT 'highest_loss_region_loss_pct', loss_pct, NULL FROM RegionRanks WHERE highest_loss_rank = 1
+    UNION ALL SELECT 'highest_theft_region', NULL, region FROM RegionRanks WHERE highest_theft_rank = 1
+    UNION ALL SELECT 'highest_theft_region_theft', theft, NULL FROM RegionRanks WHERE highest_theft_rank = 1
+    UNION ALL SELECT 'highest_theft_region_theft_pct', theft_pct, NULL FROM RegionRanks WHERE highest_theft_rank = 1
+
+    -- Most common weapon categories
+    UNION ALL SELECT 'top_category_' || category_rank, NULL, weaponcategory FROM CategoryRanks WHERE category_rank <= 2
+    UNION ALL SELECT 'top_category_' || category_rank || '_total', total, NULL FROM CategoryRanks WHERE category_rank <= 2
+    UNION ALL SELECT 'top_categories_total', SUM(total), NULL FROM CategoryRanks WHERE category_rank <= 2
+    UNION ALL SELECT 'top_categories_total_pct', CAST(SUM(total) FILTER (WHERE category_rank <= 2) AS DOUBLE) / SUM(total), NULL FROM CategoryRanks
+)
+
+SELECT
+    key,
+    CAST(number AS DOUBLE) AS number,
+    CAST(text AS VARCHAR) AS text
+FROM
+    Insights
+ORDER BY
+    key ASC;
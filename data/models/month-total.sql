@@ -2,7 +2,7 @@ SELECT
     DATE_TRUNC('month', date) AS date,
     COUNT(report) AS total
 FROM 
-    read_parquet('{processed_path}')
+    weapons
 GROUP BY
     1
 ORDER BY
@@ -0,0 +1,79 @@
+WITH MonthTotals AS (
+    -- Monthly totals of the whole country and of every region, report type and weapon category
+    SELECT
+        CASE
+            WHEN GROUPING(region) = 0 THEN 'region'
+            WHEN GROUPING(report) = 0 THEN 'report'
+            WHEN GROUPING(weaponcategory) = 0 THEN 'weaponcategory'
+            ELSE 'all'
+        END AS dimension,
+        COALESCE(region, report, weaponcategory, 'All') AS value,
+        DATE_TRUNC('month', date) AS date,
+        COUNT(report) AS total
+    FROM
+        weapons
+    GROUP BY GROUPING SETS (
+        (DATE_TRUNC('month', date)),
+        (DATE_TRUNC('month', date), region),
+        (DATE_TRUNC('month', date), report),
+        (DATE_TRUNC('month', date), weaponcategory)
+    )
+),
+
+Grid AS (
+    -- Every series in every month, so that row-based windows span calendar months
+    SELECT
+        Series.dimension,
+        Series.value,
+        UNNEST(GENERATE_SERIES(Months.first_month, Months.last_month, INTERVAL 1 MONTH)) AS date
+    FROM
+        (SELECT DISTINCT dimension, value FROM MonthTotals) AS Series,
+        (SELECT MIN(date) AS first_month, MAX(date) AS last_month FROM MonthTotals) AS Months
+),
+
+Dense AS (
+    SELECT
+        Grid.dimension,
+        Grid.value,
+        CAST(Grid.date AS TIMESTAMP) AS date,
+        COALESCE(MonthTotals.total, 0) AS total
+    FROM
+        Grid
+        LEFT JOIN MonthTotals
+            ON MonthTotals.dimension = Grid.dimension
+            AND MonthTotals.value = Grid.value
+            AND MonthTotals.date = Grid.date
+),
+
+Rolling AS (
+    SELECT
+        *,
+        CAST(SUM(total) OVER (series ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) AS BIGINT) AS rolling_3m,
+        CAST(SUM(total) OVER (series ROWS BETWEEN 11 PRECEDING AND CURRENT ROW) AS BIGINT) AS rolling_12m,
+        CAST(SUM(total) OVER (series ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS BIGINT) AS cumulative_total
+    FROM
+        Dense
+    WINDOW series AS (PARTITION BY dimension, value ORDER BY date)
+)
+
+SELECT
+    dimension,
+    value,
+    date,
+    total,
+    rolling_3m,
+    rolling_12m,
+    cumulative_total,
+    -- Same month of the previous year
+    total - LAG(total, 12) OVER series AS yoy_change,
+    CAST(total - LAG(total, 12) OVER series AS FLOAT) / NULLIF(LAG(total, 12) OVER series, 0) AS yoy_pct,
+    -- Previous 12 months, i.e. calendar year over calendar year in December rows
+    rolling_12m - LAG(rolling_12m, 12) OVER series AS rolling_12m_yoy_change,
+    CAST(rolling_12m - LAG(rolling_12m, 12) OVER series AS FLOAT) / NULLIF(LAG(rolling_12m, 12) OVER series, 0) AS rolling_12m_yoy_pct
+FROM
+    Rolling
+WINDOW series AS (PARTITION BY dimension, value ORDER BY date)
+ORDER BY
+    dimension ASC,
+    value ASC,
+    date ASC;
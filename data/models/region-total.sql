@@ -2,7 +2,7 @@ WITH AllRecords AS (
     SELECT
         COUNT(report) AS grand_total
     FROM 
-        read_parquet('{processed_path}')
+        weapons
 )
 
 SELECT
@@ -14,7 +14,7 @@ SELECT
     CAST(COUNT(report) FILTER(WHERE report = 'Loss') AS FLOAT) / COUNT(report) AS loss_pct,
     CAST(COUNT(report) FILTER(WHERE report = 'Theft') AS FLOAT) / COUNT(report) AS theft_pct
 FROM 
-    read_parquet('{processed_path}'),
+    weapons,
     AllRecords
 GROUP BY
     region,
@@ -4,7 +4,7 @@ WITH RegWepTot AS(
         weaponcategory,
         COUNT(report) AS total
     FROM
-        read_parquet('{processed_path}')
+        weapons
     GROUP BY
         region,
         weaponcategory
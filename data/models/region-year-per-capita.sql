@@ -0,0 +1,105 @@
+WITH Population AS (
+    -- Wide population table (one column per year) >>> one row per region and year
+    SELECT
+        region,
+        CAST(year AS INTEGER) AS year,
+        CAST(population AS BIGINT) AS population
+    FROM (
+        UNPIVOT ua_population
+        ON COLUMNS(* EXCLUDE (region))
+        INTO NAME year VALUE population
+    )
+),
+
+PopulationYears AS (
+    SELECT
+        MIN(year) AS first_year,
+        MAX(year) AS last_year
+    FROM
+        Population
+),
+
+Counts AS (
+    SELECT
+        region,
+        year,
+        COUNT(report) FILTER (WHERE report = 'Loss') AS loss,
+        COUNT(report) FILTER (WHERE report = 'Theft') AS theft,
+        COUNT(report) AS total
+    FROM
+        weapons
+    GROUP BY
+        1,
+        2
+),
+
+Grid AS (
+    -- Every region in every year, years without records count as zero
+    SELECT
+        Regions.region,
+        UNNEST(RANGE(Years.first_year, Years.last_year + 1)) AS year
+    FROM
+        (SELECT DISTINCT region FROM Counts) AS Regions,
+        (SELECT MIN(year) AS first_year, MAX(year) AS last_year FROM Counts) AS Years
+),
+
+Rates AS (
+    SELECT
+        Grid.region,
+        CAST(MAKE_DATE(CAST(Grid.year AS INTEGER), 12, 31) AS TIMESTAMP) AS date,
+        COALESCE(Counts.loss, 0) AS loss,
+        COALESCE(Counts.theft, 0) AS theft,
+        COALESCE(Counts.total, 0) AS total,
+        Population.year AS population_year,
+        Population.population,
+        COALESCE(Counts.total, 0) * 100000.0 / Population.population AS total_per_100k,
+        COALESCE(Counts.loss, 0) * 100000.0 / Population.population AS loss_per_100k,
+        COALESCE(Counts.theft, 0) * 100000.0 / Population.population AS theft_per_100k
+    FROM
+        Grid
+        CROSS JOIN PopulationYears
+        LEFT JOIN Counts
+            ON Counts.region = Grid.region
+            AND Counts.year = Grid.year
+        -- Years outside the population table use its closest year
+        JOIN Population
+            ON Population.region = Grid.region
+            AND Population.year = GREATEST(LEAST(Grid.year, PopulationYears.last_year), PopulationYears.first_year)
+),
+
+CompleteYears AS (
+    -- Records of the latest year are incomplete until it ends, the rank leaves it out
+    SELECT
+        MAX(year) - 1 AS last_year
+    FROM
+        Counts
+),
+
+RegionRanks AS (
+    -- Median of yearly rates, so that a single peak year (e.g. 2022) does not decide the rank
+    SELECT
+        region,
+        MEDIAN(total_per_100k) AS median_total_per_100k,
+        ANY_VALUE(CompleteYears.last_year) AS rank_last_year,
+        RANK() OVER (ORDER BY MEDIAN(total_per_100k) DESC) AS rate_rank
+    FROM
+        Rates
+        CROSS JOIN CompleteYears
+    WHERE
+        YEAR(Rates.date) <= CompleteYears.last_year
+    GROUP BY
+        region
+)
+
+SELECT
+    Rates.*,
+    RegionRanks.median_total_per_100k,
+    RegionRanks.rank_last_year,
+    RegionRanks.rate_rank
+FROM
+    Rates
+    JOIN RegionRanks
+        USING (region)
+ORDER BY
+    region ASC,
+    date ASC;
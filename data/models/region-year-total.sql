@@ -2,7 +2,7 @@ WITH AllRecords AS (
     SELECT
         COUNT(report) AS grand_total
     FROM 
-        read_parquet('{processed_path}')
+        weapons
 )
 
 SELECT
@@ -18,7 +18,7 @@ SELECT
     COALESCE(CAST(COUNT(report) AS FLOAT) 
              / NULLIF(AllRecords.grand_total, 0), 0) AS total_pct  -- global %
 FROM 
-    read_parquet('{processed_path}'),
+    weapons,
     AllRecords
 GROUP BY
     1,
@@ -2,7 +2,7 @@ SELECT
     report,
     COUNT(*) AS total
 FROM 
-    read_parquet('{processed_path}')
+    weapons
 GROUP BY
     report
 ORDER BY
@@ -4,7 +4,7 @@ SELECT
     COUNT(*) FILTER(WHERE report == 'Loss') AS loss,
     COUNT(*) FILTER(WHERE report == 'Theft') AS theft
 FROM 
-    read_parquet('{processed_path}')
+    weapons
 WHERE
     weaponcategory NOT NULL
 GROUP BY
@@ -0,0 +1,31 @@
+WITH Years AS (
+    -- Every year since the first record, so that the piechart can show years without records
+    SELECT
+        UNNEST(RANGE(MIN(year), MAX(year) + 1)) AS year
+    FROM
+        weapons
+),
+
+Reports AS (
+    SELECT DISTINCT
+        report
+    FROM
+        weapons
+)
+
+SELECT
+    CAST(Years.year AS INTEGER) AS year,
+    Reports.report,
+    COUNT(weapons.report) AS total
+FROM
+    Years
+    CROSS JOIN Reports
+    LEFT JOIN weapons
+        ON weapons.year = Years.year
+        AND weapons.report = Reports.report
+GROUP BY
+    1,
+    2
+ORDER BY
+    1 ASC,
+    2 ASC;
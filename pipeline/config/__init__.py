@@ -1,2 +1,7 @@
 from .debug import enable_debug_logs as enable_debug_logs
-from .debug import load_config as load_config
\ No newline at end of file
+from .compiler import read_config as read_config
+from .compiler import load_config as load_config
+from .compiler import compile_config as compile_config
+from .profiles import get_write_profile as get_write_profile
+from .engine import ENGINE as ENGINE
+from .engine import configure_streaming as configure_streaming
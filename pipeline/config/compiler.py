@@ -0,0 +1,218 @@
+import os
+import re
+import pickle
+import hashlib
+import logging
+from typing import Any
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
+
+# Cached configs are keyed by this module's source too, so edits to the validation rules
+# (e.g. REQUIRED_KEYS) or the compiled layout invalidate them
+COMPILER_PATH = os.path.abspath(__file__)
+
+# Required sections and keys of config.yaml (section >>> keys)
+REQUIRED_KEYS: dict[str, tuple[str, ...]] = {
+    "settings": ("log_level", "export_logs", "persistent_database", "partition_by", "memory_budget_mb"),
+    "files": (
+        "raw_path", "processed_path", "etl_logs_path", "materialize_logs_path",
+        "models_dir", "marts_dir", "database_path", "seen_hashes_path", "quarantine_dir", "spill_dir",
+        "population_path",
+    ),
+    "fetch": ("url", "timeout", "retries"),
+    "dedup": ("key", "incremental"),
+    "date_formats": ("iso", "fallback"),
+    "regex_mappings": ("oblasts", "adjustments"),
+    "weapon_mappings": (),
+}
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def validate_config(config: Any) -> None:
+    """Checks that config.yaml has all required sections, keys and value types.
+
+    Args:
+        config (Any): Parsed YAML configuration.
+
+    Raises:
+        ValueError: Listing every problem found in the configuration.
+    """
+
+    if not isinstance(config, dict):
+        raise ValueError("config.yaml must contain a mapping of sections.")
+
+    errors = []
+
+    for section, keys in REQUIRED_KEYS.items():
+        if not isinstance(config.get(section), dict):
+            errors.append(f"missing section '{section}'")
+            continue
+        errors += [f"missing key '{section}.{key}'" for key in keys if key not in config[section]]
+
+    settings = config.get("settings") or {}
+    if settings.get("log_level", "INFO") not in LOG_LEVELS:
+        errors.append(f"'settings.log_level' must be one of: {', '.join(LOG_LEVELS)}")
+    if not isinstance(settings.get("partition_by", []), list):
+        errors.append("'settings.partition_by' must be a list")
+    elif "year" not in settings.get("partition_by", ["year"]):
+        errors.append("'settings.partition_by' must contain 'year', models filter on it")
+    if not (isinstance(settings.get("memory_budget_mb", 1), int) and settings.get("memory_budget_mb", 1) > 0):
+        errors.append("'settings.memory_budget_mb' must be a positive integer")
+
+    key = (config.get("dedup") or {}).get("key", [])
+    if not (isinstance(key, list) and key and all(isinstance(column, str) for column in key)):
+        errors.append("'dedup.key' must be a non-empty list of column names")
+
+    for key, path in (config.get("files") or {}).items():
+        if not (isinstance(path, list) and all(isinstance(part, str) for part in path)):
+            errors.append(f"'files.{key}' must be a list of path parts")
+
+    for section, patterns in (config.get("regex_mappings") or {}).items():
+        if not isinstance(patterns, dict):
+            errors.append(f"'regex_mappings.{section}' must map region names to patterns")
+
+    for section, categories in (config.get("weapon_mappings") or {}).items():
+        if not (
+            isinstance(categories, dict)
+            and all(isinstance(weapons, list) for weapons in categories.values())
+        ):
+            errors.append(f"'weapon_mappings.{section}' must map a category name to a list of weapons")
+
+    if errors:
+        raise ValueError("Invalid config.yaml: " + "; ".join(errors) + ".")
+
+
+def compile_regexes(config: dict[str, Any]) -> None:
+    """Compiles every pattern in 'regex_mappings' with Python and Polars (Rust) regex engines,
+    so a broken pattern fails before any data is read.
+
+    Patterns matching an empty string are rejected, they would assign every record to one region.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+
+    Raises:
+        ValueError: If a pattern is invalid or matches an empty string.
+    """
+
+    # Imported on use, the config is read before Polars reads its settings (engine.py)
+    import polars as pl
+
+    for section, patterns in config["regex_mappings"].items():
+        for name, pattern in patterns.items():
+            try:
+                re.compile(pattern)
+                matches_empty = pl.Series([""]).str.contains(pattern).item()
+            except (re.error, pl.exceptions.PolarsError) as e:
+                raise ValueError(f"Invalid regex for '{name}' in 'regex_mappings.{section}': {e}") from e
+
+            if matches_empty:
+                raise ValueError(f"Regex for '{name}' in 'regex_mappings.{section}' matches an empty string.")
+
+
+def build_weapon_lookup(config: dict[str, Any]) -> dict[str, str]:
+    """Flattens 'weapon_mappings' into a weapon name >>> weapon category lookup.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+
+    Raises:
+        ValueError: If a weapon is mapped to more than one category.
+
+    Returns:
+        dict[str, str]: Weapon category of each weapon name, in config order.
+    """
+
+    lookup: dict[str, str] = {}
+
+    for categories in config["weapon_mappings"].values():
+        for category, weapons in categories.items():
+            for weapon in weapons:
+                if lookup.get(weapon, category) != category:
+                    raise ValueError(
+                        f"Weapon '{weapon}' is mapped to both '{lookup[weapon]}' and '{category}' in 'weapon_mappings'."
+                    )
+                lookup[weapon] = category
+
+    return lookup
+
+
+def read_config(config_path: str = CONFIG_PATH) -> dict[str, Any]:
+    """Parses and validates config.yaml without compiling it, i.e. without importing Polars.
+
+    Returns:
+        dict: YAML configuration dictionary.
+    """
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    validate_config(config)
+
+    return config
+
+
+def compile_config(config_path: str = CONFIG_PATH) -> dict[str, Any]:
+    """Parses, validates and compiles config.yaml.
+
+    Returns:
+        dict: YAML configuration dictionary with an additional 'weapon_lookup' key.
+    """
+
+    config = read_config(config_path)
+    compile_regexes(config)
+    config["weapon_lookup"] = build_weapon_lookup(config)
+
+    return config
+
+
+def load_config(config_path: str = CONFIG_PATH) -> dict[str, Any]:
+    """Loads compiled configuration, reusing a cached one while config.yaml is unchanged.
+
+    The compiled config is pickled to pipeline/config/.cache, keyed by the sha256 of config.yaml
+    and of this module, so only the first run after an edit of either parses and validates the file.
+
+    Raises:
+        ValueError: If config.yaml is invalid.
+
+    Returns:
+        dict: YAML configuration dictionary with an additional 'weapon_lookup' key.
+    """
+
+    digest = hashlib.sha256()
+    for path in (config_path, COMPILER_PATH):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+
+    cache_path = os.path.join(CACHE_DIR, f"config-{digest.hexdigest()}.pickle")
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable config cache {cache_path}: {e}")
+
+    config = compile_config(config_path)
+
+    # Replace stale caches, write through a temporary file so concurrent runs never read a partial one
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith("config-") and name.endswith(".pickle"):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except FileNotFoundError:
+                pass
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    return config
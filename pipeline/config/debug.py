@@ -1,21 +1,18 @@
-import os
-import yaml
+from __future__ import annotations
+
 import logging
-from typing import Any
+from typing import TYPE_CHECKING
+
+from .engine import ENGINE
 
-import polars as pl
+# Polars is imported on use, the config package is loaded before Polars reads its settings (engine.py)
+if TYPE_CHECKING:
+    import polars as pl
 
 logger = logging.getLogger(__name__)
 DEBUG_MODE = logger.isEnabledFor(logging.DEBUG)
 
 
-def load_config() -> dict[str, Any] | Any:
-    """Load configurations from YAML file relative to this file."""
-    config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-
 def enable_debug_logs(
         df: pl.LazyFrame | pl.DataFrame,
         is_debug: bool = DEBUG_MODE,
@@ -38,12 +35,14 @@ def enable_debug_logs(
     """
 
     if is_debug:
+        import polars as pl
+
         if isinstance(df, pl.LazyFrame):
             # Get number of rows in a LazyFrame
             rows: int = (
                 df
                 .select(pl.len())
-                .collect()
+                .collect(engine=ENGINE)
                 .item()
             )
             # Generate a dataframe with a number of null values for each column
@@ -52,13 +51,13 @@ def enable_debug_logs(
                 .null_count()
                 .unpivot(variable_name='column', value_name='total_nulls')
                 .select(['column', 'total_nulls'])
-                .collect()
+                .collect(engine=ENGINE)
                 .rows()
             )
             # Generate a dataframe sample of the first record (dtypes included)
-            first: pl.DataFrame = df.head(1).collect()
+            first: pl.DataFrame = df.head(1).collect(engine=ENGINE)
             # Generate a dataframe sample of the last record (dtypes included)
-            last: pl.DataFrame = df.tail(1).collect()
+            last: pl.DataFrame = df.tail(1).collect(engine=ENGINE)
 
         elif isinstance(df, pl.DataFrame):
             # Get number of rows in a DataFrame
@@ -0,0 +1,33 @@
+import os
+import sys
+from typing import Any
+
+# Polars engine used for every collect of the pipeline
+ENGINE = "streaming"
+
+
+def configure_streaming(config: dict[str, Any]) -> None:
+    """Caps memory of Polars streaming execution at the budget of config.yaml.
+
+    Once the engine holds more data than the budget, out-of-core operators
+    (sorts, dedup group-bys) spill to 'spill_dir'. Polars reads these settings
+    when it is imported, so this must run before anything imports Polars
+    (see pipeline/etl.py, the config package itself does not import it).
+
+    Args:
+        config (dict): YAML configuration dictionary (compiled or not).
+
+    Raises:
+        RuntimeError: If Polars is already imported, i.e. the settings would be ignored.
+    """
+
+    if "polars" in sys.modules:
+        raise RuntimeError("Polars is already imported, configure_streaming must run before the first import.")
+
+    # Spill files of out-of-core operators go to the scratch directory
+    spill_dir = os.path.abspath(os.path.join(*config["files"]["spill_dir"]))
+    os.makedirs(spill_dir, exist_ok=True)
+
+    os.environ["POLARS_OOC_MEMORY_BUDGET_MB"] = str(config["settings"]["memory_budget_mb"])
+    os.environ["POLARS_OOC_SPILL_DIR"] = spill_dir
+    os.environ["POLARS_TEMP_DIR"] = spill_dir
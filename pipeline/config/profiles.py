@@ -0,0 +1,43 @@
+from typing import Any
+
+# Fallback values for keys missing from a write profile in config.yaml
+DEFAULT_WRITE_PROFILE: dict[str, Any] = {
+    "compression": "zstd",
+    "compression_level": None,
+    "row_group_size": 100_000,
+    "statistics": True,
+}
+
+# Codecs accepted by both Polars and DuckDB parquet writers
+PARQUET_CODECS = ("uncompressed", "snappy", "gzip", "brotli", "zstd", "lz4")
+
+# Codecs of Arrow IPC files (None disables IPC copies)
+IPC_CODECS = (None, "uncompressed", "lz4", "zstd")
+
+
+def get_write_profile(config: dict[str, Any], artifact: str) -> dict[str, Any]:
+    """Returns parquet write settings for an artifact ('processed' or 'marts'),
+    falling back to defaults for any missing keys.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+        artifact (str): Name of the profile in 'write_profiles' section, profiles
+            of Arrow IPC files end with '_ipc' (e.g. 'marts_ipc').
+
+    Raises:
+        ValueError: If the profile specifies an unknown compression codec.
+
+    Returns:
+        dict: Write profile with 'compression', 'compression_level', 'row_group_size' and 'statistics' keys.
+    """
+
+    profile = {**DEFAULT_WRITE_PROFILE, **config.get("write_profiles", {}).get(artifact, {})}
+    codecs = IPC_CODECS if artifact.endswith("_ipc") else PARQUET_CODECS
+
+    if profile["compression"] not in codecs:
+        raise ValueError(
+            f"Unknown compression '{profile['compression']}' in '{artifact}' write profile, "
+            f"expected one of: {', '.join(map(str, codecs))}."
+        )
+
+    return profile
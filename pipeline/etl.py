@@ -1,14 +1,19 @@
 import os
 import sys
 import logging
+import argparse
 from typing import Any
 
-import polars as pl
-
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-from config import load_config # noqa: E402
+from config import read_config, load_config, configure_streaming, ENGINE # noqa: E402
+
+# Polars reads its memory budget when imported, so the budget is set before
+# the config is compiled (which imports Polars) and before the pipeline modules
+configure_streaming(read_config())
+
+import polars as pl # noqa: E402
 
 # Load config
 config: dict[str, Any] = load_config()
@@ -34,29 +39,42 @@ logging.basicConfig(
     force=True
 )
 
-from etl import extract, transform, load # noqa: E402
+from etl import fetch, extract, transform, load, quarantine, materialize # noqa: E402
 
 logger = logging.getLogger(__name__)
 DEBUG_MODE = logger.isEnabledFor(logging.DEBUG)
 
 
-def run_extraction(config: dict[str, Any]) -> pl.LazyFrame:
+def run_extraction(config: dict[str, Any], seen_hashes: pl.LazyFrame | None = None) -> pl.LazyFrame:
     logger.info("Beginning data extraction...")
     raw_path = os.path.join(*config["files"]["raw_path"])
+    spill_dir = os.path.join(*config["files"]["spill_dir"])
+
+    # Extraction output is cached per raw file, config-only reruns start from the cache
+    cache_path = extract.raw_cache_path(config)
 
-    logger.info("1/5 Importing data...")
-    df = extract.import_json(raw_path)
+    if os.path.exists(cache_path):
+        logger.info(f"1-4/5 Reading cached raw data from '{cache_path}'...")
+        df = pl.scan_ipc(cache_path)
+    else:
+        logger.info("1/5 Importing data...")
+        df = extract.import_json(raw_path, spill_dir)
 
-    logger.info("2/5 Dropping duplicates...")
-    df = extract.drop_duplicates(df)
+        logger.info("2/5 Selecting columns...")
+        df = extract.select_columns(df, config)
 
-    logger.info("3/5 Selecting columns...")
-    df = extract.select_columns(df)
+        logger.info("3/5 Dropping duplicates...")
+        df = extract.drop_duplicates(df, config)
 
-    logger.info("4/5 Casting datatypes...")
-    df = extract.cast_dtypes(df)
+        logger.info("4/5 Casting datatypes...")
+        df = extract.cast_dtypes(df, config)
+        df = extract.write_raw_cache(df, cache_path)
 
-    logger.info("5/5 Dropping nulls...")
+    if seen_hashes is not None:
+        logger.info("Dropping records loaded by previous runs...")
+        df = extract.drop_seen_records(df, seen_hashes)
+
+    logger.info("5/5 Tagging rows with nulls...")
     df = extract.drop_nulls(df)
 
     return df
@@ -72,8 +90,8 @@ def run_transforms(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
     df = transform.transform_column_organunit(df, config)
 
     logger.info("3/4 Transforming 'weaponkind' column...")
-    df, wps_df = transform.transform_column_weaponkind(df, config)
-    df = transform.check_new_weapons(df, wps_df)
+    df = transform.transform_column_weaponkind(df, config)
+    df = transform.check_new_weapons(df)
 
     logger.info("4/4 Transforming date columns...")
     df = transform.transform_column_dates(df)
@@ -81,22 +99,68 @@ def run_transforms(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
     return df
 
 
-def run_load(df: pl.LazyFrame, config: dict[str, Any]) -> None:
+def run_load(df: pl.LazyFrame, config: dict[str, Any], append: bool = False) -> None:
     logger.info("Beginning data loading...")
     processed_path = os.path.join(*config["files"]["processed_path"])
 
-    logger.info("1/2 Sorting columns...")
+    logger.info("1/4 Sorting columns...")
     df = load.sort_columns(df)
 
-    logger.info("2/2 Exporting data...")
-    load.export_data(df, processed_path, config)
+    logger.info("2/4 Adding partition columns...")
+    df = load.add_partition_columns(df, config)
+
+    logger.info("3/4 Writing kept and quarantined rows...")
+    kept, dropped = quarantine.split_kept_and_quarantine(df, config)
+
+    # Rows stream from the raw data to the files in one pass, nothing is collected in memory
+    pl.collect_all(
+        [
+            load.sink_processed(kept.drop("record_hash"), processed_path, config),
+            # Quarantined records are not quarantined again by incremental runs
+            load.sink_hashes(pl.concat([kept.select("record_hash"), dropped.select("record_hash")]), config),
+            quarantine.sink_quarantine(dropped, config),
+        ],
+        engine=ENGINE
+    )
+
+    logger.info("4/4 Publishing processed data and quarantine...")
+    load.publish_processed(processed_path, append)
+    quarantine.write_quarantine(config)
+    load.save_seen_hashes(config, append)
+
+    return None
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Run ETL and materialization.")
+    parser.add_argument("--no-fetch", action="store_true", help="use the local raw file without checking for updates")
+    parser.add_argument("--skip-unchanged", action="store_true", help="stop if the raw data did not change (scheduled updates)")
+    args = parser.parse_args()
+
     try:  
-        df = run_extraction(config)
+        if not args.no_fetch:
+            logger.info("Fetching raw data...")
+            changed = fetch.fetch_raw_data(config)
+
+            if not changed and args.skip_unchanged:
+                logging.info("Raw data unchanged, pipeline run skipped.")
+                return None
+
+        logger.info(
+            f"Streaming engine memory budget: {config['settings']['memory_budget_mb']} MB, "
+            f"spilling to '{os.environ['POLARS_OOC_SPILL_DIR']}'."
+        )
+
+        # Hashes of previously loaded records, None unless the run is incremental
+        seen_hashes = extract.load_seen_hashes(config)
+        incremental = seen_hashes is not None
+
+        df = run_extraction(config, seen_hashes)
         df = run_transforms(df, config)
-        run_load(df, config)
+        run_load(df, config, append=incremental)
+
+        logger.info("Beginning materialization...")
+        materialize.iterate_materialization()
 
         logging.info("Pipeline run was successful.")
 
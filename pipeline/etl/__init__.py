@@ -1,7 +1,13 @@
+from .fetch import fetch_raw_data as fetch_raw_data
 from .extract import import_json as import_json
+from .extract import load_seen_hashes as load_seen_hashes
 from .extract import drop_duplicates as drop_duplicates
 from .extract import select_columns as select_columns
+from .extract import parse_dates as parse_dates
 from .extract import cast_dtypes as cast_dtypes
+from .extract import drop_seen_records as drop_seen_records
+from .extract import raw_cache_path as raw_cache_path
+from .extract import write_raw_cache as write_raw_cache
 from .extract import drop_nulls as drop_nulls
 from .transform import transform_column_reasonsearch as transform_column_reasonsearch
 from .transform import transform_column_organunit as transform_column_organunit
@@ -9,4 +15,12 @@ from .transform import transform_column_weaponkind as transform_column_weaponkin
 from .transform import check_new_weapons as check_new_weapons
 from .transform import transform_column_dates as transform_column_dates
 from .load import sort_columns as sort_columns
-from .load import export_data as export_data
\ No newline at end of file
+from .load import add_partition_columns as add_partition_columns
+from .load import sink_processed as sink_processed
+from .load import publish_processed as publish_processed
+from .load import sink_hashes as sink_hashes
+from .load import save_seen_hashes as save_seen_hashes
+from .quarantine import tag_dropped as tag_dropped
+from .quarantine import split_kept_and_quarantine as split_kept_and_quarantine
+from .quarantine import sink_quarantine as sink_quarantine
+from .quarantine import write_quarantine as write_quarantine
\ No newline at end of file
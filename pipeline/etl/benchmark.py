@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from typing import Any
+
+import polars as pl
+
+# Get current file's directory, go up 2 levels to 'pipeline'
+current_dir = os.path.dirname(os.path.abspath(__file__))
+pipeline_root = os.path.dirname(current_dir)
+project_root = os.path.dirname(pipeline_root)
+
+sys.path.append(pipeline_root)
+
+from config import load_config # noqa: E402
+
+# Load config
+config: dict[str, Any] = load_config()
+
+# Configure logging globally (console only, results are meant to be read right away)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+# Build paths relative to project root
+marts_dir = os.path.join(project_root, *config["files"]["marts_dir"])
+abs_processed_path = os.path.join(project_root, *config["files"]["processed_path"])
+
+# Codec and compression level pairs to compare (None = codec default)
+CODECS: list[tuple[str, int | None]] = [
+    ("uncompressed", None),
+    ("snappy", None),
+    ("lz4", None),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 9),
+    ("gzip", None),
+    ("brotli", None),
+]
+
+
+def load_artifact(artifact: str) -> dict[str, pl.DataFrame]:
+    """Loads data written by the given pipeline stage.
+
+    Args:
+        artifact (str): 'processed' (partitioned dataset) or 'marts' (all mart files).
+
+    Returns:
+        dict[str, pl.DataFrame]: Data frames keyed by their name.
+    """
+
+    if artifact == "processed":
+        processed_glob = os.path.join(abs_processed_path, "**", "*.parquet")
+        return {"processed": pl.read_parquet(processed_glob, hive_partitioning=True)}
+
+    return {
+        f.replace(".parquet", ""): pl.read_parquet(os.path.join(marts_dir, f))
+        for f in sorted(os.listdir(marts_dir)) if f.endswith(".parquet")
+    }
+
+
+def benchmark_codec(
+        frames: dict[str, pl.DataFrame],
+        compression: str,
+        compression_level: int | None,
+        tmp_dir: str,
+        repeat: int
+    ) -> tuple[float, int, float]:
+    """Writes and reads back all frames with a single codec.
+
+    Args:
+        frames (dict[str, pl.DataFrame]): Data frames to write.
+        compression (str): Parquet compression codec.
+        compression_level (int | None): Codec compression level.
+        tmp_dir (str): Directory for benchmark files.
+        repeat (int): Number of write/read repetitions, the best time is reported.
+
+    Returns:
+        tuple[float, int, float]: Write time (ms), total size (bytes) and read time (ms).
+    """
+
+    write_times, read_times = [], []
+    size = 0
+
+    for _ in range(repeat):
+        paths = []
+        start = time.perf_counter()
+        for name, df in frames.items():
+            path = os.path.join(tmp_dir, f"{name}-{compression}-{compression_level}.parquet")
+            df.write_parquet(path, compression=compression, compression_level=compression_level) # type: ignore[arg-type]
+            paths.append(path)
+        write_times.append(time.perf_counter() - start)
+
+        size = sum(os.path.getsize(p) for p in paths)
+
+        start = time.perf_counter()
+        for path in paths:
+            pl.read_parquet(path)
+        read_times.append(time.perf_counter() - start)
+
+    return min(write_times) * 1000, size, min(read_times) * 1000
+
+
+def run_benchmark(artifact: str, repeat: int) -> None:
+    "Measures write time, file size and read time of every codec on the selected artifact."
+
+    frames = load_artifact(artifact)
+    rows = sum(df.height for df in frames.values())
+    logger.info(f"Benchmarking {len(CODECS)} codecs on '{artifact}' ({len(frames)} files, {rows:,} rows, best of {repeat}).")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for compression, compression_level in CODECS:
+            results.append(
+                (compression, compression_level, *benchmark_codec(frames, compression, compression_level, tmp_dir, repeat))
+            )
+
+    logger.info(f"{'codec':<14}{'level':>6}{'write ms':>12}{'size KB':>12}{'read ms':>12}")
+    for compression, compression_level, write_ms, size, read_ms in sorted(results, key=lambda r: r[4]):
+        level = "-" if compression_level is None else str(compression_level)
+        logger.info(f"{compression:<14}{level:>6}{write_ms:>12.1f}{size / 1024:>12.1f}{read_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare parquet codecs on pipeline artifacts.")
+    parser.add_argument("--artifact", choices=["processed", "marts"], default="marts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.artifact, args.repeat)
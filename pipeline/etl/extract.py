@@ -1,44 +1,188 @@
+import os
+import json
+import codecs
+import hashlib
 import logging
+from typing import Any
 
+import numpy as np
 import polars as pl
-import polars.selectors as cs
 
 from config import enable_debug_logs
 
+from .quarantine import tag_dropped
+
 logger = logging.getLogger(__name__)
 DEBUG_MODE = logger.isEnabledFor(logging.DEBUG)
 
 
-def import_json(raw_path: str) -> pl.LazyFrame:
-    """Imports JSON data into Polars LazyFrame.
+# Columns used by the pipeline
+COLUMNS = ["weaponkind","organunit","reasonsearch","insertdate","theftdate"]
+
+# Raw string and date columns, dates are combined into 'date' when transforming
+STRING_COLUMNS = ["weaponkind","organunit","reasonsearch"]
+DATE_COLUMNS = ["insertdate","theftdate"]
+
+# Seed of record hashes, changing it invalidates hashes of loaded records
+HASH_SEED = 0
+
+# Bump to invalidate cached extraction output when extraction steps change
+RAW_CACHE_VERSION = 1
+
+# Bytes of JSON structure, nesting step of brackets (opening +1, closing -1) and line breaks
+QUOTE, BACKSLASH, SPACE, NEWLINE = ord('"'), ord("\\"), ord(" "), ord("\n")
+STRUCTURAL = np.zeros(256, dtype=bool)
+STRUCTURAL[list(b"{}[],")] = True
+NESTING_STEP = np.zeros(256, dtype=np.int64)
+NESTING_STEP[list(b"{[")] = 1
+NESTING_STEP[list(b"}]")] = -1
+LINE_BREAKS_TO_SPACES = bytes.maketrans(b"\r\n", b"  ")
+
+
+def json_to_ndjson(raw_path: str, ndjson_path: str, buffer_size: int = 1 << 22) -> None:
+    """Converts a JSON array of records into newline-delimited JSON, reading the file
+    in fixed-size buffers, so that memory use does not grow with the file size.
+
+    Records are not parsed, each buffer is scanned with vectorized NumPy operations for
+    unescaped quotes and the brackets and commas outside of strings. Commas between records
+    (nesting depth 1) become line breaks, the enclosing brackets and line breaks between tokens
+    become spaces, the rest is copied byte for byte and parsed by Polars when the NDJSON file is scanned.
+
+    Args:
+        raw_path (str): Path to the raw JSON file (array of records).
+        ndjson_path (str): Path of the NDJSON file to write.
+        buffer_size (int, optional): Bytes read at once. Defaults to 4M.
+
+    Raises:
+        ValueError: If the file does not contain a JSON array or the array is truncated.
+    """
+
+    tmp_path = f"{ndjson_path}.tmp"
+    records = 0
+
+    # State carried between buffers: inside a string, open brackets, trailing backslashes
+    in_string, depth, backslashes = False, 0, 0
+
+    with open(raw_path, "rb") as src, open(tmp_path, "wb") as dst:
+        if src.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+            src.seek(0)
+
+        buffer = src.read(buffer_size)
+        if not buffer.lstrip().startswith(b"["):
+            raise ValueError(f"Expected JSON array of records in '{raw_path}'.")
+
+        while buffer:
+            # JSON strings cannot contain raw line breaks, every one of them is between tokens
+            data = np.frombuffer(buffer.translate(LINE_BREAKS_TO_SPACES), dtype=np.uint8).copy()
+
+            # Quotes preceded by an odd number of backslashes are escaped
+            quotes = np.flatnonzero(data == QUOTE)
+            run = np.zeros(len(quotes), dtype=np.int64)
+            preceded = quotes > 0
+            while preceded.any():
+                preceded[preceded] = data[quotes[preceded] - run[preceded] - 1] == BACKSLASH
+                run += preceded
+                preceded &= quotes - run > 0
+            run += np.where(quotes == run, backslashes, 0)
+            quotes = quotes[run % 2 == 0]
+
+            # Brackets and commas outside of strings, i.e. after an even number of quotes
+            tokens = np.flatnonzero(STRUCTURAL[data])
+            tokens = tokens[(np.searchsorted(quotes, tokens) + in_string) % 2 == 0]
+            step = NESTING_STEP[data[tokens]]
+            nesting = depth + np.cumsum(step)
+
+            data[tokens[(step == 0) & (nesting == 1)]] = NEWLINE
+            data[tokens[((step == 1) & (nesting == 1)) | ((step == -1) & (nesting == 0))]] = SPACE
+            records += int(np.count_nonzero((step == 1) & (nesting == 2)))
+            dst.write(data.tobytes())
+
+            in_string = (in_string + len(quotes)) % 2 == 1
+            depth = int(nesting[-1]) if len(nesting) else depth
+            trailing = len(buffer) - len(buffer.rstrip(b"\\"))
+            backslashes = trailing + (backslashes if trailing == len(buffer) else 0)
+            buffer = src.read(buffer_size)
+
+        if depth != 0 or in_string:
+            raise ValueError(f"Truncated JSON array of records in '{raw_path}'.")
+        dst.write(b"\n")
+
+    os.replace(tmp_path, ndjson_path)
+    logger.info(f"Converted {records:,} records to '{ndjson_path}'.")
+
+
+def import_json(raw_path: str, spill_dir: str) -> pl.LazyFrame:
+    """Imports JSON data into Polars LazyFrame without reading the whole file into memory.
+
+    The raw JSON array is converted to NDJSON (once per raw file) in 'spill_dir',
+    which Polars scans in chunks with the streaming engine.
 
     Args:
         raw_path (str): Path to the raw JSON file.
+        spill_dir (str): Scratch directory for the NDJSON copy.
 
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
     """
 
-    df = pl.read_json(raw_path)
+    ndjson_path = os.path.join(spill_dir, os.path.splitext(os.path.basename(raw_path))[0] + ".ndjson")
 
-    # Generate info logs
-    enable_debug_logs(df, is_debug=True)
-    logger.debug(f"Estimated Size: {df.estimated_size('mb'):.0f} MB")
+    if not os.path.exists(ndjson_path) or os.path.getmtime(ndjson_path) < os.path.getmtime(raw_path):
+        json_to_ndjson(raw_path, ndjson_path)
 
-    return df.lazy()
+    # Infer schema from all records, fields that are null in the first rows would be typed as Null otherwise
+    df = pl.scan_ndjson(ndjson_path, infer_schema_length=None)
 
+    # Generate info logs if logger level is DEBUG
+    enable_debug_logs(df, is_debug=DEBUG_MODE)
+
+    return df
 
-def drop_duplicates(df: pl.LazyFrame) -> pl.LazyFrame:
-    """Drops duplicate records before filtering columns.
+
+def load_seen_hashes(config: dict[str, Any]) -> pl.LazyFrame | None:
+    """Returns hashes of records loaded by previous runs when incremental mode is on (config.yaml).
+
+    Hashes are only reused if they were computed with the same key and Polars version
+    (Polars hashes are not stable across versions), otherwise the run rebuilds the dataset.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame | None: Query plan (LazyFrame) with 'record_hash' column, None for a full run.
+    """
+
+    if not config["dedup"]["incremental"]:
+        return None
+
+    seen_path = os.path.join(*config["files"]["seen_hashes_path"])
+    if not (os.path.exists(seen_path) and os.path.exists(f"{seen_path}.json")):
+        logger.info("No hashes of loaded records found, rebuilding the dataset.")
+        return None
+
+    with open(f"{seen_path}.json", "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta != {"key": config["dedup"]["key"], "polars": pl.__version__}:
+        logger.warning(f"Hashes of loaded records were computed with {meta}, rebuilding the dataset.")
+        return None
+
+    return pl.scan_parquet(seen_path)
+
+
+def select_columns(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Selects columns from the available dataset, including columns of the deduplication key.
 
     Args:
         df (pl.LazyFrame): Import query plan (LazyFrame).
+        config (dict): YAML configuration dictionary.
 
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
     """
 
-    df = df.unique(maintain_order=False, keep="any")
+    key = config["dedup"]["key"]
+    df = df.select(COLUMNS + [c for c in key if c not in COLUMNS])
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
@@ -46,18 +190,29 @@ def drop_duplicates(df: pl.LazyFrame) -> pl.LazyFrame:
     return df
 
 
-def select_columns(df: pl.LazyFrame) -> pl.LazyFrame:
-    """Selects columns from the available dataset.
+def drop_duplicates(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Drops duplicate records using a 64-bit hash of the deduplication key (config.yaml),
+    so only the key columns are hashed instead of whole raw rows. Creates column 'record_hash',
+    by which rows are sorted.
 
     Args:
-        df (pl.LazyFrame): Query plan (LazyFrame) with no duplicates.
+        df (pl.LazyFrame): Query plan (LazyFrame) with selected columns.
+        config (dict): YAML configuration dictionary.
 
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
     """
 
-    columns = ["weaponkind","organunit","reasonsearch","insertdate","theftdate"]
-    df = df.select(columns)
+    key = config["dedup"]["key"]
+
+    df = df.with_columns(pl.struct(key).hash(seed=HASH_SEED).alias("record_hash"))
+
+    # A hash-based unique holds every distinct key in memory, while the sort spills
+    # under the memory budget and leaves duplicates next to each other
+    df = df.sort("record_hash").unique(subset="record_hash", maintain_order=True, keep="first")
+
+    # Drop key columns that are not used further
+    df = df.drop([c for c in key if c not in COLUMNS])
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
@@ -65,11 +220,64 @@ def select_columns(df: pl.LazyFrame) -> pl.LazyFrame:
     return df
 
 
-def cast_dtypes(df: pl.LazyFrame) -> pl.LazyFrame:
+def parse_dates(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Parses date columns, using the fixed ISO format for well-formed values and
+    fallback formats (config.yaml) only for the remaining ones.
+
+    Values no format could parse become nulls and are listed in column 'date_errors'
+    (e.g. 'theftdate=31/02/2015'), which is null for rows parsed without errors.
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with selected columns.
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame: Query plan (LazyFrame).
+    """
+
+    iso_format: str = config["date_formats"]["iso"]
+    fallback_formats: list[str] = config["date_formats"]["fallback"]
+    dtype = pl.Datetime("us")
+
+    def is_unparsed(column: str) -> pl.Expr:
+        return pl.col(column).is_not_null() & pl.col(f"{column}_parsed").is_null()
+
+    # Fast path: single fixed format over all rows
+    df = df.with_columns(
+        pl.col(c).str.strptime(dtype, iso_format, strict=False).alias(f"{c}_parsed")
+        for c in DATE_COLUMNS
+    )
+    has_unparsed = pl.any_horizontal(is_unparsed(c) for c in DATE_COLUMNS)
+
+    # Tolerant parsing of the (few) remaining rows, trying fallback formats in order
+    remainder = df.filter(has_unparsed).with_columns(
+        pl.coalesce(
+            pl.col(f"{c}_parsed"),
+            *(pl.col(c).str.strip_chars().str.strptime(dtype, fmt, strict=False) for fmt in fallback_formats)
+        ).alias(f"{c}_parsed")
+        for c in DATE_COLUMNS
+    )
+    df = pl.concat([df.filter(~has_unparsed), remainder], how="vertical")
+
+    # Raw values that could not be parsed by any format
+    date_errors = pl.concat_str(
+        [pl.when(is_unparsed(c)).then(pl.format(f"{c}={{}}", pl.col(c))) for c in DATE_COLUMNS],
+        separator="; ",
+        ignore_nulls=True
+    )
+    df = df.with_columns(pl.when(date_errors != "").then(date_errors).alias("date_errors"))
+
+    df = df.drop(DATE_COLUMNS).rename({f"{c}_parsed": c for c in DATE_COLUMNS})
+
+    return df
+
+
+def cast_dtypes(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
     """Casts correct data types onto columns.
 
     Args:
         df (pl.LazyFrame): Query plan (LazyFrame) with selected columns.
+        config (dict): YAML configuration dictionary.
 
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
@@ -79,21 +287,119 @@ def cast_dtypes(df: pl.LazyFrame) -> pl.LazyFrame:
         pl.col("weaponkind").cast(pl.String),
         pl.col("organunit").cast(pl.String),
         pl.col("reasonsearch").cast(pl.String),
-        pl.col("insertdate").str.strptime(pl.Datetime("us"), "%Y-%m-%dT%H:%M:%S"),
-        pl.col("theftdate").str.strptime(pl.Datetime("us"), "%Y-%m-%dT%H:%M:%S")
+        pl.col(DATE_COLUMNS).cast(pl.String)
     )
 
+    df = parse_dates(df, config)
+
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
 
     return df
 
 
+def drop_seen_records(df: pl.LazyFrame, seen_hashes: pl.LazyFrame) -> pl.LazyFrame:
+    """Drops records loaded by previous runs (incremental mode).
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with 'record_hash' column.
+        seen_hashes (pl.LazyFrame): Hashes of already loaded records.
+
+    Returns:
+        pl.LazyFrame: Query plan (LazyFrame).
+    """
+
+    df = df.join(seen_hashes, on="record_hash", how="anti")
+
+    # Generate info logs if logger level is DEBUG
+    enable_debug_logs(df, is_debug=DEBUG_MODE)
+
+    return df
+
+
+def raw_file_hash(raw_path: str) -> str:
+    """Returns sha256 of the raw file, taken from the download metadata (fetch stage)
+    if it still describes the file, otherwise computed from the file."""
+
+    meta_path = f"{raw_path}.meta.json"
+    if os.path.exists(meta_path) and os.path.getmtime(meta_path) >= os.path.getmtime(raw_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("sha256") and meta.get("size") == os.path.getsize(raw_path):
+            return meta["sha256"]
+
+    digest = hashlib.sha256()
+    with open(raw_path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def raw_cache_path(config: dict[str, Any]) -> str:
+    """Returns path of the cached extraction output for the current raw file.
+
+    The key covers the raw file hash and every setting that changes the cached data
+    (deduplication key, date formats, Polars version of record hashes), so edits
+    of other settings, e.g. regex_mappings or weapon_mappings, reuse the cache.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        str: Path of the Arrow IPC file in the scratch directory.
+    """
+
+    raw_path = os.path.join(*config["files"]["raw_path"])
+    spill_dir = os.path.join(*config["files"]["spill_dir"])
+
+    settings = json.dumps(
+        {
+            "version": RAW_CACHE_VERSION,
+            "key": config["dedup"]["key"],
+            "date_formats": config["date_formats"],
+            "polars": pl.__version__,
+        },
+        sort_keys=True
+    )
+    key = hashlib.sha256(f"{raw_file_hash(raw_path)}{settings}".encode()).hexdigest()[:16]
+
+    return os.path.join(spill_dir, f"raw-cache-{key}.arrow")
+
+
+def write_raw_cache(df: pl.LazyFrame, cache_path: str) -> pl.LazyFrame:
+    """Streams extraction output into an uncompressed Arrow IPC file, replacing older caches,
+    and returns a scan of it. Uncompressed IPC is memory-mapped on read, so later runs
+    skip JSON parsing, deduplication and date parsing.
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with deduplicated, type-cast columns.
+        cache_path (str): Path returned by raw_cache_path().
+
+    Returns:
+        pl.LazyFrame: Query plan (LazyFrame) scanning the cache.
+    """
+
+    cache_dir = os.path.dirname(cache_path)
+    for name in os.listdir(cache_dir):
+        if name.startswith("raw-cache-") and name.endswith(".arrow"):
+            os.remove(os.path.join(cache_dir, name))
+
+    tmp_path = f"{cache_path}.tmp"
+    df.sink_ipc(tmp_path, compression=None)
+    os.replace(tmp_path, cache_path)
+    logger.info(f"Cached extracted raw data to '{cache_path}'.")
+
+    return pl.scan_ipc(cache_path)
+
+
 def drop_nulls(df: pl.LazyFrame) -> pl.LazyFrame:
-    """Removes rows using the following sequence of operations:
-    1) drops rows full of null values; 
-    2) drops rows with at least one string value missing; 
-    3) drops rows with both datetime values missing.
+    """Tags rows to drop (column 'drop_reason') using the following sequence of checks:
+    1) rows full of null values ('all_null');
+    2) rows with at least one string value missing ('missing_string');
+    3) rows with both datetime values missing ('missing_date').
+
+    Tagged rows are written to quarantine instead of the processed dataset when loading.
 
     Args:
         df (pl.LazyFrame): Query plan (LazyFrame) with correct data types.
@@ -102,19 +408,18 @@ def drop_nulls(df: pl.LazyFrame) -> pl.LazyFrame:
         pl.LazyFrame: Query plan (LazyFrame).
     """
 
-    # Drop rows consisting of nulls only
-    df = df.filter(~pl.all_horizontal(pl.all().is_null()))
-    # Generate info logs if logger level is DEBUG
-    enable_debug_logs(df, is_debug=DEBUG_MODE, name="Dropped rows full of nulls.")
+    df = df.with_columns(pl.lit(None, dtype=pl.String).alias("drop_reason"))
 
-    # Drop rows where any string values are missing
-    df = df.drop_nulls(subset=cs.string())
-    # Generate info logs if logger level is DEBUG
-    enable_debug_logs(df, is_debug=DEBUG_MODE, name="Dropped rows with any string values missing.")
+    # Rows consisting of nulls only
+    df = tag_dropped(df, pl.all_horizontal(pl.col(COLUMNS).is_null()), "all_null")
+
+    # Rows where any string values are missing
+    df = tag_dropped(df, pl.any_horizontal(pl.col(STRING_COLUMNS).is_null()), "missing_string")
+
+    # Rows were both datetime columns contain nulls
+    df = tag_dropped(df, pl.all_horizontal(pl.col(DATE_COLUMNS).is_null()), "missing_date")
 
-    # Drop rows were both datetime columns contain nulls
-    df = df.filter(~(pl.col("insertdate").is_null() & pl.col("theftdate").is_null()))
     # Generate info logs if logger level is DEBUG
-    enable_debug_logs(df, is_debug=DEBUG_MODE, name="Dropped rows with both datetime values missing.")
+    enable_debug_logs(df, is_debug=DEBUG_MODE)
 
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,222 @@
+import os
+import json
+import gzip
+import time
+import hashlib
+import logging
+import http.client
+import urllib.error
+import urllib.request
+from typing import Any
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the response (and hashed) at once
+CHUNK_SIZE = 1 << 20
+
+# First bytes of a gzip stream, used to detect compressed files served as is
+GZIP_MAGIC = b"\x1f\x8b"
+
+USER_AGENT = "mia-ua-weapons-pipeline"
+
+
+def read_metadata(path: str) -> dict[str, Any]:
+    "Reads JSON sidecar file, returns an empty dictionary if it does not exist."
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_metadata(path: str, metadata: dict[str, Any]) -> None:
+    "Writes JSON sidecar file."
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def download(url: str, part_path: str, headers: dict[str, str], timeout: float) -> tuple[int, dict[str, Any], Any]:
+    """Streams response body into the partial file while hashing it, resuming
+    with a Range request if the partial file belongs to the same version of the resource.
+
+    Ranges of gzip-encoded responses address the compressed bytes, which differ between responses
+    of servers compressing on the fly, so ranged requests ask for the identity encoding and
+    partial files of encoded responses are downloaded again.
+
+    Args:
+        url (str): Resource URL.
+        part_path (str): Path of the partial download.
+        headers (dict): Request headers (conditional headers included).
+        timeout (float): Socket timeout in seconds.
+
+    Returns:
+        tuple[int, dict, hashlib._Hash]: Response status (200, 206 or 304), validators of
+            the downloaded version and sha256 of the downloaded bytes.
+    """
+
+    part_meta_path = f"{part_path}.json"
+    part_meta = read_metadata(part_meta_path)
+    request_headers = dict(headers)
+
+    # Resume only if the server can tell whether the resource changed since (If-Range)
+    offset = 0
+    validator = part_meta.get("etag") or part_meta.get("last_modified")
+    if os.path.exists(part_path) and part_meta.get("url") == url and validator and not part_meta.get("encoding"):
+        offset = os.path.getsize(part_path)
+        request_headers["Range"] = f"bytes={offset}-"
+        request_headers["If-Range"] = validator
+        request_headers["Accept-Encoding"] = "identity"
+
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=request_headers), timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, {}, None
+        if e.code == 416:
+            # Partial file does not fit the resource anymore, start over
+            os.remove(part_path)
+            return download(url, part_path, headers, timeout)
+        raise
+
+    with response:
+        validators = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+        # Server ignored the range (resource changed or no range support), restart the file
+        mode = "ab" if response.status == 206 else "wb"
+        if mode == "ab":
+            logger.info(f"Resuming download at {offset:,} bytes.")
+        write_metadata(part_meta_path, {**validators, "encoding": response.headers.get("Content-Encoding")})
+
+        # Hash resumed bytes first, the rest is hashed as it arrives
+        digest = hashlib.sha256()
+        if mode == "ab":
+            with open(part_path, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    digest.update(chunk)
+
+        received = 0
+        with open(part_path, mode) as f:
+            while chunk := response.read(CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+                received += len(chunk)
+
+        # Closed connection looks like a complete body, the partial file is resumed on retry
+        expected = response.headers.get("Content-Length")
+        if expected is not None and received < int(expected):
+            raise http.client.IncompleteRead(b"", int(expected) - received)
+
+    return response.status, validators, digest
+
+
+def finalize(part_path: str, tmp_path: str, digest: Any) -> str:
+    """Moves complete download to 'tmp_path', decompressing (and re-hashing) gzip content
+    in one pass. Uncompressed content keeps the hash computed while downloading.
+
+    Args:
+        part_path (str): Path of the complete download.
+        tmp_path (str): Path of the final content.
+        digest (hashlib._Hash): sha256 of the downloaded bytes.
+
+    Returns:
+        str: sha256 of the (decompressed) content.
+    """
+
+    with open(part_path, "rb") as f:
+        compressed = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    if not compressed:
+        os.replace(part_path, tmp_path)
+        return digest.hexdigest()
+
+    digest = hashlib.sha256()
+    with gzip.open(part_path, "rb") as src, open(tmp_path, "wb") as dst:
+        while chunk := src.read(CHUNK_SIZE):
+            digest.update(chunk)
+            dst.write(chunk)
+    os.remove(part_path)
+    logger.info("Decompressed gzip download.")
+
+    return digest.hexdigest()
+
+
+def fetch_raw_data(config: dict[str, Any]) -> bool:
+    """Downloads raw data (config.yaml) only if it changed since the previous download.
+
+    - sends ETag/Last-Modified of the previous download (If-None-Match/If-Modified-Since);
+    - resumes interrupted downloads with Range requests, retrying with backoff;
+    - decompresses gzip responses;
+    - compares sha256 of the content with the previous download, for servers without validators.
+
+    Validators and hash are kept in a JSON sidecar next to the raw file ('<raw file>.meta.json').
+
+    Args:
+        config (dict): YAML configuration dictionary.
+
+    Raises:
+        urllib.error.URLError: If the download fails after all retries.
+
+    Returns:
+        bool: True if the raw file was replaced with new content.
+    """
+
+    url: str = config["fetch"]["url"]
+    timeout: float = config["fetch"]["timeout"]
+    retries: int = config["fetch"]["retries"]
+
+    raw_path = os.path.join(*config["files"]["raw_path"])
+    meta_path = f"{raw_path}.meta.json"
+    part_path = f"{raw_path}.part"
+    tmp_path = f"{raw_path}.tmp"
+
+    meta = read_metadata(meta_path)
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+
+    # Conditional request only makes sense if the previous download is at hand
+    if os.path.exists(raw_path) and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    for attempt in range(retries + 1):
+        try:
+            status, validators, digest = download(url, part_path, headers, timeout)
+            break
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            # Client errors will not go away with retries
+            if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                raise
+            if attempt == retries:
+                raise
+            wait = 2 ** attempt
+            logger.warning(f"Download interrupted ({e.__class__.__name__}: {e}), retrying in {wait}s...")
+            time.sleep(wait)
+
+    if status == 304:
+        logger.info("Raw data not modified since the previous download.")
+        return False
+
+    sha256 = finalize(part_path, tmp_path, digest)
+    os.remove(f"{part_path}.json")
+
+    changed = not (os.path.exists(raw_path) and meta.get("sha256") == sha256)
+    if changed:
+        os.replace(tmp_path, raw_path)
+        logger.info(f"Downloaded raw data to '{raw_path}' ({os.path.getsize(raw_path):,} bytes).")
+    else:
+        os.remove(tmp_path)
+        logger.info("Downloaded raw data is identical to the previous download.")
+
+    write_metadata(meta_path, {
+        **validators,
+        "sha256": sha256,
+        "size": os.path.getsize(raw_path),
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    })
+
+    return changed
@@ -1,16 +1,23 @@
+import os
+import json
+import shutil
 import logging
 from typing import Any
+from datetime import datetime
 
 import polars as pl
 
-from config import enable_debug_logs
+from config import ENGINE, enable_debug_logs, get_write_profile
+
+from .quarantine import KEPT_SCHEMA, tag_dropped
 
 logger = logging.getLogger(__name__)
 DEBUG_MODE = logger.isEnabledFor(logging.DEBUG)
 
 
 def sort_columns (df: pl.LazyFrame) -> pl.LazyFrame:
-    """Sorts and reorders columns.
+    """Tags rows with missing output values to drop and sorts rows by date and region.
+    Columns are selected and reordered when kept rows are split from quarantine.
 
     Args:
         df (pl.LazyFrame): Post-transformation query plan (LazyFrame).
@@ -18,18 +25,10 @@ def sort_columns (df: pl.LazyFrame) -> pl.LazyFrame:
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
     """
-    
-    # Apply schema to reorder columns
-    df = df.match_to_schema({
-        "report": pl.String,
-        "region": pl.String, 
-        "weaponcategory": pl.String, 
-        "date": pl.Datetime("us")
-    })
 
-    df = df.sort(by=["date", "region"], descending=False)
+    df = tag_dropped(df, pl.any_horizontal(pl.col(list(KEPT_SCHEMA)).is_null()), "null_value")
 
-    df = df.drop_nulls()
+    df = df.sort(by=["date", "region"], descending=False)
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
@@ -37,20 +36,165 @@ def sort_columns (df: pl.LazyFrame) -> pl.LazyFrame:
     return df
 
 
-def export_data(df: pl.LazyFrame, processed_path: str, config: dict[str, Any]) -> None:
-    """Exports data to gzip compressed parquet file.
+def add_partition_columns(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Derives hive partition key columns (e.g. 'year') from the 'date' column.
+
+    Keys that already exist as columns (e.g. 'region') are left untouched.
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with sorted rows.
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame: Query plan (LazyFrame).
+    """
+
+    partition_by: list[str] = config["settings"]["partition_by"]
+
+    if "year" in partition_by:
+        df = df.with_columns(pl.col("date").dt.year().alias("year"))
+
+    # Generate info logs if logger level is DEBUG
+    enable_debug_logs(df, is_debug=DEBUG_MODE)
+
+    return df
+
+
+def sink_processed(
+        df: pl.LazyFrame,
+        processed_path: str,
+        config: dict[str, Any]
+    ) -> pl.LazyFrame:
+    """Returns a sink (query plan, not executed) writing data to a hive-partitioned parquet
+    dataset, i.e. one 'key=value' directory per partition (e.g. 'year=2014/'), so that
+    readers filtering on partition keys only touch relevant files.
+
+    The dataset is staged in a sibling '.tmp' directory and published by publish_processed
+    once the sink has run, so a failed run leaves the previous dataset intact.
 
     Args:
-        df (pl.LazyFrame): Query plan (LazyFrame) with sorted and reordered columns.
-        processed_path: File path to which the data should be wrtitten.
+        df (pl.LazyFrame): Query plan (LazyFrame) with partition key columns.
+        processed_path: Directory to which the dataset should be written.
         config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame: Sink, to be executed with pl.collect_all.
     """
 
-    # Write data to compressed parquet file
-    df.sink_parquet(
-        path=processed_path,
-        compression=config["settings"]["parquet_compression"]
+    # Codec, level, row group size and statistics of the processed dataset (config.yaml)
+    profile = get_write_profile(config, "processed")
+    partition_by: list[str] = config["settings"]["partition_by"]
+
+    # Leftovers of an interrupted run
+    tmp_path = f"{processed_path}.tmp"
+    old_path = f"{processed_path}.old"
+    for path in (tmp_path, old_path):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+    os.makedirs(tmp_path)
+
+    # Stream data to compressed parquet files, one directory per partition (key columns are in directory names)
+    return df.sink_parquet(
+        pl.PartitionBy(tmp_path, key=partition_by or None, include_key=not partition_by),
+        compression=profile["compression"],
+        compression_level=profile["compression_level"],
+        statistics=profile["statistics"],
+        row_group_size=profile["row_group_size"],
+        mkdir=True,
+        lazy=True
     )
+
+
+def publish_processed(processed_path: str, append: bool = False) -> None:
+    """Publishes the dataset staged by sink_processed.
+
+    Args:
+        processed_path: Directory of the dataset.
+        append (bool, optional): Add staged files to existing partitions (incremental run)
+            instead of replacing the dataset. Defaults to False.
+    """
+
+    tmp_path = f"{processed_path}.tmp"
+    old_path = f"{processed_path}.old"
+
+    if append:
+        # New files are named after the run, existing files stay untouched
+        run = f"part-{datetime.now():%Y%m%d%H%M%S}"
+        staged = 0
+        for root, _, files in os.walk(tmp_path):
+            part_dir = os.path.join(processed_path, os.path.relpath(root, tmp_path))
+            for f in files:
+                os.makedirs(part_dir, exist_ok=True)
+                os.replace(os.path.join(root, f), os.path.join(part_dir, f"{run}-{f}"))
+                staged += 1
+        shutil.rmtree(tmp_path)
+
+        if staged == 0:
+            logger.info("No new records to export.")
+        else:
+            logger.info(f"Appended {staged} files to '{processed_path}'.")
+
+        return None
+
+    # Swap the complete dataset in, partitions missing from the new data do not linger
+    if os.path.isdir(processed_path):
+        os.replace(processed_path, old_path)
+    os.replace(tmp_path, processed_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
     logger.info(f"Exported data to '{processed_path}'.")
 
-    return None
\ No newline at end of file
+    return None
+
+
+def sink_hashes(hashes: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Returns a sink (query plan, not executed) writing hashes of the records loaded
+    or quarantined by this run to a temporary file, merged by save_seen_hashes.
+
+    Args:
+        hashes (pl.LazyFrame): Query plan (LazyFrame) with 'record_hash' column.
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame: Sink, to be executed with pl.collect_all.
+    """
+
+    seen_path = os.path.join(*config["files"]["seen_hashes_path"])
+
+    return hashes.select("record_hash").sink_parquet(f"{seen_path}.run.tmp", mkdir=True, lazy=True)
+
+
+def save_seen_hashes(config: dict[str, Any], append: bool = False) -> None:
+    """Persists hashes of loaded and quarantined records (written by sink_hashes) as a sorted parquet column,
+    with the key and Polars version they were computed with in a JSON sidecar file.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+        append (bool, optional): Merge with hashes of previous runs (incremental run). Defaults to False.
+    """
+
+    seen_path = os.path.join(*config["files"]["seen_hashes_path"])
+    run_path = f"{seen_path}.run.tmp"
+
+    seen = pl.scan_parquet(run_path)
+    if append:
+        seen = pl.concat([pl.scan_parquet(seen_path), seen])
+
+    # Sorted unique values compress well and allow min/max pruning of anti-joins,
+    # written next to the previous file, which the query still reads
+    (
+        seen
+        .unique()
+        .sort("record_hash")
+        .sink_parquet(f"{seen_path}.tmp", compression="zstd", statistics=True, engine=ENGINE)
+    )
+    os.replace(f"{seen_path}.tmp", seen_path)
+    os.remove(run_path)
+
+    with open(f"{seen_path}.json", "w", encoding="utf-8") as f:
+        json.dump({"key": config["dedup"]["key"], "polars": pl.__version__}, f)
+
+    rows = pl.scan_parquet(seen_path).select(pl.len()).collect(engine=ENGINE).item()
+    logger.info(f"Saved {rows:,} hashes of loaded and quarantined records to '{seen_path}'.")
+
+    return None
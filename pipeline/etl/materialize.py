@@ -1,8 +1,10 @@
 import os
 import sys
+import hashlib
 import logging
 from typing import Any
 import duckdb
+import pyarrow.feather as feather
 
 # Get current file's directory, go up 2 levels to 'pipeline'
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,30 +13,11 @@ project_root = os.path.dirname(pipeline_root)
 
 sys.path.append(pipeline_root)
 
-from config import load_config # noqa: E402
+from config import load_config, get_write_profile # noqa: E402
 
 # Load config
 config: dict[str, Any] = load_config()
-log_level: str = getattr(logging, config["settings"]["log_level"])
-export_logs: bool = config["settings"]["export_logs"]
-
-# Conditional debug logs export (config.yaml)
-file_name = None
-encoding = None
-file_mode = "a"
-if export_logs:
-    file_name = os.path.join(project_root, *config["files"]["materialize_logs_path"])
-    file_mode = "w"
-    encoding = "utf-8"
-
-# Configure logging globally
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename=file_name,
-    filemode=file_mode,
-    encoding=encoding
-)
+persistent_database: bool = config["settings"]["persistent_database"]
 
 logger = logging.getLogger(__name__)
 
@@ -42,26 +25,200 @@ logger = logging.getLogger(__name__)
 models_dir = os.path.join(project_root, *config["files"]["models_dir"])
 marts_dir = os.path.join(project_root, *config["files"]["marts_dir"])
 abs_processed_path = os.path.join(project_root, *config["files"]["processed_path"])
+# Glob over hive-partitioned dataset files, e.g. '.../year=2014/*.parquet'
+processed_glob = os.path.join(abs_processed_path, "**", "*.parquet").replace(os.sep, "/")
+database_path = os.path.join(project_root, *config["files"]["database_path"])
+population_path = os.path.join(project_root, *config["files"]["population_path"]).replace(os.sep, "/")
 
 # Generate a list of available models
 models_list = [f for f in os.listdir(models_dir) if f.endswith('.sql')]
 
-# Create module-level duckdb conncetion
-db_connection = duckdb.connect()
 
+def configure_logging() -> None:
+    "Configures logging when materialization runs as a standalone script."
 
-def run_model(model_name: str) -> duckdb.DuckDBPyRelation:
+    # Conditional debug logs export (config.yaml)
+    file_name = None
+    encoding = None
+    file_mode = "a"
+    if config["settings"]["export_logs"]:
+        file_name = os.path.join(project_root, *config["files"]["materialize_logs_path"])
+        file_mode = "w"
+        encoding = "utf-8"
+
+    logging.basicConfig(
+        level=getattr(logging, config["settings"]["log_level"]),
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        filename=file_name,
+        filemode=file_mode,
+        encoding=encoding
+    )
+
+
+def connect() -> duckdb.DuckDBPyConnection:
+    "Opens duckdb connection, either to the database file (persistent database) or in memory."
+
+    if persistent_database:
+        os.makedirs(os.path.dirname(database_path), exist_ok=True)
+        return duckdb.connect(database_path)
+    return duckdb.connect()
+
+
+def file_fingerprints(previous: dict[str, tuple[int, int, str]]) -> dict[str, tuple[int, int, str]]:
+    """Fingerprints every file of the processed dataset by size, modification time and content hash.
+
+    Files whose size and modification time match the previous run keep their stored hash,
+    only new and modified files are read and hashed.
+
+    Args:
+        previous (dict[str, tuple[int, int, str]]): Fingerprints stored by the previous run.
+
+    Returns:
+        dict[str, tuple[int, int, str]]: File path relative to dataset root (e.g. 'year=2014/part-0.parquet')
+            and its size, modification time (ns) and sha256.
+    """
+
+    fingerprints = {}
+    for root, _, files in os.walk(abs_processed_path):
+        for f in sorted(f for f in files if f.endswith('.parquet')):
+            file_path = os.path.join(root, f)
+            stat = os.stat(file_path)
+            path = os.path.relpath(file_path, abs_processed_path).replace(os.sep, "/")
+
+            if path in previous and previous[path][:2] == (stat.st_size, stat.st_mtime_ns):
+                fingerprints[path] = previous[path]
+                continue
+
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as fb:
+                while chunk := fb.read(1 << 20):
+                    digest.update(chunk)
+            fingerprints[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+    return fingerprints
+
+
+def partition_contents(fingerprints: dict[str, tuple[int, int, str]]) -> dict[str, set[tuple[str, str]]]:
+    "Groups file hashes by partition directory, e.g. {'year=2014': {('year=2014/part-0.parquet', '<sha256>')}}."
+
+    partitions: dict[str, set[tuple[str, str]]] = {}
+    for path, (_, _, digest) in fingerprints.items():
+        partitions.setdefault(path.rpartition("/")[0], set()).add((path, digest))
+
+    return partitions
+
+
+def processed_schema_changed(db_connection: duckdb.DuckDBPyConnection) -> bool:
+    "Compares column names and types of 'weapons' table with the processed dataset."
+
+    dataset = db_connection.execute(
+        f"DESCRIBE SELECT * FROM read_parquet('{processed_glob}', hive_partitioning=true)"
+    ).fetchall()
+    table = db_connection.execute("DESCRIBE weapons").fetchall()
+
+    return [row[:2] for row in dataset] != [row[:2] for row in table]
+
+
+def sync_processed_table(db_connection: duckdb.DuckDBPyConnection) -> None:
+    """Incrementally updates 'weapons' table of the database file from the processed dataset.
+
+    Only partitions whose files changed since the previous run are merged,
+    i.e. their rows are deleted and re-inserted in a single transaction.
+    Partitions that no longer exist are deleted. A table whose columns differ
+    from the dataset (e.g. a column was added) is rebuilt from scratch.
+    """
+
+    has_table = db_connection.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'weapons'"
+    ).fetchone()[0] > 0 # type: ignore
+    if has_table and processed_schema_changed(db_connection):
+        logger.warning("Processed dataset columns changed, rebuilding 'weapons' table.")
+        db_connection.execute("DROP TABLE weapons")
+        db_connection.execute("DROP TABLE IF EXISTS processed_files")
+
+    db_connection.execute(f"""
+        CREATE TABLE IF NOT EXISTS weapons AS
+        SELECT * FROM read_parquet('{processed_glob}', hive_partitioning=true) LIMIT 0
+    """)
+    db_connection.execute(
+        "CREATE TABLE IF NOT EXISTS processed_files (path VARCHAR, size BIGINT, mtime_ns BIGINT, sha256 VARCHAR)"
+    )
+
+    previous_files = {
+        path: (size, mtime_ns, digest)
+        for path, size, mtime_ns, digest in db_connection.execute("SELECT * FROM processed_files").fetchall()
+    }
+    current_files = file_fingerprints(previous_files)
+
+    previous = partition_contents(previous_files)
+    current = partition_contents(current_files)
+
+    changed = [p for p, contents in current.items() if previous.get(p) != contents]
+    removed = [p for p in previous if p not in current]
+
+    db_connection.execute("BEGIN TRANSACTION")
+    try:
+        for partition in changed + removed:
+            # Partition keys, e.g. 'year=2014/region=Kyiv' >>> year = '2014' AND region = 'Kyiv'
+            keys = [k.split("=", 1) for k in partition.split("/")]
+            predicate = " AND ".join(f"CAST({name} AS VARCHAR) = ?" for name, _ in keys)
+            db_connection.execute(f"DELETE FROM weapons WHERE {predicate}", [value for _, value in keys])
+
+            if partition in current:
+                partition_glob = os.path.join(abs_processed_path, partition, "*.parquet").replace(os.sep, "/")
+                db_connection.execute(f"""
+                    INSERT INTO weapons BY NAME
+                    SELECT * FROM read_parquet('{partition_glob}', hive_partitioning=true)
+                """)
+
+        # Sizes and modification times of unchanged files can differ too (e.g. a fresh checkout)
+        db_connection.execute("DELETE FROM processed_files")
+        db_connection.executemany(
+            "INSERT INTO processed_files VALUES (?, ?, ?, ?)",
+            [[path, *fingerprint] for path, fingerprint in current_files.items()]
+        )
+
+        db_connection.execute("COMMIT")
+    except Exception:
+        db_connection.execute("ROLLBACK")
+        raise
+
+    logger.info(f"Merged {len(changed)} changed and removed {len(removed)} missing partitions of {len(current)}.")
+
+
+def register_processed_view(db_connection: duckdb.DuckDBPyConnection) -> None:
+    "Exposes the processed dataset as 'weapons' view of the in-memory database."
+
+    db_connection.execute(f"""
+        CREATE OR REPLACE VIEW weapons AS
+        SELECT * FROM read_parquet('{processed_glob}', hive_partitioning=true)
+    """)
+
+
+def register_population_view(db_connection: duckdb.DuckDBPyConnection) -> None:
+    """Exposes population by region and year (one column per year) as 'ua_population' view,
+    used by per-capita models."""
+
+    db_connection.execute(f"""
+        CREATE OR REPLACE VIEW ua_population AS
+        SELECT * FROM read_csv('{population_path}', header=true)
+    """)
+
+
+def mart_table_name(model_name: str) -> str:
+    "Converts model file name into SQL table name, e.g. 'region-total.sql' >>> 'region_total'."
+    return model_name.replace('.sql', '').replace('-', '_')
+
+
+def run_model(db_connection: duckdb.DuckDBPyConnection, model_name: str) -> duckdb.DuckDBPyRelation:
     """Executes SQL query on the processed data, mainly for inspection/debugging."""
 
     model_path = os.path.join(models_dir, model_name)
     
     with open(model_path, 'r') as f:
         query = f.read()
-    
-    # Replace the template path variable with absolute path
-    query = query.format(processed_path=abs_processed_path)
 
-    # Use shared connection
+    # Use shared connection, models read processed data from 'weapons' table (or view)
     relation: duckdb.DuckDBPyRelation = db_connection.sql(query)
     
     if logger.isEnabledFor(logging.DEBUG):
@@ -72,30 +229,126 @@ def run_model(model_name: str) -> duckdb.DuckDBPyRelation:
     return relation
 
 
-def materialize_model(model_name: str, relation: duckdb.DuckDBPyRelation) -> None:
-    "Materializes (writes) single relation (table) to parquet."
+def parquet_copy_options(profile: dict[str, Any]) -> str:
+    """Translates a write profile (config.yaml) into DuckDB COPY options.
+
+    Raises:
+        ValueError: If the profile disables statistics, which DuckDB always writes.
+    """
+
+    if not profile["statistics"]:
+        raise ValueError("DuckDB always writes parquet statistics, 'statistics: False' is not supported for marts.")
+
+    options = [
+        "FORMAT parquet",
+        f"COMPRESSION {profile['compression']}",
+        f"ROW_GROUP_SIZE {int(profile['row_group_size'])}",
+    ]
+    # DuckDB only supports compression levels for zstd
+    if profile["compression"] == "zstd" and profile["compression_level"] is not None:
+        options.append(f"COMPRESSION_LEVEL {int(profile['compression_level'])}")
+
+    return ", ".join(options)
+
+
+def materialize_model(db_connection: duckdb.DuckDBPyConnection, model_name: str, relation: duckdb.DuckDBPyRelation) -> None:
+    """Materializes (writes) single relation (table) to parquet and, if enabled (config.yaml),
+    to an Arrow IPC file. With persistent database the relation is also stored as a table
+    of the database file."""
 
     # Create model-based file name
     output_file = os.path.join(marts_dir, f"{model_name.replace('.sql', '.parquet')}")
-    # Write relation to parquet
-    relation.write_parquet(output_file, compression='brotli')
+    # Write relation to parquet using marts write profile (config.yaml)
+    copy_options = parquet_copy_options(get_write_profile(config, "marts"))
+    relation.create_view("mart", replace=True)
+
+    source = "mart"
+    if persistent_database:
+        source = mart_table_name(model_name)
+        db_connection.execute(f"CREATE OR REPLACE TABLE {source} AS SELECT * FROM mart")
+    db_connection.execute(f"COPY {source} TO '{output_file}' ({copy_options})")
+
+    # Arrow IPC copy, which the app memory-maps instead of decoding parquet. Written through
+    # a temporary file, truncating a memory-mapped file in place would break its readers
+    ipc_file = output_file.replace('.parquet', '.arrow')
+    ipc_compression = get_write_profile(config, "marts_ipc")["compression"]
+    if ipc_compression is not None:
+        tmp_file = f"{ipc_file}.{os.getpid()}.tmp"
+        feather.write_feather(db_connection.sql(f"SELECT * FROM {source}").arrow(), tmp_file, compression=ipc_compression)
+        os.replace(tmp_file, ipc_file)
+    elif os.path.exists(ipc_file):
+        # Remove stale copy, so the app falls back to parquet
+        os.remove(ipc_file)
+
+
+def build_database(db_connection: duckdb.DuckDBPyConnection) -> None:
+    """Builds DuckDB database file with processed data ('weapons' table) and every mart
+    from scratch, which the app opens read-only to query slices not covered by marts.
+    Used when the database is not persistent, i.e. materialization runs in memory.
+
+    Processed data is stored sorted by date and region, so that DuckDB min/max
+    zonemaps of each row group allow skipping data on date, year and region filters.
+    The file is built next to the target and swapped in atomically. It is not committed,
+    the app queries the committed processed dataset and marts directly without it.
+    """
+
+    os.makedirs(os.path.dirname(database_path), exist_ok=True)
+    tmp_path = f"{database_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    db_connection.execute(f"ATTACH '{tmp_path}' AS warehouse")
+
+    db_connection.execute("CREATE TABLE warehouse.weapons AS SELECT * FROM weapons ORDER BY date, region")
+
+    for model_name in models_list:
+        mart_path = os.path.join(marts_dir, model_name.replace('.sql', '.parquet'))
+        db_connection.execute(
+            f"CREATE TABLE warehouse.{mart_table_name(model_name)} AS SELECT * FROM read_parquet('{mart_path}')"
+        )
+
+    # Detaching flushes (checkpoints) the database file
+    db_connection.execute("DETACH warehouse")
+    os.replace(tmp_path, database_path)
+
+    logger.info(f"Built query database '{database_path}'.")
 
 
 def iterate_materialization() -> None:
-    "Iterates materialization process over all models stored in specified 'marts' directory."
+    """Iterates materialization process over all models stored in specified 'marts' directory."""
+
+    db_connection = connect()
+
+    try:
+        if persistent_database:
+            sync_processed_table(db_connection)
+        else:
+            register_processed_view(db_connection)
+        register_population_view(db_connection)
 
-    try:  
         logger.info(f"Starting materialization of {len(models_list)} models.")
         for model_name in models_list:
             
-            relation = run_model(model_name)
-            materialize_model(model_name, relation)
+            relation = run_model(db_connection, model_name)
+            materialize_model(db_connection, model_name, relation)
             
             logger.info(f"Completed model: {model_name}")
 
+        if persistent_database:
+            db_connection.execute("CHECKPOINT")
+        else:
+            build_database(db_connection)
+
+        logger.info("Materialization successfully completed!")
+
+    finally:
         # Close connection when all iterations are finished
         db_connection.close()
-        logger.info("Materialization successfully completed!")
+
+
+def main() -> None:
+    try:
+        iterate_materialization()
 
     except Exception as e:
         logging.critical(f"Materilization failed: {e.__class__.__name__}: {e}")
@@ -103,4 +356,5 @@ def iterate_materialization() -> None:
 
 
 if __name__ == "__main__":
-    iterate_materialization()
\ No newline at end of file
+    configure_logging()
+    main()
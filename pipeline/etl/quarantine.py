@@ -0,0 +1,162 @@
+import os
+import logging
+from typing import Any
+from datetime import datetime
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Reasons for dropping a row, in pipeline order (the first matching reason is kept)
+DROP_REASONS = {
+    "all_null": "all fields are missing",
+    "missing_string": "weapon, unit or report type is missing",
+    "missing_date": "both dates are missing or unparsable",
+    "unknown_region": "unit name matches no region regex",
+    "unknown_weapon": "weapon is missing from weapon_mappings",
+    "pre_independence": "date is before 24 August 1991",
+    "null_value": "output column is missing",
+}
+
+# Columns and data types of kept rows (partition key columns are appended)
+KEPT_SCHEMA = {
+    "report": pl.String,
+    "region": pl.String,
+    "weaponcategory": pl.String,
+    "date": pl.Datetime("us"),
+    "record_hash": pl.UInt64,
+}
+
+# Columns of the quarantine file, mostly source fields for review
+QUARANTINE_COLUMNS = [
+    "drop_reason", "date_errors", "record_hash", "report", "organunit",
+    "weaponkind", "insertdate", "theftdate", "region", "weaponcategory", "date",
+]
+
+
+def tag_dropped(df: pl.LazyFrame, condition: pl.Expr, reason: str) -> pl.LazyFrame:
+    """Tags rows matching the condition with a drop reason, unless they already have one.
+    Tagged rows stay in the query plan and are split off when loading.
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with 'drop_reason' column.
+        condition (pl.Expr): Boolean expression selecting rows to drop.
+        reason (str): Key of DROP_REASONS.
+
+    Returns:
+        pl.LazyFrame: Query plan (LazyFrame).
+    """
+
+    df = df.with_columns(
+        pl.when(pl.col("drop_reason").is_null() & condition)
+        .then(pl.lit(reason))
+        .otherwise(pl.col("drop_reason"))
+        .alias("drop_reason")
+    )
+
+    return df
+
+
+def split_kept_and_quarantine(df: pl.LazyFrame, config: dict[str, Any]) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Splits the query plan into kept rows and quarantined rows.
+
+    Quarantine holds dropped rows and kept rows with an unparsable date value.
+    Sinks of both plans are executed together (pl.collect_all), which runs
+    the plan up to the split once.
+
+    Args:
+        df (pl.LazyFrame): Query plan (LazyFrame) with 'drop_reason' and partition key columns.
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        tuple[pl.LazyFrame, pl.LazyFrame]: Kept rows (KEPT_SCHEMA and partition keys) and quarantined rows.
+    """
+
+    partition_by = [c for c in config["settings"]["partition_by"] if c not in KEPT_SCHEMA]
+
+    # Without an explicit cache, common subplan elimination only shares the sort
+    # between two of the three sinks (processed, hashes and quarantine)
+    df = df.cache()
+
+    kept = (
+        df
+        .filter(pl.col("drop_reason").is_null())
+        .select(*KEPT_SCHEMA, *partition_by)
+        .cast(KEPT_SCHEMA)
+    )
+    quarantine = (
+        df
+        .filter(pl.col("drop_reason").is_not_null() | pl.col("date_errors").is_not_null())
+        .select(QUARANTINE_COLUMNS)
+    )
+
+    return kept, quarantine
+
+
+def quarantine_path(config: dict[str, Any], run: str | None = None) -> str:
+    "Returns path of the quarantine file of a run, or of the file staged by sink_quarantine."
+    name = f"dropped-rows-{run}.parquet" if run else "dropped-rows.parquet.tmp"
+    return os.path.join(*config["files"]["quarantine_dir"], name)
+
+
+def sink_quarantine(quarantine: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
+    """Returns a sink (query plan, not executed) writing quarantined rows to a temporary file,
+    published by write_quarantine.
+
+    Args:
+        quarantine (pl.LazyFrame): Query plan (LazyFrame) of quarantined rows.
+        config (dict): YAML configuration dictionary.
+
+    Returns:
+        pl.LazyFrame: Sink, to be executed with pl.collect_all.
+    """
+
+    return quarantine.sink_parquet(quarantine_path(config), mkdir=True, lazy=True)
+
+
+def write_quarantine(config: dict[str, Any]) -> None:
+    """Publishes quarantined rows written by sink_quarantine as a file of the run
+    (e.g. 'dropped-rows-20250823005609.parquet') in the quarantine directory, so files
+    of previous runs are kept for review, and logs the number of rows per drop reason.
+
+    Args:
+        config (dict): YAML configuration dictionary.
+    """
+
+    tmp_path = quarantine_path(config)
+
+    # Dropped rows are few, the summary reads them back
+    quarantine = pl.read_parquet(tmp_path, columns=["drop_reason", "weaponkind"])
+
+    if quarantine.height == 0:
+        os.remove(tmp_path)
+        logger.info("No rows quarantined.")
+        return None
+
+    counts = dict(quarantine.group_by("drop_reason").len().rows())
+    for reason, description in DROP_REASONS.items():
+        if counts.get(reason):
+            logger.info(f"Dropped {counts[reason]:,} rows, {description} ({reason}).")
+    if counts.get(None):
+        logger.warning(f"Kept {counts[None]:,} rows with an unparsable date, add their formats to date_formats in config.yaml.")
+
+    new_weapons = (
+        quarantine
+        .filter(pl.col("drop_reason") == "unknown_weapon")
+        .group_by("weaponkind")
+        .len()
+    )
+    if new_weapons.height > 0:
+        logger.warning(
+            f"""Update weapon_mappings in config.yaml with new weapons!
+{new_weapons.get_column("len").sum()} records of {new_weapons.height} new weapons present: {str(set(new_weapons.get_column("weaponkind").to_list()))[1:-1]}."""
+        )
+    else:
+        logger.info("No records with new weapons found.")
+
+    path = quarantine_path(config, run=f"{datetime.now():%Y%m%d%H%M%S}")
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote {quarantine.height:,} quarantined rows to '{path}'.")
+
+    return None
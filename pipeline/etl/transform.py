@@ -6,6 +6,8 @@ import polars as pl
 
 from config import enable_debug_logs
 
+from .quarantine import tag_dropped
+
 logger = logging.getLogger(__name__)
 DEBUG_MODE = logger.isEnabledFor(logging.DEBUG)
 
@@ -74,11 +76,8 @@ def transform_column_organunit(df: pl.LazyFrame, config: dict[str, Any]) -> pl.L
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE, name="Added new region column.")
 
-    # Drop redundant column
-    df = df.drop("organunit")
-
-    # Removing ambiguous records from the DataFrame
-    df = df.filter(~pl.col("region").is_null())
+    # Tag ambiguous records to drop (unit name is kept for quarantine)
+    df = tag_dropped(df, pl.col("region").is_null(), "unknown_region")
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
@@ -86,7 +85,7 @@ def transform_column_organunit(df: pl.LazyFrame, config: dict[str, Any]) -> pl.L
     return df
 
 
-def transform_column_weaponkind(df: pl.LazyFrame, config: dict[str, Any]) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+def transform_column_weaponkind(df: pl.LazyFrame, config: dict[str, Any]) -> pl.LazyFrame:
     """Creates a new column with broader weapon categories. Creates column 'weaponcategory'.
 
     Args:
@@ -94,108 +93,41 @@ def transform_column_weaponkind(df: pl.LazyFrame, config: dict[str, Any]) -> tup
         config (dict): YAML configuration dictionary.
 
     Returns:
-        tuple[pl.LazyFrame, pl.LazyFrame]: Lazy query plans for data with original weapon names and additional weapon mappings.
+        pl.LazyFrame: Query plan (LazyFrame).
     """
     
-    # Temporary Series objects below will be later used to populate a DataFrame
-    bladed = pl.LazyFrame(
-        data=config["weapon_mappings"]["bladed"],
-        schema={"Bladed":pl.String}
-    )
-    handguns = pl.LazyFrame(
-        data=config["weapon_mappings"]["handguns"],
-        schema={"Handguns":pl.String}
-    )
-    lfirearms = pl.LazyFrame(
-        data=config["weapon_mappings"]["lfirearms"],
-        schema={"Light firearms":pl.String}
-    )
-    hfirearms = pl.LazyFrame(
-        data=config["weapon_mappings"]["hfirearms"],
-        schema={"Heavy firearms":pl.String}
-    )
-    pneumaticflob = pl.LazyFrame(
-        data=config["weapon_mappings"]["pneumaticflob"],
-        schema={"Pneumatic&Flobert":pl.String}
-    )
-    artillery = pl.LazyFrame(
-        data=config["weapon_mappings"]["artillery"],
-        schema={"Artillery":pl.String}
-    )
-    explosives = pl.LazyFrame(
-        data=config["weapon_mappings"]["explosives"],
-        schema={"Explosives":pl.String}
-    )
-    other = pl.LazyFrame(
-        data=config["weapon_mappings"]["other"],
-        schema={"Other":pl.String}
+    # Weapon name >>> weapon category lookup, built once when config.yaml is compiled
+    weapon_lookup: dict[str, str] = config["weapon_lookup"]
+
+    wps_df = pl.LazyFrame(
+        data={
+            "weaponcategory": list(weapon_lookup.values()),
+            "weaponkind": list(weapon_lookup.keys()),
+        },
+        schema={"weaponcategory":pl.String, "weaponkind":pl.String}
     )
 
-    # Concatenate (hstack) LazyFrames into a single one
-    wps_df = pl.concat(
-        [bladed, handguns, lfirearms, hfirearms, pneumaticflob, artillery, explosives, other],
-        how="horizontal"
-    )
-    
-    # Unpivot LazyFrame (columns to rows)
-    wps_df = wps_df.unpivot(variable_name="weaponcategory", value_name="weaponkind").drop_nulls()
-
     # Join weapon names with matching weapon categories 
     df = df.join(other=wps_df, on="weaponkind", how="left")
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
 
-    return df, wps_df 
+    return df
 
 
-def check_new_weapons(df: pl.LazyFrame, wps_df: pl.LazyFrame) -> pl.LazyFrame:
-    """Checks for new weapons, drops nulls redundant 'weaponkind' column,
-    and removes rows with missing weapon categories.
+def check_new_weapons(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Tags rows with weapons missing from weapon_mappings (no weapon category) to drop.
+    New weapons are reported when quarantine is written.
 
     Args:
         df (pl.LazyFrame): Query plan (LazyFrame) with original weapon names.
-        wps_df (pl.LazyFrame): Query plan (LazyFrame) with additional weapon mappings.
 
     Returns:
         pl.LazyFrame: Query plan (LazyFrame).
     """
 
-    # Check wether any new weapons are present in a dataset
-    has_null = df.select(pl.col("weaponcategory").is_null().any()).collect().item()
-    if has_null:
-
-        new_weapons = set()
-        count = 0
-
-        # Store weaponkind values that don't have respective weaponcategory value
-        wep_list = (
-            df
-            .filter(pl.col("weaponcategory").is_null())
-            .select("weaponkind")
-            .collect()
-            .get_column("weaponkind")
-            .to_list()
-        )
-
-        # Iterate over list of (new) weapons to check if those values are present in current wps_df dataset
-        for w in wep_list: 
-            if w not in wps_df.collect().get_column("weaponkind"):
-                new_weapons.add(w)
-                count += 1
-
-        logger.warning(
-            f"""Update weapon_mappings in config.yaml with new weapons!
-{count} records of {len(new_weapons)} new weapons present: {str(new_weapons)[1:-1]}."""
-        )
-    else:
-        logger.info("No records with new weapons found.")
-
-    # Drop redundant column
-    df = df.drop("weaponkind")
-
-    # Drop all rows that contain null in 'weaponcategory'
-    df = df.drop_nulls(subset="weaponcategory")
+    df = tag_dropped(df, pl.col("weaponcategory").is_null(), "unknown_weapon")
 
     # Generate info logs if logger level is DEBUG
     enable_debug_logs(df, is_debug=DEBUG_MODE)
@@ -204,8 +136,8 @@ def check_new_weapons(df: pl.LazyFrame, wps_df: pl.LazyFrame) -> pl.LazyFrame:
     
 
 def transform_column_dates(df: pl.LazyFrame) -> pl.LazyFrame:
-    """Creates a new date column using/replacing 'theftdate' and 'insertdate'.
-    Removes and substitutes records preserving historical accuracy during post-independence period.
+    """Creates a new date column using 'theftdate' and 'insertdate'.
+    Tags and substitutes records preserving historical accuracy during post-independence period.
 
     Args:
         df (pl.LazyFrame): Post-extraction query plan (LazyFrame).
@@ -215,20 +147,15 @@ def transform_column_dates(df: pl.LazyFrame) -> pl.LazyFrame:
     """
 
     # Substitute missing values in theftdate with those from the insertdate column
+    # (source date columns are kept for quarantine)
     df = df.with_columns(pl.coalesce(["theftdate","insertdate"]).alias("date"))
-    # Drop redundant date columns
-    df = df.drop("insertdate","theftdate")
 
     def drop_old_rec(df: pl.LazyFrame) -> pl.LazyFrame:
         """Excludes Ukrainian SSR records from DataFrame."""
         # Store date of UKR independence
         dt_independence = datetime(year=1991, month=8, day=24)
-        # Filter out pre-independence records
-        df = (
-            df
-            .filter(pl.col("date") >= dt_independence)
-            .sort(by="date", descending=False)
-        )
+        # Tag pre-independence records to drop (sorted once, when loading)
+        df = tag_dropped(df, pl.col("date") < dt_independence, "pre_independence")
         return df
     
     def combine_crimean_upd(df: pl.LazyFrame) -> pl.LazyFrame:
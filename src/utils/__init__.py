@@ -1,2 +1,26 @@
-from .aggregations import current_total_records
-from .tools import modification_date
+import importlib
+
+# Helper modules (and pandas/pyarrow/duckdb with them) are imported on first access
+_FUNCTIONS = {
+    "load_startup_data": ".loader",
+    "get_data": ".loader",
+    "current_total_records": ".aggregations",
+    "modification_date": ".tools",
+    "fragment": ".tools",
+    "run_query": ".query",
+    "slice_totals": ".query",
+    "insight_int": ".insights",
+    "insight_float": ".insights",
+    "insight_str": ".insights",
+}
+
+__all__ = list(_FUNCTIONS)
+
+
+def __getattr__(name):
+    if name not in _FUNCTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    function = getattr(importlib.import_module(_FUNCTIONS[name], __name__), name)
+    # Cache on the package, so the lookup happens once
+    globals()[name] = function
+    return function
@@ -1,4 +1,4 @@
-import pandas as pd
+from .loader import get_data
 
     
 def current_total_records(info: str) -> tuple:
@@ -15,7 +15,7 @@ def current_total_records(info: str) -> tuple:
     clr_outlier = "#e54848"
     clr_font = "#dedede"
     
-    date_report_total = pd.read_parquet("data/marts/date-report-total.parquet").astype({"report":"str"})
+    date_report_total = get_data("date-report-total").astype({"report":"str"})
     
     if info == "total":
         
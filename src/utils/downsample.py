@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def minmax_downsample(df, x, y, max_points):
+    """Reduces a time series to at most ~max_points rows for plotting by keeping
+    the minimum and maximum of each equal-width x bucket, so peaks and dips stay visible.
+
+    Series that already fit max_points are returned unchanged (full resolution).
+
+    Args:
+        df (pd.DataFrame): Data sorted by x.
+        x (str): Datetime column used for bucketing.
+        y (str): Numeric column whose min/max are kept.
+        max_points (int): Target number of points (two per bucket).
+
+    Returns:
+        pd.DataFrame: Downsampled rows in the original order.
+    """
+    df = df[df[y].notna()]
+    if len(df) <= max_points:
+        return df
+
+    n_buckets = max(max_points // 2, 1)
+    xs = df[x].to_numpy().astype("datetime64[ns]").astype("int64")
+    span = xs.max() - xs.min() + 1
+    # Float division, nanosecond offsets (~1e18) times the number of buckets overflow int64
+    buckets = np.floor((xs - xs.min()) / span * n_buckets).astype(np.int64)
+
+    values = df[y].groupby(buckets)
+    rows = np.union1d(values.idxmin().to_numpy(), values.idxmax().to_numpy())
+
+    return df.loc[df.index.isin(rows)]
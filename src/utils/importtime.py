@@ -0,0 +1,113 @@
+"""Import-time report of the dashboard's first render.
+
+Runs `python -X importtime` in a fresh interpreter, importing every module the
+first render of app.py pulls in (both packages and the chart/helper modules their
+lazy functions resolve to). Streamlit itself is imported beforehand, as `streamlit run`
+does before app.py runs, so only the dashboard's own share is measured. Prints the
+slowest imports and exits with status 1 if the total exceeds the budget:
+
+    python -m src.utils.importtime
+    python -m src.utils.importtime --budget 800 --top 15
+"""
+import os
+import sys
+import argparse
+import importlib
+import subprocess
+
+# Directory of app.py, modules are imported from there
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Packages imported by app.py, their lazy functions resolve to the modules drawn by the first render
+PACKAGES = ("src.utils", "src.visualizations")
+
+# Imported by `streamlit run` before app.py, not part of the dashboard's import time
+PRELOADED = ("streamlit",)
+
+# Cumulative import time budget of the first render (milliseconds)
+BUDGET_MS = 1000
+
+
+def first_render_modules():
+    """Lists modules imported by the first render of app.py, in import order.
+
+    Returns:
+        list[str]: Dotted module names, e.g. 'src.visualizations.barchart'.
+    """
+    modules = list(PACKAGES)
+    for package in PACKAGES:
+        for module in importlib.import_module(package)._FUNCTIONS.values():
+            name = f"{package}{module}"
+            if name not in modules:
+                modules.append(name)
+
+    return modules
+
+
+def measure_imports(modules, preloaded=PRELOADED):
+    """Imports modules in a fresh interpreter with -X importtime, after the preloaded ones.
+
+    Args:
+        modules (list[str]): Dotted module names.
+        preloaded (tuple[str]): Modules imported first and excluded from the measurement.
+
+    Returns:
+        list[tuple[str, int, float, float]]: Imported package, nesting depth (0 for imports of
+            the measured statements), self and cumulative time (ms), in import order.
+    """
+    code = "; ".join(f"import {module}" for module in (*preloaded, *modules))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+
+    # Lines look like: 'import time:       412 |        889 |   src.utils', nesting adds two spaces
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    # Interpreter startup and preloaded modules come first, keep what follows the last preloaded one
+    start = max(
+        (i for i, (name, depth, _, _) in enumerate(imports) if depth == 0 and name in preloaded),
+        default=-1,
+    )
+
+    return imports[start + 1:]
+
+
+def first_render_import_ms(imports):
+    "Sums cumulative time of top-level imports, i.e. the total time of the measured statements."
+    return sum(cumulative for _, depth, _, cumulative in imports if depth == 0)
+
+
+def report(budget_ms, top):
+    """Prints slowest imports of the first render and returns whether it fits the budget."""
+    imports = measure_imports(first_render_modules())
+    total_ms = first_render_import_ms(imports)
+
+    status = "OK" if total_ms <= budget_ms else "OVER BUDGET"
+    print(f"First render imports: {total_ms:.1f} ms (budget {budget_ms} ms) {status}")
+    for name, _, self_ms, cumulative_ms in sorted(imports, key=lambda i: i[3], reverse=True)[:top]:
+        print(f"    {cumulative_ms:>9.1f} ms  {self_ms:>9.1f} ms self  {name}")
+
+    return total_ms <= budget_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time of the dashboard's first render.")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="cumulative import time budget (ms)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to show")
+    args = parser.parse_args()
+
+    sys.exit(0 if report(args.budget, args.top) else 1)
+
+
+if __name__ == "__main__":
+    main()
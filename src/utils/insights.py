@@ -0,0 +1,76 @@
+import pandas as pd
+import streamlit as st
+
+from .loader import get_data
+
+
+@st.cache_resource(show_spinner=False)
+def load_insights():
+    """Converts the insights mart (key, number, text) into a dictionary, once per process.
+
+    Returns:
+        dict[str, float | str]: Number or text value of every key.
+    """
+    df = get_data("insights")
+    return {
+        key: text if pd.notna(text) else number
+        for key, number, text in zip(df["key"], df["number"], df["text"])
+    }
+
+
+def _insight(key, kind):
+    insights = load_insights()
+    if key not in insights:
+        raise KeyError(f"Insight '{key}' is missing, add it to data/models/insights.sql.")
+    value = insights[key]
+    if not isinstance(value, kind):
+        raise TypeError(f"Insight '{key}' is {type(value).__name__}, not {kind.__name__}.")
+    return value
+
+
+def insight_int(key):
+    """Returns a count from the insights mart, e.g. insight_int('records_2014').
+
+    Args:
+        key (str): Key of data/models/insights.sql.
+
+    Raises:
+        KeyError: If the key is missing from the insights mart.
+        TypeError: If the key holds text.
+
+    Returns:
+        int: Value of the key.
+    """
+    return int(_insight(key, float))
+
+
+def insight_float(key):
+    """Returns a number (e.g. a share in the 0-1 range) from the insights mart.
+
+    Args:
+        key (str): Key of data/models/insights.sql.
+
+    Raises:
+        KeyError: If the key is missing from the insights mart.
+        TypeError: If the key holds text.
+
+    Returns:
+        float: Value of the key.
+    """
+    return _insight(key, float)
+
+
+def insight_str(key):
+    """Returns a name (e.g. of a region) from the insights mart.
+
+    Args:
+        key (str): Key of data/models/insights.sql.
+
+    Raises:
+        KeyError: If the key is missing from the insights mart.
+        TypeError: If the key holds a number.
+
+    Returns:
+        str: Value of the key.
+    """
+    return _insight(key, str)
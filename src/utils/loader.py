@@ -0,0 +1,100 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Data required to render the page (name >>> file path)
+STARTUP_DATA = {
+    "region-total": "data/marts/region-total.parquet",
+    "region-year-total": "data/marts/region-year-total.parquet",
+    "region-weaponcategory-total": "data/marts/region-weaponcategory-total.parquet",
+    "weaponcategory-total": "data/marts/weaponcategory-total.parquet",
+    "date-report-total": "data/marts/date-report-total.parquet",
+    "month-total": "data/marts/month-total.parquet",
+    "month-trends": "data/marts/month-trends.parquet",
+    "anomalies": "data/marts/anomalies.parquet",
+    "insights": "data/marts/insights.parquet",
+    "year-report-total": "data/marts/year-report-total.parquet",
+    "region-year-per-capita": "data/marts/region-year-per-capita.parquet",
+}
+
+# Rows of large marts the page uses, other rows are not loaded (name >>> filter expression)
+STARTUP_FILTERS = {
+    "anomalies": pc.field("is_anomaly"),
+    "month-trends": pc.field("dimension") == "report",
+}
+
+# Time budget for loading all startup data on a cold start (seconds), checked by tests/test_loader.py
+STARTUP_TARGET = 0.5
+
+
+def read_file(path, rows=None):
+    """Reads parquet mart into pandas DataFrame.
+    PyArrow releases the GIL while reading and decoding, so files can be read in parallel threads.
+
+    Marts are read from their Arrow IPC copy (.arrow) if the pipeline wrote one that is not
+    older than the parquet file. The copy is memory-mapped: uncompressed columns are not decoded
+    and their pages are shared by all processes through the OS page cache. Copies are not
+    committed, so a fresh deploy reads parquet.
+
+    Args:
+        path (str): Parquet file path.
+        rows (pyarrow.compute.Expression): Filter of rows to read (optional), e.g. pc.field("is_anomaly").
+
+    Returns:
+        pd.DataFrame: Mart data.
+    """
+    ipc_path = os.path.splitext(path)[0] + ".arrow"
+    if os.path.exists(ipc_path) and os.path.getmtime(ipc_path) >= os.path.getmtime(path):
+        table = feather.read_table(ipc_path, memory_map=True)
+        if rows is not None:
+            table = table.filter(rows)
+    else:
+        table = pq.read_table(path, filters=rows)
+
+    return table.to_pandas(split_blocks=True)
+
+
+@st.cache_resource(show_spinner=False)
+def load_startup_data():
+    """Reads all startup data concurrently, once per process.
+
+    Returned DataFrames are shared by all sessions and must not be modified in place.
+
+    Returns:
+        dict[str, pd.DataFrame]: DataFrames keyed by names from STARTUP_DATA.
+    """
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(STARTUP_DATA)) as pool:
+        frames = dict(zip(STARTUP_DATA, pool.map(
+            read_file, STARTUP_DATA.values(), [STARTUP_FILTERS.get(name) for name in STARTUP_DATA]
+        )))
+
+    elapsed = time.perf_counter() - start
+    if elapsed > STARTUP_TARGET:
+        logger.warning(f"Loaded {len(frames)} startup files in {elapsed:.3f}s, above {STARTUP_TARGET}s target.")
+    else:
+        logger.info(f"Loaded {len(frames)} startup files in {elapsed:.3f}s.")
+
+    return frames
+
+
+def get_data(name):
+    """Returns one of the startup DataFrames (read-only, use .copy() before modifying).
+    Marts listed in STARTUP_FILTERS only hold the filtered rows.
+
+    Args:
+        name (str): Key of STARTUP_DATA, e.g. 'region-total'.
+
+    Returns:
+        pd.DataFrame: Shared DataFrame.
+    """
+    return load_startup_data()[name]
@@ -0,0 +1,122 @@
+import os
+import glob
+
+import duckdb
+import streamlit as st
+
+# Read-only database built by pipeline/etl/materialize.py (not committed)
+DATABASE_PATH = "data/warehouse/ua-mia-weapons.duckdb"
+# Committed files the database is built from, queried directly when the database file is missing
+PROCESSED_GLOB = "data/processed/ua-mia-weapons/**/*.parquet"
+MARTS_DIR = "data/marts"
+
+# Dimensions processed data can be sliced by (name >>> SQL expression)
+DIMENSIONS = {
+    "region": "region",
+    "report": "report",
+    "weaponcategory": "weaponcategory",
+    "year": "year",
+    "month": "DATE_TRUNC('month', date)",
+    "week": "DATE_TRUNC('week', date)",
+    "day": "CAST(date AS DATE)",
+}
+
+
+def database_version():
+    """Returns modification time of the database file, None if there is no database file."""
+    try:
+        return os.stat(DATABASE_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_connection(version):
+    """Returns read-only connection to the query database, shared by all sessions.
+
+    A fresh deploy has no database file (it is not committed). The connection is then
+    in memory, with 'weapons' view over the processed dataset and a view per mart,
+    named as in the database file (e.g. 'region_total').
+
+    Args:
+        version (int): Database version (database_version()), a rebuilt database gets a new connection.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Connection to query through cursors.
+    """
+    if version is not None:
+        return duckdb.connect(DATABASE_PATH, read_only=True)
+
+    connection = duckdb.connect()
+    connection.execute(f"""
+        CREATE VIEW weapons AS
+        SELECT * FROM read_parquet('{PROCESSED_GLOB}', hive_partitioning=true)
+    """)
+    for path in sorted(glob.glob(os.path.join(MARTS_DIR, "*.parquet"))):
+        name = os.path.basename(path).replace(".parquet", "").replace("-", "_")
+        connection.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{path}')")
+    return connection
+
+
+@st.cache_data(show_spinner=False)
+def cached_query(query, params, version):
+    # Connections are not thread-safe, each script thread uses its own cursor
+    cursor = get_connection(version).cursor()
+    try:
+        return cursor.execute(query, list(params)).df()
+    finally:
+        cursor.close()
+
+
+def run_query(query, params=()):
+    """Executes parameterized SQL query on the query database.
+    Results are cached per query, parameters and database version.
+
+    Args:
+        query (str): SQL query with '?' placeholders, e.g. "SELECT * FROM region_total WHERE region = ?".
+        params (tuple): Values bound to the placeholders.
+
+    Returns:
+        pd.DataFrame: Query result (shared by sessions, use .copy() before modifying).
+    """
+    return cached_query(query, tuple(params), database_version())
+
+
+def slice_totals(by, region=None, report=None, weaponcategory=None, years=None):
+    """Returns number of records grouped by the requested dimensions,
+    e.g. slice_totals(['region', 'month'], report='Theft', years=(2014, 2022)).
+
+    Year filters apply to the 'year' partition key, so that only the files
+    of the requested years are read when the processed dataset is queried directly.
+
+    Args:
+        by (list[str]): Dimensions (keys of DIMENSIONS) to group by.
+        region (str): Region filter (optional).
+        report (str): Report type filter, 'Loss' or 'Theft' (optional).
+        weaponcategory (str): Weapon category filter (optional).
+        years (tuple[int, int]): Inclusive range of years (optional).
+
+    Returns:
+        pd.DataFrame: Dimension columns and 'total' column, ordered by dimensions.
+    """
+    unknown = set(by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+
+    conditions, params = [], []
+    for column, value in (("region", region), ("report", report), ("weaponcategory", weaponcategory)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    if years is not None:
+        conditions.append("year BETWEEN ? AND ?")
+        params.extend([int(years[0]), int(years[1])])
+
+    columns = [f"{DIMENSIONS[d]} AS {d}" for d in by]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    group = f"GROUP BY {', '.join(str(i) for i in range(1, len(by) + 1))}" if by else ""
+    order = f"ORDER BY {', '.join(str(i) for i in range(1, len(by) + 1))}" if by else ""
+
+    query = f"SELECT {', '.join(columns + ['COUNT(*) AS total'])} FROM weapons {where} {group} {order}"
+
+    return run_query(query, tuple(params))
@@ -1,6 +1,8 @@
 import os
 import time
 
+import streamlit as st
+
 # File modification date
 def modification_date(file, granularity):
     """Returns date when file was last modified at
@@ -28,4 +30,23 @@ def modification_date(file, granularity):
     elif granularity == "date":
         date = f"{year}-{month}-{day}"
         
-    return date
\ No newline at end of file
+    return date
+
+
+# Partial reruns (Streamlit >= 1.37, experimental in 1.33-1.36)
+def fragment(func):
+    """Decorates a function drawing widgets and the elements which depend on them,
+    so that interacting with these widgets reruns only the function instead of the whole app.
+
+    Falls back to full app reruns on Streamlit versions without fragments.
+
+    Args:
+        func (callable): Function drawing widgets and dependent elements.
+
+    Returns:
+        callable: Fragment (or the unchanged function).
+    """
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if decorator is None:
+        return func
+    return decorator(func)
@@ -1,11 +1,27 @@
-from .regions import generate_rank_region_population
-from .regions import generate_region_total_linechart
-from .regions import generate_region_weapons_polarchart
-from .regions import generate_region_report_10y_linechart
-
-from .piechart import generate_reports_piechart
-from .scatterplot import generate_reports_scatterplot
-from .scatterplot import generate_weapons_scatterplot
-from .barchart import generate_events_barchart
-from .table import generate_region_total_table
-from .table import generate_weaponcategory_total_table
\ No newline at end of file
+import importlib
+
+# Chart modules (and plotly/pandas with them) are imported on first access of a function,
+# e.g. `from src import visualizations as viz; viz.generate_events_barchart()`
+_FUNCTIONS = {
+    "generate_rank_region_population": ".regions",
+    "generate_region_total_linechart": ".regions",
+    "generate_region_weapons_polarchart": ".regions",
+    "generate_region_report_10y_linechart": ".regions",
+    "generate_reports_piechart": ".piechart",
+    "generate_reports_scatterplot": ".scatterplot",
+    "generate_weapons_scatterplot": ".scatterplot",
+    "generate_events_barchart": ".barchart",
+    "generate_region_total_table": ".table",
+    "generate_weaponcategory_total_table": ".table",
+}
+
+__all__ = list(_FUNCTIONS)
+
+
+def __getattr__(name):
+    if name not in _FUNCTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    function = getattr(importlib.import_module(_FUNCTIONS[name], __name__), name)
+    # Cache on the package, so the lookup happens once
+    globals()[name] = function
+    return function
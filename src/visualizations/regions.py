@@ -1,13 +1,9 @@
 import streamlit as st
 import os.path, time
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
-
-# Data
-region_total = pd.read_parquet("data/marts/region-total.parquet").astype({"region":"str"})
-region_year_total = pd.read_parquet("data/marts/region-year-total.parquet").astype({"region":"str"})
-population = pd.read_csv("data/raw/ua-population.csv", usecols=["region", "2020", "2021"])
+from .theme import watermark, template_region, font_main, clr_main, clr_font, clr_secondary_font, clr_loss, clr_theft, clr_outlier
+from src.utils import get_data
 
 
 # File modification year
@@ -18,44 +14,24 @@ def modification_date(file):
     return date
 
 
-# Colors
-clr = "#00ccd3"
-biclr = ["#faffff", "#007a81"]
-
-# Colors
-clr_main = '#2dcdd2'
-clr_font = '#dedede'
-clr_secondary_font = '#8d9294'
-
-clr_page_background = '#333333'
-clr_tile_background = '#262626'
-clr_hoverlabel = 'rgba(51, 51, 51, 0.95)'
-clr_transparent = 'rgba(0,0,0,0)'
-
-clr_button_background = '#8d9294' 
-clr_button_text = '#292929'
-
-clr_loss = '#679496'
-clr_theft = '#006C72'
-clr_outlier = '#e54848'
-
-# Font
-font_main = 'Montserrat, sans-serif'
-
-watermark = 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzAzIiBoZWlnaHQ9IjI5MSIgdmlld0JveD0iMCAwIDMwMyAyOTEiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxnIGZpbHRlcj0idXJsKCNmaWx0ZXIwX2RfMV8yMikiPgo8cGF0aCBkPSJNMTA2LjAwMSA3My43OTE4SDE5NC40MjNNMTk0LjQyMyA3My43OTE4VjE1OS45NDFNMTk0LjQyMyA3My43OTE4TDE2Mi4wMDIgMTEwLjE2Nk0xOTQuNDIzIDE1OS45NDFMMjUwIDIxNC4wODlNMTk0LjQyMyAxNTkuOTQxTDE2MS4wMTkgMTk3LjI3Mk03My41NzkzIDExMC4xNjZIMTYyLjAwMk0xNjIuMDAyIDExMC4xNjZWMTk2LjMxNU03Mi41OTY4IDE5Ny4yNzJIMTYxLjAxOU0xNjEuMDE5IDE5Ny4yNzJMMTg3LjkwMSAyNjkuMjMxTTE5NC40MjMgNzMuMzc4OEwyNTAgMTkuMjMwOE01MCAxOS4yMzA4TDEwNS41NzcgNzMuMzc4OCIgc3Ryb2tlPSIjMEZCQkUxIiBzdHJva2Utd2lkdGg9IjIxIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHNoYXBlLXJlbmRlcmluZz0iY3Jpc3BFZGdlcyIvPgo8L2c+CjxwYXRoIGQ9Ik0xNjIuMDAyIDExMC4xNjZMMTk0LjQyMyA3My43OTE4VjE2MC44OThMMTYyLjAwMiAxOTkuMTg2VjExMC4xNjZaIiBmaWxsPSIjMEZCQkUxIi8+CjxkZWZzPgo8ZmlsdGVyIGlkPSJmaWx0ZXIwX2RfMV8yMiIgeD0iMzUuNSIgeT0iOC43MzA3NiIgd2lkdGg9IjIyOSIgaGVpZ2h0PSIyNzkuMDAzIiBmaWx0ZXJVbml0cz0idXNlclNwYWNlT25Vc2UiIGNvbG9yLWludGVycG9sYXRpb24tZmlsdGVycz0ic1JHQiI+CjxmZUZsb29kIGZsb29kLW9wYWNpdHk9IjAiIHJlc3VsdD0iQmFja2dyb3VuZEltYWdlRml4Ii8+CjxmZUNvbG9yTWF0cml4IGluPSJTb3VyY2VBbHBoYSIgdHlwZT0ibWF0cml4IiB2YWx1ZXM9IjAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDEyNyAwIiByZXN1bHQ9ImhhcmRBbHBoYSIvPgo8ZmVPZmZzZXQgZHk9IjQiLz4KPGZlR2F1c3NpYW5CbHVyIHN0ZERldmlhdGlvbj0iMiIvPgo8ZmVDb21wb3NpdGUgaW4yPSJoYXJkQWxwaGEiIG9wZXJhdG9yPSJvdXQiLz4KPGZlQ29sb3JNYXRyaXggdHlwZT0ibWF0cml4IiB2YWx1ZXM9IjAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAuMjUgMCIvPgo8ZmVCbGVuZCBtb2RlPSJub3JtYWwiIGluMj0iQmFja2dyb3VuZEltYWdlRml4IiByZXN1bHQ9ImVmZmVjdDFfZHJvcFNoYWRvd18xXzIyIi8+CjxmZUJsZW5kIG1vZGU9Im5vcm1hbCIgaW49IlNvdXJjZUdyYXBoaWMiIGluMj0iZWZmZWN0MV9kcm9wU2hhZG93XzFfMjIiIHJlc3VsdD0ic2hhcGUiLz4KPC9maWx0ZXI+CjwvZGVmcz4KPC9zdmc+Cg=='
-
-
-# Region, rank, population (1st 'column')
+# Region, rank by records per 100k residents, population (1st 'column')
 def generate_rank_region_population(region):
-    rank = region_total[region_total['region'] == region].index[0] + 1
-    pop = population.loc[population['region'] == region, '2021'].iloc[0]
-    year = population.columns.tolist()[-1]
+    per_capita = get_data("region-year-per-capita")
+
+    latest = per_capita[per_capita['region'] == region].iloc[-1]
+    rank = int(latest['rate_rank'])
+    pop = int(latest['population'])
+    year = int(latest['population_year'])
+    rate = latest['median_total_per_100k']
+    first_year = per_capita['date'].min().year
+    last_year = int(latest['rank_last_year'])
     return st.markdown(
         f"""
         <span style='font-size:30px; font-family:{font_main}; font-weight:700; line-height: 2rem;'>
             <span style='color:{clr_secondary_font}'>#{rank}</span> 
             <span style='color:{clr_font}'>{region.title()}</b></span><br>
-            <span title='Population in {2021}' style='font-size:16px; color:{clr_secondary_font}; margin-bottom: 1rem;'>&#128578 {int(pop):,} <sup>?</sup></span>
+            <span title='Population in {year}' style='font-size:16px; color:{clr_secondary_font}; margin-bottom: 1rem;'>&#128578 {pop:,} <sup>?</sup></span><br>
+            <span title='Median yearly records per 100k residents in {first_year}-{last_year}, the current (incomplete) year is not ranked' style='font-size:16px; color:{clr_secondary_font}; margin-bottom: 1rem;'>{rate:,.1f} per 100k <sup>?</sup></span>
         </span>""",
         unsafe_allow_html=True,
     )
@@ -63,6 +39,9 @@ def generate_rank_region_population(region):
 
 # Yearly totals plotly chart
 def generate_region_total_linechart(region):
+    region_total = get_data("region-total")
+    region_year_total = get_data("region-year-total")
+
     df = region_year_total[(region_year_total['region'] == str(region))]
     
     total = int(region_total[(region_total['region'] == region)]['total'])
@@ -89,12 +68,22 @@ def generate_region_total_linechart(region):
         )
     )
     
-    # Max total
+    # Anomalous years of the region (anomalies mart)
+    anomalies = get_data('anomalies')
+    anomaly_years = anomalies.loc[
+        (anomalies['grain'] == 'year')
+        & (anomalies['region'] == str(region))
+        & (anomalies['report'] == 'All')
+        & anomalies['is_anomaly'],
+        'date'
+        ].dt.year
+    outliers = df[df['date'].dt.year.isin(anomaly_years)]
+
     fig.add_trace(
         go.Scatter(
-            x=df[df['total']==df['total'].max()]['date'].dt.year,
-            y=np.array(df['total'].max()),
-            name='max',
+            x=outliers['date'].dt.year,
+            y=outliers['total'],
+            name='outlier',
             marker={
                 'color':clr_outlier,
                 'size':7
@@ -121,43 +110,25 @@ def generate_region_total_linechart(region):
     
     # Settings
     fig.update_layout(
+        template=template_region,
         height=160,
         width=420,
-        plot_bgcolor=clr_tile_background,
-        paper_bgcolor=clr_transparent,
-        font_size=14,
-        font_color=clr_font,
         margin={
             'l':5,
             'r':50, 
             't':30, 
             'b':5
             },
-        showlegend=False,
         xaxis={
             'title':None,
             'showticklabels':True,
-            'gridcolor':clr_page_background,
             'dtick':7,
             'tickformat':'%Y',
-            'tickfont_size':12,
-            'tickfont_family':font_main,
-            'tickfont_color':clr_secondary_font,
         },
         yaxis={
             'title':None, 
             'showticklabels':True, 
-            'gridcolor':clr_page_background, 
-            'zeroline':False,
-            'tickfont_size':12,
-            'tickfont_family':font_main,
-            'tickfont_color':clr_secondary_font,
         },
-        hovermode='x unified',
-        hoverlabel={
-            'bgcolor':'rgba(72,72,72,0.8)',
-            'font_color':clr_font
-            },  
     )
     
     # Max total
@@ -169,10 +140,7 @@ def generate_region_total_linechart(region):
         xanchor='left',
         showarrow=False,
         align='left',
-        text=f"Max:<br><span style='color: {clr_outlier}'>{max:,}</span><br>({yr_max})",
-        font_family=font_main,
-        font_size=13,
-        font_color=clr_secondary_font
+        text=f"Max:<br><span style='color: {clr_font}'>{max:,}</span><br>({yr_max})",
     )
     
     # Current number of records
@@ -184,9 +152,6 @@ def generate_region_total_linechart(region):
         showarrow=False,
         align='left',
         text=f"<span style='color: {clr_main}'>{int(df.tail(1)['total']):,}</span>",
-        font_family=font_main,
-        font_size=13,
-        font_color=clr_secondary_font
     )
     
     # Total records (title)
@@ -221,7 +186,7 @@ def generate_region_total_linechart(region):
 
 # Polar chart of weapon categories
 def generate_region_weapons_polarchart(region):
-    df = pd.read_parquet("data/marts/region-weaponcategory-total.parquet").astype({"region":"str","weaponcategory":"str"})
+    df = get_data("region-weaponcategory-total").astype({"region":"str","weaponcategory":"str"})
     
     df['rank'] = df.groupby('region')['total'].rank(method='dense', ascending=True).astype('int8')
     
@@ -253,8 +218,7 @@ def generate_region_weapons_polarchart(region):
         ))
 
     fig.update_layout(
-        paper_bgcolor=clr_transparent,
-        plot_bgcolor=clr_tile_background,
+        template=template_region,
         height=160,
         width=350,
         margin={
@@ -264,25 +228,13 @@ def generate_region_weapons_polarchart(region):
             'b':25
             },
         polar={
-            'bgcolor':clr_tile_background,
-            'angularaxis':{
-                'gridcolor':clr_page_background,
-                'showline':False,
-                'linecolor':clr_page_background,
-            },
             'radialaxis':{
                 'visible':True,
-                'gridcolor':clr_page_background,
                 'showticklabels':False,
-                'showline':False,
                 'layer':'below traces',
                 'range': ranks_range
             }
         },
-        font_family=font_main,
-        font_color=clr_secondary_font,
-        font_size=11,
-        showlegend=False,
         dragmode=False
     )
 
@@ -308,6 +260,7 @@ def generate_region_weapons_polarchart(region):
 
 # Last 10 years trend of Theft and Loss cases in a region
 def generate_region_report_10y_linechart(region):
+    region_year_total = get_data("region-year-total")
     current_yr = int(modification_date('data/marts/region-total.parquet'))
     
     df = region_year_total[
@@ -368,52 +321,32 @@ def generate_region_report_10y_linechart(region):
         showarrow=False,
         align='left',
         text=f"<span style='font-size=10; color:{clr_secondary_font}'>Total:</span><br><span style='font-size=8; color:{clr_loss}'>&#x2022; Lost: {loss:,}</span><br><span style='font-size=8; color:{clr_theft}'>&#x2022; Stolen: {theft:,}</span>",
-        font_family=font_main,
         font_size=12,
-        font_color=clr_secondary_font
     )
 
     # Settings
     fig.update_layout(
+        template=template_region,
         height=160,
         width=400,
-        plot_bgcolor=clr_tile_background,
-        paper_bgcolor=clr_transparent,
-        font_size=14,
-        font_color=clr_font,
         margin={
             'l':5,
             'r':110,
             't':30,
             'b':5
             },
-        showlegend=False,
         xaxis={
             'title':None,
             'showticklabels':True,
-            'gridcolor':clr_page_background,
             # tickmode="array",
             # tickvals=list(theft_tr["date"].dt.year)[::3],
             'dtick':2,
             'tickformat':"%Y",
-            'tickfont_size':12,
-            'tickfont_family':font_main,
-            'tickfont_color':clr_secondary_font,
         },
         yaxis={
             'title':None,
             'showticklabels':True,
-            'gridcolor':clr_page_background,
-            'zeroline':False,
-            'tickfont_size':12,
-            'tickfont_family':font_main,
-            'tickfont_color':clr_secondary_font,
         },
-        hovermode='x unified',
-        hoverlabel={
-            'bgcolor':'rgba(72,72,72,0.8)',
-            'font_color':clr_font
-            },
     )
     
     fig.update_layout(
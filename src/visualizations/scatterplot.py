@@ -3,31 +3,50 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+from .theme import (
+    watermark,
+    clr_secondary_font,
+    clr_tile_background,
+    clr_transparent,
+    clr_button_text,
+    clr_loss,
+    clr_theft,
+    clr_outlier,
+)
 from src.utils import modification_date 
+from src.utils import get_data
+from src.utils.downsample import minmax_downsample
 
-# Colors
-clr_main = '#2dcdd2'
-clr_font = '#dedede'
-clr_secondary_font = '#8d9294'
+# Max points per daily series sent to the browser (about two per horizontal pixel)
+max_daily_points = 2000
 
-clr_page_background = '#333333'
-clr_tile_background = '#292929'
-clr_hoverlabel = 'rgba(51, 51, 51, 0.95)'
-clr_transparent = 'rgba(0,0,0,0)'
+# Robust z-score above which a period is an anomaly (data/models/anomalies.sql)
+anomaly_threshold = 3.5
 
-clr_button_background = '#8d9294' 
-clr_button_text = '#292929'
 
-clr_loss = '#679496'
-clr_theft = '#006C72'
-clr_outlier = '#e54848'
+def anomaly_flags(grouped, grain, offset):
+    """Flags rows of grouped Loss and Theft totals which are anomalies of the whole country.
 
-# Font
-font_main = 'Montserrat, sans-serif'
-
-watermark = 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzAzIiBoZWlnaHQ9IjI5MSIgdmlld0JveD0iMCAwIDMwMyAyOTEiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxnIGZpbHRlcj0idXJsKCNmaWx0ZXIwX2RfMV8yMikiPgo8cGF0aCBkPSJNMTA2LjAwMSA3My43OTE4SDE5NC40MjNNMTk0LjQyMyA3My43OTE4VjE1OS45NDFNMTk0LjQyMyA3My43OTE4TDE2Mi4wMDIgMTEwLjE2Nk0xOTQuNDIzIDE1OS45NDFMMjUwIDIxNC4wODlNMTk0LjQyMyAxNTkuOTQxTDE2MS4wMTkgMTk3LjI3Mk03My41NzkzIDExMC4xNjZIMTYyLjAwMk0xNjIuMDAyIDExMC4xNjZWMTk2LjMxNU03Mi41OTY4IDE5Ny4yNzJIMTYxLjAxOU0xNjEuMDE5IDE5Ny4yNzJMMTg3LjkwMSAyNjkuMjMxTTE5NC40MjMgNzMuMzc4OEwyNTAgMTkuMjMwOE01MCAxOS4yMzA4TDEwNS41NzcgNzMuMzc4OCIgc3Ryb2tlPSIjMEZCQkUxIiBzdHJva2Utd2lkdGg9IjIxIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHNoYXBlLXJlbmRlcmluZz0iY3Jpc3BFZGdlcyIvPgo8L2c+CjxwYXRoIGQ9Ik0xNjIuMDAyIDExMC4xNjZMMTk0LjQyMyA3My43OTE4VjE2MC44OThMMTYyLjAwMiAxOTkuMTg2VjExMC4xNjZaIiBmaWxsPSIjMEZCQkUxIi8+CjxkZWZzPgo8ZmlsdGVyIGlkPSJmaWx0ZXIwX2RfMV8yMiIgeD0iMzUuNSIgeT0iOC43MzA3NiIgd2lkdGg9IjIyOSIgaGVpZ2h0PSIyNzkuMDAzIiBmaWx0ZXJVbml0cz0idXNlclNwYWNlT25Vc2UiIGNvbG9yLWludGVycG9sYXRpb24tZmlsdGVycz0ic1JHQiI+CjxmZUZsb29kIGZsb29kLW9wYWNpdHk9IjAiIHJlc3VsdD0iQmFja2dyb3VuZEltYWdlRml4Ii8+CjxmZUNvbG9yTWF0cml4IGluPSJTb3VyY2VBbHBoYSIgdHlwZT0ibWF0cml4IiB2YWx1ZXM9IjAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDEyNyAwIiByZXN1bHQ9ImhhcmRBbHBoYSIvPgo8ZmVPZmZzZXQgZHk9IjQiLz4KPGZlR2F1c3NpYW5CbHVyIHN0ZERldmlhdGlvbj0iMiIvPgo8ZmVDb21wb3NpdGUgaW4yPSJoYXJkQWxwaGEiIG9wZXJhdG9yPSJvdXQiLz4KPGZlQ29sb3JNYXRyaXggdHlwZT0ibWF0cml4IiB2YWx1ZXM9IjAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAgMCAwIDAuMjUgMCIvPgo8ZmVCbGVuZCBtb2RlPSJub3JtYWwiIGluMj0iQmFja2dyb3VuZEltYWdlRml4IiByZXN1bHQ9ImVmZmVjdDFfZHJvcFNoYWRvd18xXzIyIi8+CjxmZUJsZW5kIG1vZGU9Im5vcm1hbCIgaW49IlNvdXJjZUdyYXBoaWMiIGluMj0iZWZmZWN0MV9kcm9wU2hhZG93XzFfMjIiIHJlc3VsdD0ic2hhcGUiLz4KPC9maWx0ZXI+CjwvZGVmcz4KPC9zdmc+Cg=='
+    Args:
+        grouped (pd.DataFrame): Totals with 'date' and 'report' columns.
+        grain (str): Grain of the anomalies mart ('day', 'week', 'month' or 'year').
+        offset (pd.DateOffset): Moves period starts of the mart to the 'date' labels of grouped totals.
 
-def generate_reports_scatterplot(granularity):
+    Returns:
+        np.ndarray: Boolean flags aligned with grouped rows.
+    """
+    anomalies = get_data('anomalies')
+    anomalies = anomalies[
+        (anomalies['grain'] == grain)
+        & (anomalies['region'] == 'All')
+        & (anomalies['report'] != 'All')
+        & anomalies['is_anomaly']
+        ]
+    keys = pd.MultiIndex.from_arrays([anomalies['date'] + offset, anomalies['report']])
+    return pd.MultiIndex.from_frame(grouped[['date','report']]).isin(keys)
+
+
+def generate_reports_scatterplot(granularity, years=None):
     """Generates st.plotly_chart() scatterplot with total numbers of theft and loss records 
     throughout the 1991-[current year] period using the specified time granularity.
     
@@ -37,13 +56,16 @@ def generate_reports_scatterplot(granularity):
             - 'weekly' >>> "Weekly Loss and Theft Totals (1991-[current year])"
             - 'monthly' >>> "Monthly Loss and Theft Totals (1991-[current year])" 
             - 'yearly' >>> "Yearly Loss and Theft Totals (1991-[current year])"  
+        years (tuple[int, int]): Inclusive range of years shown by the 'daily' plot (default: all).
+            Loss and Theft series above max_daily_points are downsampled to min/max per time bucket
+            (outliers are drawn in full by their own trace), so narrower ranges are shown at full resolution.
 
     Returns:
         st.plotly_chart(): Scatter plot
         
     """
     # Data
-    date_report_total = pd.read_parquet('data/marts/date-report-total.parquet').astype({"report":"str"})
+    date_report_total = get_data('date-report-total').astype({"report":"str"})
     
     grouped_day = (
         date_report_total
@@ -66,6 +88,12 @@ def generate_reports_scatterplot(granularity):
         .reset_index()
         .replace(0, np.nan)
         )
+    # 3-month moving averages (month-trends mart), moved to month ends like the grouped months
+    trend_month = get_data('month-trends').astype({"dimension":"str","value":"str"})
+    trend_month = trend_month[trend_month['dimension'] == 'report'].assign(
+        date=lambda df: df['date'] + pd.offsets.MonthEnd(0),
+        rolling_3m_avg=lambda df: df['rolling_3m'] / 3,
+        )
     grouped_year = (
         date_report_total
         .groupby([pd.Grouper(key='date',freq='Y'),'report'])['total']
@@ -77,36 +105,11 @@ def generate_reports_scatterplot(granularity):
     # Current year 
     current_yr = int(modification_date('data/marts/date-report-total.parquet','year'))
 
-    # Outlier condition (also used in annotation text, therefore not 0.0 but 0.00 format)
-    threshold = 0.90
-    
-    # Daily outliers
-    grouped_day['outlier'] = np.where(
-        grouped_day['total'] > grouped_day['total'].quantile(threshold), 
-        True, 
-        False
-        )
-    
-    # Weekly outliers
-    grouped_week['outlier'] = np.where(
-        grouped_week['total'] > grouped_week['total'].quantile(threshold), 
-        True, 
-        False
-        )
-    
-    # Monthly outliers
-    grouped_month['outlier'] = np.where(
-        grouped_month['total'] > grouped_month['total'].quantile(threshold), 
-        True, 
-        False
-        )
-    
-    # Yearly outliers
-    grouped_year['outlier'] = np.where(
-        grouped_year['total'] > grouped_year['total'].quantile(threshold),
-        True,
-        False
-        )
+    # Outliers are anomalies of the whole country (anomalies mart), dates moved to the labels of the grouped periods
+    grouped_day['outlier'] = anomaly_flags(grouped_day, 'day', pd.offsets.Day(0))
+    grouped_week['outlier'] = anomaly_flags(grouped_week, 'week', pd.offsets.Day(6))
+    grouped_month['outlier'] = anomaly_flags(grouped_month, 'month', pd.offsets.MonthEnd(0))
+    grouped_year['outlier'] = anomaly_flags(grouped_year, 'year', pd.offsets.YearEnd(0))
     
     # Hoverlabels
     loss_text = 'Loss: %{y:,.0f}' + '<br>Month: %{x|%B, %d}' + '<br>Year: %{x|%Y}' + '<extra></extra>'
@@ -119,16 +122,26 @@ def generate_reports_scatterplot(granularity):
     # Daily
     if granularity == 'daily':
         
-        # Outliers
+        # Selected years
+        first_yr, last_yr = years if years is not None else (1991, current_yr)
+        grouped_day = grouped_day[grouped_day['date'].dt.year.between(first_yr, last_yr)]
+        
+        # Outliers are only drawn by the outlier trace, the rest of each series is downsampled
+        day_outliers = grouped_day[grouped_day['outlier'] == True]
+        day_regular = grouped_day[grouped_day['outlier'] == False]
+        day_loss = minmax_downsample(day_regular[day_regular['report'] == 'Loss'], 'date', 'total', max_daily_points)
+        day_theft = minmax_downsample(day_regular[day_regular['report'] == 'Theft'], 'date', 'total', max_daily_points)
+        
+        # Outliers (filled with the color of their report type)
         fig.add_trace(
             go.Scattergl(
-                x=grouped_day[(grouped_day['outlier'] == True)]['date'],
-                y=grouped_day[(grouped_day['outlier'] == True)]['total'],
+                x=day_outliers['date'],
+                y=day_outliers['total'],
                 mode='markers',
-                name=f'Outliers <span style="color:{clr_secondary_font}">(Top {100-int(threshold*100)}%)</span>',
+                name=f'Outliers <span style="color:{clr_secondary_font}">(z > {anomaly_threshold})</span>',
                 marker={
                     'size':7,
-                    'color':clr_transparent,
+                    'color':day_outliers['report'].map({'Loss':clr_loss, 'Theft':clr_theft}),
                     'line':{
                         'width':4,
                         'color':clr_outlier
@@ -145,8 +158,8 @@ def generate_reports_scatterplot(granularity):
         
         fig.add_trace(
             go.Scattergl(
-                x=grouped_day[(grouped_day['report'] == 'Loss')]['date'],
-                y=grouped_day[(grouped_day['report'] == 'Loss')]['total'],
+                x=day_loss['date'],
+                y=day_loss['total'],
                 mode='markers',
                 marker={
                     'size':7,
@@ -168,8 +181,8 @@ def generate_reports_scatterplot(granularity):
         
         fig.add_trace(
             go.Scattergl(
-                x=grouped_day[(grouped_day['report'] == 'Theft')]['date'],
-                y=grouped_day[(grouped_day['report'] == 'Theft')]['total'],
+                x=day_theft['date'],
+                y=day_theft['total'],
                 mode='markers',
                 marker={
                     'size':7,
@@ -190,7 +203,7 @@ def generate_reports_scatterplot(granularity):
             )
 
         fig.update_layout(
-            title=f'<b>Daily Lost and Stolen Weapons in Ukraine <span style="color:{clr_secondary_font}">1991-{current_yr}</b></span>',
+            title=f'<b>Daily Lost and Stolen Weapons in Ukraine <span style="color:{clr_secondary_font}">{first_yr}-{last_yr}</b></span>',
             )
 
     # Weekly
@@ -202,7 +215,7 @@ def generate_reports_scatterplot(granularity):
                 x=grouped_week[(grouped_week['outlier'] == True)]['date'],
                 y=grouped_week[(grouped_week['outlier'] == True)]['total'],
                 mode='markers',
-                name=f'Outliers <span style="color:{clr_secondary_font}">(Top {100-int(threshold*100)}%)</span>',
+                name=f'Outliers <span style="color:{clr_secondary_font}">(z > {anomaly_threshold})</span>',
                 marker={
                     'size':9,
                     'color':clr_transparent,
@@ -279,7 +292,7 @@ def generate_reports_scatterplot(granularity):
                 x=grouped_month[(grouped_month['outlier'] == True)]['date'],
                 y=grouped_month[(grouped_month['outlier'] == True)]['total'],
                 mode='markers',
-                name=f'Outliers <span style="color:{clr_secondary_font}">(Top {100-int(threshold*100)}%)</span>',
+                name=f'Outliers <span style="color:{clr_secondary_font}">(z > {anomaly_threshold})</span>',
                 marker={
                     'size':12,
                     'color':clr_transparent,
@@ -343,6 +356,27 @@ def generate_reports_scatterplot(granularity):
                 )
             )
         
+        # 3-month moving averages
+        for report, color in (('Loss', clr_loss), ('Theft', clr_theft)):
+            fig.add_trace(
+                go.Scattergl(
+                    x=trend_month[(trend_month['value'] == report)]['date'],
+                    y=trend_month[(trend_month['value'] == report)]['rolling_3m_avg'],
+                    mode='lines',
+                    line={
+                        'width':2,
+                        'color':color
+                        },
+                    name=f'{report} <span style="color:{clr_secondary_font}">(3-month avg.)</span>',
+                    hovertemplate=f'{report} (3-month avg.): ' + '%{y:,.1f}' + '<br>Month: %{x|%B}' + '<br>Year: %{x|%Y}' + '<extra></extra>',
+                    hoverlabel={
+                        'bordercolor':color,
+                        'font_color':clr_button_text,
+                        'bgcolor':color
+                        }
+                    )
+                )
+        
         fig.update_layout(
             title=f'<b>Monthly Lost and Stolen Weapons in Ukraine <span style="color:{clr_secondary_font}">1991-{current_yr}</b></span>',
             )
@@ -356,7 +390,7 @@ def generate_reports_scatterplot(granularity):
                 x=grouped_year[(grouped_year['outlier'] == True)]['date'],
                 y=grouped_year[(grouped_year['outlier'] == True)]['total'],
                 mode='markers',
-                name=f'Outliers <span style="color:{clr_secondary_font}">(Top {100-int(threshold*100)}%)</span>',
+                name=f'Outliers <span style="color:{clr_secondary_font}">(z > {anomaly_threshold})</span>',
                 marker={
                     'size':18,
                     'color':clr_tile_background,
@@ -434,10 +468,6 @@ def generate_reports_scatterplot(granularity):
     fig.update_layout(
         height=350,
         width=900,
-        plot_bgcolor=clr_tile_background,
-        paper_bgcolor=clr_transparent,
-        font_color=clr_font,
-        font_size=14,
         margin={
             'l':10,
             'r':10, 
@@ -445,11 +475,6 @@ def generate_reports_scatterplot(granularity):
             'b':5
             },
         title={
-            'font':{
-                'size':22, 
-                'family':font_main,
-                'color':clr_font  
-            },
             'x':0.01,
             'xanchor':'left',
             'y':0.95,
@@ -458,12 +483,6 @@ def generate_reports_scatterplot(granularity):
         showlegend=True,
         legend={
             'orientation':'v',
-            'font':{
-                'family':font_main,
-                'size':14,
-                'color':clr_font
-            },
-            'bgcolor':clr_tile_background,
             'y':0.8,
             'x':1.01,
             'itemsizing':'constant'
@@ -471,36 +490,15 @@ def generate_reports_scatterplot(granularity):
         xaxis={
             'title':None,
             'showticklabels':True,
-            'tickfont_size':12,
-            'tickfont_family':font_main,
             'showspikes':True,
-            'spikethickness':1,
-            'spikecolor':clr_main,
-            'gridcolor':clr_page_background,
-            'zeroline':False
             },
         yaxis={
             'title':{
                 'text':'Number of Records',
-                'font_size':14,
-                'font_family':font_main,
                 'standoff':5
                 },
             'showticklabels':True,
-            'tickfont_size':12, 
-            'tickfont_family':font_main,
             'showspikes':False,
-            'gridcolor':clr_page_background,
-            'zeroline':False
-            },
-        hoverlabel={
-            'font_size':13, 
-            'font_family':font_main,
-        },
-        modebar={
-            'orientation':'h',
-            'bgcolor':clr_transparent,
-            'color':clr_main
             },
         updatemenus = [
             {
@@ -510,14 +508,7 @@ def generate_reports_scatterplot(granularity):
                 'y':0.45,
                 'direction':'down',
                 'showactive':True,
-                'bgcolor':clr_button_background,
                 'active':0,
-                'bordercolor':clr_button_background,
-                'font':{
-                    'size':13, 
-                    'color':clr_button_text, 
-                    'family':font_main
-                    },
                 'buttons':[
                     {
                         'args':[{
@@ -575,7 +566,7 @@ def generate_reports_scatterplot(granularity):
 def generate_weapons_scatterplot():
     
     # Data
-    model_region_weaponcategory_total = pd.read_parquet("data/marts/region-weaponcategory-total.parquet").astype({"region":"str","weaponcategory":"str"})
+    model_region_weaponcategory_total = get_data("region-weaponcategory-total").astype({"region":"str","weaponcategory":"str"})
 
     # Function to insert line breaks
     def insert_line_breaks(weaponcategory_name):
@@ -646,8 +637,6 @@ def generate_weapons_scatterplot():
     fig.update_layout(
         width=1400,
         height=1000,
-        plot_bgcolor=clr_tile_background,
-        paper_bgcolor=clr_transparent,
         margin={
             'l':150, 
             'r':10,
@@ -656,10 +645,7 @@ def generate_weapons_scatterplot():
             },
         xaxis={
             'title':None,
-            'tickfont_color':clr_font,
-            'gridcolor':clr_page_background,
             'tickfont_size':13,
-            'tickfont_family':font_main,
             'side':'top',
             'ticks':'outside',
             'anchor':'free', 
@@ -667,43 +653,16 @@ def generate_weapons_scatterplot():
             },
         yaxis={
             'title':None,
-            'gridcolor':clr_page_background,
-            'tickfont_color':clr_font,
             'tickfont_size':14,
-            'tickfont_family':font_main,
             'ticks':'outside',
             },
         coloraxis_colorbar={
             'y':0.5,
             'title':None,
-            'titlefont_color':clr_font,
-            'tickfont_color':clr_font,
-            'tickfont_size':13,
-            'tickfont_family':font_main,
-            'ticks':'outside',
-            },
-        hoverlabel={
-            'bgcolor':clr_hoverlabel,
-            'bordercolor':clr_hoverlabel, 
-            'font_color':clr_font,
-            'font_family':font_main,
-            'font_size':13,
-            },
-        modebar={
-            'orientation':'h',
-            'bgcolor':clr_transparent,
-            'color':clr_main
             },
         )
 
-    fig.update_traces(
-        marker={
-            'line':{
-                'width':0,
-                'color':clr_tile_background,
-                }
-            }
-        )
+    fig.update_traces(marker_line_width=0)
 
     # Disable chart "zoom in" and "zoom out"
     fig.layout.xaxis.fixedrange = True
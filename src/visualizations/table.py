@@ -1,5 +1,8 @@
+import html
+
+import numpy as np
+import pandas as pd
 import streamlit as st
-from matplotlib.colors import ListedColormap
 
 # Colors
 clr_main ="#26c8cd"
@@ -13,133 +16,132 @@ clr_transparent = "rgba(0,0,0,0)"
 # Font
 font_family = 'Montserrat, sans-serif'
 
+# Column name >>> (value format, lower bound, upper bound) of the color scale.
+# Bounds given as ('q', x) are quantiles of the column, floats are used as is.
+REGION_TOTAL_COLUMNS = {
+    "total": ("{:,}", ("q", 0.5), ("q", 0.9)),
+    "loss": ("{:,}", ("q", 0.5), ("q", 0.9)),
+    "theft": ("{:,}", ("q", 0.5), ("q", 0.9)),
+    "total_pct": ("{:.1%}", 0.05, 0.1),
+    "loss_pct": ("{:.0%}", ("q", 0.5), ("q", 1.0)),
+    "theft_pct": ("{:.0%}", ("q", 0.5), ("q", 1.0)),
+}
+
+WEAPONCATEGORY_TOTAL_COLUMNS = {
+    "total": ("{:,}", ("q", 0.5), ("q", 0.9)),
+    "loss": ("{:,}", ("q", 0.5), ("q", 0.9)),
+    "theft": ("{:,}", ("q", 0.5), ("q", 0.9)),
+}
+
+
+def compute_cell_colors(df, columns, cmap_colors):
+    """Maps every cell of the numeric columns onto the colormap in one vectorized pass.
+
+    Matches pandas Styler.text_gradient with matplotlib ListedColormap: values are
+    normalized between column bounds and split into len(cmap_colors) equal bins,
+    values outside the bounds get the first/last color.
+
+    Args:
+        df (pd.DataFrame): Data to color.
+        columns (dict): Column specification, e.g. REGION_TOTAL_COLUMNS.
+        cmap_colors (tuple[str]): Colors of the colormap, from low to high.
+
+    Returns:
+        np.ndarray: Array of hex colors with the shape (rows, columns).
+    """
+    values = df[list(columns)].to_numpy(dtype="float64")
+
+    # Quantiles of all columns at once, bounds are then picked per column
+    levels = sorted({b[1] for _, lo, hi in columns.values() for b in (lo, hi) if isinstance(b, tuple)})
+    quantiles = dict(zip(levels, np.quantile(values, levels, axis=0))) if levels else {}
+
+    def bounds(position):
+        return np.array([
+            quantiles[spec[position][1]][i] if isinstance(spec[position], tuple) else spec[position]
+            for i, spec in enumerate(columns.values())
+        ])
+
+    vmin, vmax = bounds(1), bounds(2)
+    span = np.where(vmax > vmin, vmax - vmin, 1.0)
+    norm = np.where(vmax > vmin, (values - vmin) / span, 0.0)
+
+    n = len(cmap_colors)
+    bins = np.clip(np.floor(norm * n), 0, n - 1).astype("int64")
+
+    return np.asarray(cmap_colors)[bins]
+
+
+@st.cache_data(show_spinner=False)
+def render_table_html(fingerprint, _df, columns, cmap_colors):
+    """Builds compact HTML table with colored values.
+    Cached by data fingerprint, so reruns with unchanged data skip rendering.
+
+    Args:
+        fingerprint (int): Hash of the data, used as cache key instead of the DataFrame.
+        _df (pd.DataFrame): Data indexed by row labels (excluded from cache key).
+        columns (dict): Column specification, e.g. REGION_TOTAL_COLUMNS.
+        cmap_colors (tuple[str]): Colors of the colormap, from low to high.
+
+    Returns:
+        str: HTML table.
+    """
+    colors = compute_cell_colors(_df, columns, cmap_colors)
+
+    header = "".join(f"<th>{html.escape(str(c))}</th>" for c in columns)
+    rows = []
+    for label, row, row_colors in zip(_df.index, _df[list(columns)].itertuples(index=False), colors):
+        cells = "".join(
+            f"<td style='color:{color}'>{fmt.format(value)}</td>"
+            for value, color, (fmt, _, _) in zip(row, row_colors, columns.values())
+        )
+        rows.append(f"<tr><th scope='row'>{html.escape(str(label))}</th>{cells}</tr>")
+
+    return (
+        "<div class='color-table'><table>"
+        f"<thead><tr><th></th>{header}</tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody>"
+        "</table></div>"
+    )
+
+
+def fingerprint(df):
+    """Returns hash of DataFrame values and index."""
+    return int(pd.util.hash_pandas_object(df, index=True).sum())
+
 
 def generate_region_total_table(
     df,
-    cmap_colors=[clr_secondary_font, '#8a3d3f', clr_outlier],
+    cmap_colors=(clr_secondary_font, '#8a3d3f', clr_outlier),
 ):
     """
-    Apply a custom style to a DataFrame.
+    Render region totals as a table with color-coded values.
 
     Args:
-        df (pd.DataFrame): DataFrame to apply the background gradient to.
-        cmap_colors (List[str]): List of color values for the colormap.
-        low (int or float): Lowest value in the range (default: 0).
-        high (int or float): Highest value in the range (default: 0).
+        df (pd.DataFrame): Region totals (region-total mart) indexed by region.
+        cmap_colors (tuple[str]): Colors of the colormap, from low to high.
 
     Returns:
-        pd.DataFrame: DataFrame with applied styles.
+        st.markdown(): HTML table.
     """
-    
-    df.index.name = None
-    
-    # Colormap of the provided colors
-    cmap = ListedColormap(cmap_colors)
-    
-    # Apply the background gradient to the DataFrame
-    styled_df = (
-        df
-        .style
-        .format({
-            "total": "{:,}",
-            "loss": "{:,}",
-            "theft": "{:,}",
-            "total_pct": "{:.1%}",
-            "loss_pct": "{:.0%}",
-            "theft_pct": "{:.0%}"
-            })
-        .text_gradient(
-            subset=['total'],
-            cmap=cmap,
-            vmin=df['total'].quantile(0.5),
-            vmax=df['total'].quantile(0.9)
-            )
-        .text_gradient(
-            subset=['loss'],
-            cmap=cmap,
-            vmin=df['loss'].quantile(0.5),
-            vmax=df['loss'].quantile(0.9)
-            )
-        .text_gradient(
-            subset=['theft'],
-            cmap=cmap,
-            vmin=df['theft'].quantile(0.5),
-            vmax=df['theft'].quantile(0.9)
-            )
-        .text_gradient(
-            subset=['total_pct'],
-            cmap=cmap,
-            vmin=0.05,
-            vmax=0.1
-            )
-        .text_gradient(
-            subset=['loss_pct'],
-            cmap=cmap,
-            vmin=df['loss_pct'].quantile(0.5),
-            vmax=df['loss_pct'].quantile(1.0)
-            )
-        .text_gradient(
-            subset=['theft_pct'],
-            cmap=cmap,
-            vmin=df['theft_pct'].quantile(0.5),
-            vmax=df['theft_pct'].quantile(1.0)
-            )
-        )
-    
-    return st.table(styled_df)
+    table_html = render_table_html(fingerprint(df), df, REGION_TOTAL_COLUMNS, tuple(cmap_colors))
+
+    return st.markdown(table_html, unsafe_allow_html=True)
 
 
 def generate_weaponcategory_total_table(
     df,
-    cmap_colors=[clr_secondary_font, '#8a3d3f', clr_outlier],
+    cmap_colors=(clr_secondary_font, '#8a3d3f', clr_outlier),
 ):
     """
-    Apply a custom style to a DataFrame.
+    Render weapon category totals as a table with color-coded values.
 
     Args:
-        df (pd.DataFrame): DataFrame to apply the background gradient to.
-        cmap_colors (List[str]): List of color values for the colormap.
-        low (int or float): Lowest value in the range (default: 0).
-        high (int or float): Highest value in the range (default: 0).
+        df (pd.DataFrame): Weapon category totals (weaponcategory-total mart) indexed by category.
+        cmap_colors (tuple[str]): Colors of the colormap, from low to high.
 
     Returns:
-        pd.DataFrame: DataFrame with applied styles.
+        st.markdown(): HTML table.
     """
-    
-    df.index.name = None
-    
-    # Colormap of the provided colors
-    cmap = ListedColormap(cmap_colors)
-    
-    # Apply the background gradient to the DataFrame
-    styled_df = (
-        df
-        .style
-        .format({
-            "total": "{:,}",
-            "loss": "{:,}",
-            "theft": "{:,}",
-            })
-        .text_gradient(
-            subset=['total'],
-            cmap=cmap,
-            vmin=df['total'].quantile(0.5),
-            vmax=df['total'].quantile(0.9)
-            )
-        .text_gradient(
-            subset=['loss'],
-            cmap=cmap,
-            vmin=df['loss'].quantile(0.5),
-            vmax=df['loss'].quantile(0.9)
-            )
-        .text_gradient(
-            subset=['theft'],
-            cmap=cmap,
-            vmin=df['theft'].quantile(0.5),
-            vmax=df['theft'].quantile(0.9)
-            )
-        )
-    
-    return st.table(styled_df)
-
+    table_html = render_table_html(fingerprint(df), df, WEAPONCATEGORY_TOTAL_COLUMNS, tuple(cmap_colors))
 
+    return st.markdown(table_html, unsafe_allow_html=True)
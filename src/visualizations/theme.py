@@ -0,0 +1,146 @@
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Colors
+clr_main = '#2dcdd2'
+clr_font = '#dedede'
+clr_secondary_font = '#8d9294'
+
+clr_page_background = '#333333'
+clr_tile_background = '#292929'
+clr_tile_background_darker = '#262626'
+clr_hoverlabel = 'rgba(51, 51, 51, 0.95)'
+clr_transparent = 'rgba(0,0,0,0)'
+
+clr_button_background = '#8d9294'
+clr_button_text = '#292929'
+
+clr_loss = '#679496'
+clr_theft = '#006C72'
+clr_outlier = '#e54848'
+
+# Font
+font_main = 'Montserrat, sans-serif'
+
+# Served by Streamlit static file serving (.streamlit/config.toml), so figures
+# reference the image by URL instead of embedding it into every figure's JSON.
+# PNG, as Streamlit serves only common raster formats with their content type.
+watermark = 'app/static/watermark.png'
+
+# Layout defaults shared by all charts, figures only set their geometry and data encodings.
+# Plotly embeds the template into every figure's JSON, so it is kept small
+# (the built-in 'plotly' template is ~7KB).
+axis = {
+    'gridcolor':clr_page_background,
+    'zeroline':False,
+    'zerolinecolor':clr_page_background,
+    'tickfont_size':12,
+    'spikecolor':clr_main,
+    'spikethickness':1,
+    }
+
+pio.templates['ua_weapons'] = go.layout.Template(
+    layout={
+        'paper_bgcolor':clr_transparent,
+        'plot_bgcolor':clr_tile_background,
+        'font':{
+            'family':font_main,
+            'color':clr_font,
+            'size':14
+            },
+        'title_font_size':22,
+        'legend':{
+            'bgcolor':clr_tile_background,
+            'font_size':14
+            },
+        'hoverlabel':{
+            'bgcolor':clr_hoverlabel,
+            'bordercolor':clr_hoverlabel,
+            'font':{
+                'family':font_main,
+                'color':clr_font,
+                'size':13
+                },
+            'align':'left'
+            },
+        'modebar':{
+            'orientation':'h',
+            'bgcolor':clr_transparent,
+            'color':clr_main
+            },
+        'xaxis':axis,
+        'yaxis':axis,
+        'polar':{
+            'bgcolor':clr_tile_background,
+            'angularaxis':{
+                'gridcolor':clr_page_background,
+                'linecolor':clr_page_background,
+                'showline':False
+                },
+            'radialaxis':{
+                'gridcolor':clr_page_background,
+                'showline':False
+                }
+            },
+        'coloraxis_colorbar':{
+            'tickfont_size':13,
+            'ticks':'outside'
+            },
+        'updatemenudefaults':{
+            'bgcolor':clr_button_background,
+            'bordercolor':clr_button_background,
+            'font':{
+                'size':13,
+                'color':clr_button_text
+                }
+            },
+        },
+    data={
+        'pie':[
+            go.Pie(
+                marker_line={'color':clr_tile_background, 'width':5},
+                textfont_size=12
+                )
+            ]
+        }
+    )
+
+# Timelines and small multiples: muted tick labels, one hoverlabel for all traces, no legend
+pio.templates['ua_weapons_muted'] = go.layout.Template(
+    layout={
+        'xaxis_tickfont_color':clr_secondary_font,
+        'yaxis_tickfont_color':clr_secondary_font,
+        'hovermode':'x unified',
+        'showlegend':False,
+        }
+    )
+
+# Region panels, drawn on darker tiles (--tile-bg-darker-color of style.css)
+pio.templates['ua_weapons_region'] = go.layout.Template(
+    layout={
+        'plot_bgcolor':clr_tile_background_darker,
+        'polar':{
+            'bgcolor':clr_tile_background_darker,
+            'angularaxis_tickfont':{
+                'size':11,
+                'color':clr_secondary_font
+                }
+            },
+        'hoverlabel':{
+            'bgcolor':'rgba(72,72,72,0.8)',
+            'bordercolor':'rgba(72,72,72,0.8)'
+            },
+        'annotationdefaults':{
+            'font':{
+                'size':13,
+                'color':clr_secondary_font
+                }
+            },
+        }
+    )
+
+pio.templates.default = 'ua_weapons'
+
+# Templates of charts extending the default one
+template_muted = 'ua_weapons+ua_weapons_muted'
+template_region = 'ua_weapons+ua_weapons_muted+ua_weapons_region'
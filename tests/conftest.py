@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the app packages (src) from the project root and pipeline modules
+# the way pipeline/etl.py does, i.e. with pipeline/ on the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [project_root, os.path.join(project_root, "pipeline")]
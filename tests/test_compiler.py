@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+from config import compiler
+
+
+@pytest.fixture
+def compiler_copy(tmp_path, monkeypatch):
+    "Caches configs under tmp_path, keyed by a copy of the compiler source that tests can edit."
+    path = tmp_path / "compiler.py"
+    shutil.copy(compiler.COMPILER_PATH, path)
+    monkeypatch.setattr(compiler, "CACHE_DIR", str(tmp_path / ".cache"))
+    monkeypatch.setattr(compiler, "COMPILER_PATH", str(path))
+    return path
+
+
+def test_cached_config_is_reused(compiler_copy, monkeypatch):
+    config = compiler.load_config()
+
+    # A cache hit skips compiling altogether
+    monkeypatch.setattr(compiler, "compile_config", lambda path: pytest.fail("config was recompiled"))
+    assert compiler.load_config() == config
+
+
+def test_compiler_change_revalidates_cached_config(compiler_copy, monkeypatch):
+    compiler.load_config()
+
+    # A new required key, as added to REQUIRED_KEYS in the compiler source
+    required = {**compiler.REQUIRED_KEYS, "fetch": (*compiler.REQUIRED_KEYS["fetch"], "not_in_config")}
+    monkeypatch.setattr(compiler, "REQUIRED_KEYS", required)
+    compiler_copy.write_text(compiler_copy.read_text() + "\n# not_in_config\n")
+
+    with pytest.raises(ValueError, match="fetch.not_in_config"):
+        compiler.load_config()
+
+
+def test_partition_keys_must_contain_year():
+    config = compiler.compile_config()
+    config["settings"]["partition_by"] = ["region"]
+
+    with pytest.raises(ValueError, match="must contain 'year'"):
+        compiler.validate_config(config)
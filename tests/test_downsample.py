@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.downsample import minmax_downsample
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def daily_loss():
+    "Daily Loss totals since 1991, as drawn by the daily reports scatterplot."
+    df = pd.read_parquet(os.path.join(project_root, "data", "marts", "date-report-total.parquet"))
+    df = df[df["report"] == "Loss"]
+    return df.groupby(pd.Grouper(key="date", freq="D"))["total"].sum().replace(0, np.nan).reset_index()
+
+
+def test_full_date_range_keeps_about_max_points():
+    series = daily_loss()
+    assert len(series.dropna()) > 10_000
+
+    sampled = minmax_downsample(series, "date", "total", 2000)
+
+    # Every bucket keeps its min and max, buckets span the whole range
+    assert 1500 <= len(sampled) <= 2000
+    assert sampled["date"].min() - series.dropna()["date"].min() < pd.Timedelta(days=30)
+    assert series.dropna()["date"].max() - sampled["date"].max() < pd.Timedelta(days=30)
+
+
+def test_extremes_are_kept_and_order_preserved():
+    series = daily_loss()
+    sampled = minmax_downsample(series, "date", "total", 2000)
+
+    assert sampled["total"].max() == series["total"].max()
+    assert sampled["total"].min() == series["total"].min()
+    assert sampled["date"].is_monotonic_increasing
+
+
+def test_short_series_is_returned_unchanged():
+    series = daily_loss().dropna().tail(500)
+
+    assert minmax_downsample(series, "date", "total", 2000).equals(series)
@@ -0,0 +1,67 @@
+import json
+import random
+import tracemalloc
+
+import pytest
+
+from config import ENGINE
+from etl import extract
+
+
+def records(n):
+    "Raw records with strings that look like JSON structure, escapes and non-ASCII text."
+    rng = random.Random(0)
+    pieces = ['АК-74 ', '"', '\\', '},{', '[', ']', ',', ' ', '\n', '\\"', '{"a":[1]}']
+    return [
+        {
+            "weaponkind": "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12))),
+            "organunit": f"ГУНП в області {i % 25}",
+            "insertdate": "2023-01-05T00:00:00",
+            "nested": {"values": [i, {"text": "]},"}]},
+        }
+        for i in range(n)
+    ]
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("buffer_size", [1, 2, 3, 7, 1 << 20])
+def test_records_split_across_buffers(tmp_path, indent, buffer_size):
+    expected = records(30)
+    raw_path = tmp_path / "raw.json"
+    raw_path.write_bytes(b"\xef\xbb\xbf" + json.dumps(expected, ensure_ascii=False, indent=indent).encode())
+
+    extract.json_to_ndjson(str(raw_path), str(tmp_path / "raw.ndjson"), buffer_size=buffer_size)
+
+    assert read_ndjson(tmp_path / "raw.ndjson") == expected
+
+
+@pytest.mark.parametrize("content", ['{"weaponkind": "ПМ"}', '[{"weaponkind": "ПМ"}, {"weaponkind": "П'])
+def test_invalid_dump_is_rejected(tmp_path, content):
+    raw_path = tmp_path / "raw.json"
+    raw_path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="JSON array"):
+        extract.json_to_ndjson(str(raw_path), str(tmp_path / "raw.ndjson"))
+
+
+def test_conversion_of_dump_larger_than_memory_budget(tmp_path):
+    budget_bytes = 1024**2
+    expected = records(20_000)
+    raw_path = tmp_path / "raw.json"
+    raw_path.write_text(json.dumps(expected, ensure_ascii=False, indent=1), encoding="utf-8")
+    assert raw_path.stat().st_size > 3 * budget_bytes
+
+    tracemalloc.start()
+    extract.json_to_ndjson(str(raw_path), str(tmp_path / "raw.ndjson"), buffer_size=budget_bytes // 16)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    df = extract.import_json(str(raw_path), str(tmp_path)).collect(engine=ENGINE)
+
+    assert peak < budget_bytes
+    assert df["weaponkind"].to_list() == [record["weaponkind"] for record in expected]
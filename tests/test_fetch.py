@@ -0,0 +1,137 @@
+import gzip
+import json
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from etl import fetch
+
+CONTENT = json.dumps([{"weaponkind": f"Пістолет {i}", "organunit": "ГУНП"} for i in range(5000)]).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    "Static resource with an ETag, conditional and ranged requests and on-the-fly gzip."
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body, status, encoding = server.content, 200, None
+        if self.headers.get("Range") and self.headers.get("If-Range") == server.etag:
+            start = int(self.headers["Range"].removeprefix("bytes=").rstrip("-"))
+            body, status = body[start:], 206
+        elif "gzip" in self.headers.get("Accept-Encoding", ""):
+            body, encoding = gzip.compress(body, mtime=0), "gzip"
+
+        self.send_response(status)
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {len(server.content) - len(body)}-{len(server.content) - 1}/{len(server.content)}")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+
+        # Drop the connection halfway through the body once, as an interrupted download
+        if server.interrupt:
+            server.interrupt = False
+            self.wfile.write(body[:len(body) // 2])
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.content, server.etag, server.interrupt, server.requests = CONTENT, '"v1"', False, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def config(server, tmp_path, monkeypatch):
+    # No backoff between retries
+    monkeypatch.setattr(fetch.time, "sleep", lambda seconds: None)
+    return {
+        "fetch": {"url": f"http://127.0.0.1:{server.server_port}/raw.json", "timeout": 5, "retries": 2},
+        "files": {"raw_path": [str(tmp_path / "raw.json")]},
+    }
+
+
+def raw_bytes(config):
+    with open(config["files"]["raw_path"][0], "rb") as f:
+        return f.read()
+
+
+def test_download_with_etag_then_not_modified(server, config):
+    assert fetch.fetch_raw_data(config)
+    assert raw_bytes(config) == CONTENT
+
+    meta = fetch.read_metadata(config["files"]["raw_path"][0] + ".meta.json")
+    assert meta["etag"] == server.etag
+    assert meta["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+
+    assert not fetch.fetch_raw_data(config)
+    assert server.requests[-1]["If-None-Match"] == server.etag
+    assert raw_bytes(config) == CONTENT
+
+
+def test_gzip_response_is_decompressed(server, config):
+    assert fetch.fetch_raw_data(config)
+
+    assert "gzip" in server.requests[0]["Accept-Encoding"]
+    assert raw_bytes(config) == CONTENT
+
+
+def test_interrupted_download_resumes_with_range(server, config, tmp_path):
+    # Uncompressed partial download of the current version, as left by an interrupted run
+    part_path = str(tmp_path / "raw.json.part")
+    with open(part_path, "wb") as f:
+        f.write(CONTENT[:1000])
+    fetch.write_metadata(f"{part_path}.json", {"url": config["fetch"]["url"], "etag": server.etag, "encoding": None})
+
+    assert fetch.fetch_raw_data(config)
+
+    request = server.requests[0]
+    assert request["Range"] == "bytes=1000-"
+    assert request["If-Range"] == server.etag
+    assert "gzip" not in request["Accept-Encoding"]
+    assert raw_bytes(config) == CONTENT
+
+
+def test_if_range_mismatch_downloads_whole_resource(server, config, tmp_path):
+    # Partial download of a previous version, the server answers 200 with the new one
+    part_path = str(tmp_path / "raw.json.part")
+    with open(part_path, "wb") as f:
+        f.write(b"[" + b"0" * 999)
+    fetch.write_metadata(f"{part_path}.json", {"url": config["fetch"]["url"], "etag": '"v0"', "encoding": None})
+
+    assert fetch.fetch_raw_data(config)
+
+    assert server.requests[0]["If-Range"] == '"v0"'
+    assert raw_bytes(config) == CONTENT
+
+
+def test_interrupted_gzip_download_starts_over(server, config):
+    server.interrupt = True
+
+    assert fetch.fetch_raw_data(config)
+
+    # Compressed bytes are not resumed, the retry downloads the whole (gzip) body again
+    first, retry = server.requests
+    assert "gzip" in first["Accept-Encoding"]
+    assert "Range" not in retry
+    assert raw_bytes(config) == CONTENT
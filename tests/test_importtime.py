@@ -0,0 +1,30 @@
+import sys
+import subprocess
+
+from src.utils.importtime import (
+    BUDGET_MS,
+    PROJECT_ROOT,
+    first_render_import_ms,
+    first_render_modules,
+    measure_imports,
+)
+
+
+def test_packages_defer_heavy_imports():
+    # app.py imports both packages at the top, charts and their dependencies load on first access
+    code = "import sys, src.utils, src.visualizations; print(*sorted(m for m in ('pandas', 'plotly', 'pyarrow', 'matplotlib') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=PROJECT_ROOT)
+
+    assert result.stdout.strip() == ""
+
+
+def test_first_render_imports_fit_budget():
+    imports = measure_imports(first_render_modules())
+    measured = {name for name, _, _, _ in imports}
+
+    # Chart modules and their dependencies (graph_objects is preloaded by streamlit) are measured, not just the lazy packages
+    assert {"src.visualizations.barchart", "src.visualizations.scatterplot", "plotly.express"} <= measured
+
+    total_ms = first_render_import_ms(imports)
+    slowest = sorted(imports, key=lambda i: i[3], reverse=True)[:5]
+    assert total_ms <= BUDGET_MS, f"First render imports take {total_ms:.0f} ms, slowest: {slowest}"
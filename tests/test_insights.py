@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import insights
+
+
+@pytest.fixture
+def mart(monkeypatch):
+    # Missing text read back as NaN (e.g. through a float-typed or pandas-written column)
+    df = pd.DataFrame({
+        "key": ["records_2014", "donetsk_total_pct", "top_category_1"],
+        "number": [31_000.0, 0.15, np.nan],
+        "text": [np.nan, None, "Firearms"],
+    })
+    monkeypatch.setattr(insights, "get_data", lambda name: df)
+    insights.load_insights.clear()
+    yield
+    insights.load_insights.clear()
+
+
+def test_missing_text_falls_back_to_number(mart):
+    assert insights.insight_int("records_2014") == 31_000
+    assert insights.insight_float("donetsk_total_pct") == 0.15
+    assert insights.insight_str("top_category_1") == "Firearms"
+
+
+def test_wrong_kind_and_missing_key_raise(mart):
+    with pytest.raises(TypeError):
+        insights.insight_str("records_2014")
+    with pytest.raises(KeyError):
+        insights.insight_int("records_1990")
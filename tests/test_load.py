@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import random
+import subprocess
+
+import pyarrow.parquet as pq
+
+PIPELINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pipeline")
+
+# Runs the pipeline stages of pipeline/etl.py in a fresh interpreter,
+# Polars reads the memory budget when it is first imported
+PIPELINE_RUN = """
+import sys
+sys.path.append(sys.argv[1])
+
+from config import read_config, configure_streaming, ENGINE
+
+budget_config = read_config()
+budget_config["settings"]["memory_budget_mb"] = 1
+budget_config["files"]["spill_dir"] = ["tmp"]
+configure_streaming(budget_config)
+
+import polars as pl
+from config import load_config
+from etl import extract, transform, load, quarantine
+
+config = load_config()
+config["files"].update(
+    spill_dir=["tmp"],
+    seen_hashes_path=["processed", "seen-hashes.parquet"],
+    quarantine_dir=["quarantine"],
+)
+
+df = extract.import_json("raw.json", "tmp")
+df = extract.select_columns(df, config)
+df = extract.drop_duplicates(df, config)
+df = extract.cast_dtypes(df, config)
+df = extract.drop_nulls(df)
+
+df = transform.transform_column_reasonsearch(df)
+df = transform.transform_column_organunit(df, config)
+df = transform.transform_column_weaponkind(df, config)
+df = transform.check_new_weapons(df)
+df = transform.transform_column_dates(df)
+
+df = load.add_partition_columns(load.sort_columns(df), config)
+kept, dropped = quarantine.split_kept_and_quarantine(df, config)
+pl.collect_all(
+    [
+        load.sink_processed(kept.drop("record_hash"), "processed/dataset", config),
+        load.sink_hashes(pl.concat([kept.select("record_hash"), dropped.select("record_hash")]), config),
+        quarantine.sink_quarantine(dropped, config),
+    ],
+    engine=ENGINE
+)
+load.publish_processed("processed/dataset")
+quarantine.write_quarantine(config)
+load.save_seen_hashes(config)
+"""
+
+
+def raw_records(n):
+    "Distinct raw records that pass every transformation."
+    rng = random.Random(0)
+    units = ["ГУНП В КИЇВСЬКІЙ ОБЛАСТІ", "ГУНП У ЛЬВІВСЬКІЙ ОБЛАСТІ", "ГУНП В ОДЕСЬКІЙ ОБЛАСТІ"]
+    return [
+        {
+            "weaponkind": rng.choice(["КИНДЖАЛ", "КОРТИК", "НІЖ МИСЛИВСЬКИЙ"]),
+            "weaponseries": "АК",
+            "weaponnumber": str(i),
+            "organunit": rng.choice(units),
+            "reasonsearch": rng.choice(["ВТРАТА", "ВИКРАДЕННЯ"]),
+            "insertdate": f"{rng.randint(1995, 2023)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+            "theftdate": None,
+        }
+        for i in range(n)
+    ]
+
+
+def test_pipeline_runs_within_memory_budget(tmp_path):
+    records = raw_records(30_000)
+    unknown_weapons = [dict(r, weaponkind="ЛАЗЕРНИЙ МЕЧ") for r in raw_records(10)]
+    # Every record is exported twice
+    raw = records + unknown_weapons + records[::-1]
+    (tmp_path / "raw.json").write_text(json.dumps(raw, ensure_ascii=False, indent=1), encoding="utf-8")
+    assert (tmp_path / "raw.json").stat().st_size > 10 * 1024**2
+
+    run = subprocess.run(
+        [sys.executable, "-c", PIPELINE_RUN, PIPELINE_DIR], cwd=tmp_path, capture_output=True, text=True
+    )
+    assert run.returncode == 0, run.stderr
+
+    # Sorts and dedup spilled instead of holding the data in memory
+    assert any(entry.is_dir() for entry in os.scandir(tmp_path / "tmp"))
+
+    processed = pq.read_table(tmp_path / "processed" / "dataset", partitioning="hive")
+    assert processed.num_rows == len(records)
+    assert sorted(processed["year"].unique().to_pylist()) == sorted({int(r["insertdate"][:4]) for r in records})
+    for part_dir in (tmp_path / "processed" / "dataset").iterdir():
+        dates = pq.read_table(part_dir)["date"].to_pylist()
+        assert dates == sorted(dates)
+
+    # Quarantined records are seen as well, incremental runs skip them
+    assert pq.read_table(tmp_path / "processed" / "seen-hashes.parquet").num_rows == len(records) + len(unknown_weapons)
+    [quarantine_file] = (tmp_path / "quarantine").glob("dropped-rows-*.parquet")
+    assert pq.read_table(quarantine_file)["drop_reason"].to_pylist() == ["unknown_weapon"] * len(unknown_weapons)
@@ -0,0 +1,57 @@
+import os
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from src.utils import loader
+from src.utils.importtime import PROJECT_ROOT
+
+
+def write_mart(path, totals):
+    pq.write_table(pa.table({"region": ["Kyiv", "Lviv"][:len(totals)], "total": totals}), path)
+
+
+def test_ipc_copy_is_read_when_up_to_date(tmp_path):
+    path = str(tmp_path / "region-total.parquet")
+    ipc_path = str(tmp_path / "region-total.arrow")
+    write_mart(path, [10, 20])
+
+    # Without a copy the parquet file is read, no copy is written by the app
+    assert loader.read_file(path)["total"].tolist() == [10, 20]
+    assert os.listdir(tmp_path) == ["region-total.parquet"]
+
+    # Copy written by the pipeline
+    feather.write_feather(pa.table({"region": ["Kyiv"], "total": [11]}), ipc_path)
+    assert loader.read_file(path)["total"].tolist() == [11]
+
+    # Copy older than the parquet file is outdated
+    os.utime(ipc_path, (0, 0))
+    assert loader.read_file(path)["total"].tolist() == [10, 20]
+
+
+@pytest.mark.parametrize("ipc_copy", [False, True])
+def test_rows_filter(tmp_path, ipc_copy):
+    path = str(tmp_path / "region-total.parquet")
+    write_mart(path, [10, 20])
+    if ipc_copy:
+        feather.write_feather(pq.read_table(path), str(tmp_path / "region-total.arrow"))
+
+    df = loader.read_file(path, rows=pc.field("total") > 15)
+
+    assert df.to_dict("records") == [{"region": "Lviv", "total": 20}]
+
+
+def test_startup_data_loads_within_target(monkeypatch):
+    monkeypatch.chdir(PROJECT_ROOT)
+    loader.load_startup_data.clear()
+
+    start = loader.time.perf_counter()
+    frames = loader.load_startup_data()
+    elapsed = loader.time.perf_counter() - start
+
+    assert set(frames) == set(loader.STARTUP_DATA)
+    assert frames["anomalies"]["is_anomaly"].all()
+    assert elapsed <= loader.STARTUP_TARGET, f"Startup data loaded in {elapsed:.3f}s"
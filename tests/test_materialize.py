@@ -0,0 +1,86 @@
+import os
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from etl import materialize
+
+
+@pytest.fixture
+def processed_dir(tmp_path, monkeypatch):
+    "Processed dataset with one file per year, synced into an in-memory database."
+    monkeypatch.setattr(materialize, "abs_processed_path", str(tmp_path))
+    monkeypatch.setattr(materialize, "processed_glob", str(tmp_path / "**" / "*.parquet"))
+    for year, regions in ((2021, ["Kyiv", "Lviv"]), (2022, ["Kyiv"])):
+        write_partition(tmp_path, year, {"region": regions})
+    return tmp_path
+
+
+def write_partition(processed_dir, year, columns):
+    os.makedirs(processed_dir / f"year={year}", exist_ok=True)
+    pq.write_table(pa.table(columns), processed_dir / f"year={year}" / "part-0.parquet")
+
+
+@pytest.fixture
+def hashed_files(monkeypatch):
+    "Records partitions of the files read for hashing."
+    hashed = []
+
+    def open_file(path, *args, **kwargs):
+        hashed.append(os.path.basename(os.path.dirname(path)))
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(materialize, "open", open_file, raising=False)
+    return hashed
+
+
+def rows(db_connection):
+    return db_connection.execute("SELECT year, region FROM weapons ORDER BY ALL").fetchall()
+
+
+def test_only_modified_files_are_hashed(processed_dir, hashed_files):
+    db_connection = duckdb.connect()
+    materialize.sync_processed_table(db_connection)
+    assert sorted(hashed_files) == ["year=2021", "year=2022"]
+
+    hashed_files.clear()
+    materialize.sync_processed_table(db_connection)
+    assert hashed_files == []
+
+    write_partition(processed_dir, 2022, {"region": ["Odesa"]})
+    write_partition(processed_dir, 2023, {"region": ["Sumy"]})
+    materialize.sync_processed_table(db_connection)
+
+    assert sorted(hashed_files) == ["year=2022", "year=2023"]
+    assert rows(db_connection) == [(2021, "Kyiv"), (2021, "Lviv"), (2022, "Odesa"), (2023, "Sumy")]
+
+
+def test_touched_partition_is_not_merged_again(processed_dir, hashed_files, caplog):
+    db_connection = duckdb.connect()
+    materialize.sync_processed_table(db_connection)
+
+    # Same content, other modification time (e.g. a fresh checkout): hashed, but not merged
+    os.utime(processed_dir / "year=2021" / "part-0.parquet", ns=(0, 0))
+    hashed_files.clear()
+    with caplog.at_level("INFO", logger=materialize.__name__):
+        materialize.sync_processed_table(db_connection)
+
+    assert hashed_files == ["year=2021"]
+    assert "Merged 0 changed and removed 0 missing partitions of 2." in caplog.text
+    assert rows(db_connection) == [(2021, "Kyiv"), (2021, "Lviv"), (2022, "Kyiv")]
+
+
+def test_new_column_rebuilds_table(processed_dir):
+    db_connection = duckdb.connect()
+    materialize.sync_processed_table(db_connection)
+
+    # Every partition rewritten with an additional column
+    write_partition(processed_dir, 2021, {"region": ["Kyiv", "Lviv"], "report": ["Loss", "Theft"]})
+    write_partition(processed_dir, 2022, {"region": ["Kyiv"], "report": ["Theft"]})
+    materialize.sync_processed_table(db_connection)
+
+    assert db_connection.execute("SELECT year, region, report FROM weapons ORDER BY ALL").fetchall() == [
+        (2021, "Kyiv", "Loss"), (2021, "Lviv", "Theft"), (2022, "Kyiv", "Theft"),
+    ]
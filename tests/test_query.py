@@ -0,0 +1,96 @@
+import datetime as dt
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import streamlit as st
+
+from etl import materialize
+from src.utils import query
+
+RECORDS = [
+    # date, region, report, weaponcategory
+    (dt.datetime(2021, 3, 1), "Kyiv", "Theft", "Handguns"),
+    (dt.datetime(2021, 7, 9), "Lviv", "Loss", "Bladed"),
+    (dt.datetime(2022, 2, 24), "Kyiv", "Theft", "Light firearms"),
+    (dt.datetime(2022, 2, 25), "Kyiv", "Loss", "Handguns"),
+    (dt.datetime(2023, 1, 5), "Lviv", "Theft", "Handguns"),
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    "Processed dataset partitioned by year and a mart, no database file."
+    for year in {date.year for date, *_ in RECORDS}:
+        rows = [r for r in RECORDS if r[0].year == year]
+        part_dir = tmp_path / "processed" / f"year={year}"
+        part_dir.mkdir(parents=True)
+        table = pa.table(dict(zip(["date", "region", "report", "weaponcategory"], map(list, zip(*rows)))))
+        pq.write_table(table, part_dir / "part.parquet")
+
+    marts_dir = tmp_path / "marts"
+    marts_dir.mkdir()
+    pq.write_table(pa.table({"region": ["Kyiv", "Lviv"], "total": [3, 2]}), marts_dir / "region-total.parquet")
+
+    monkeypatch.setattr(query, "DATABASE_PATH", str(tmp_path / "warehouse" / "query.duckdb"))
+    monkeypatch.setattr(query, "PROCESSED_GLOB", str(tmp_path / "processed" / "**" / "*.parquet"))
+    monkeypatch.setattr(query, "MARTS_DIR", str(marts_dir))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    return tmp_path
+
+
+def build_database(data_dir, monkeypatch):
+    "Builds the query database the way an in-memory materialization does."
+    monkeypatch.setattr(materialize, "database_path", query.DATABASE_PATH)
+    monkeypatch.setattr(materialize, "marts_dir", query.MARTS_DIR)
+    monkeypatch.setattr(materialize, "models_list", ["region-total.sql"])
+
+    connection = duckdb.connect()
+    connection.execute(f"CREATE VIEW weapons AS SELECT * FROM read_parquet('{query.PROCESSED_GLOB}', hive_partitioning=true)")
+    materialize.build_database(connection)
+    connection.close()
+
+
+def test_slice_totals_without_database_file(data_dir):
+    totals = query.slice_totals(["year", "report"], region="Kyiv", years=(2021, 2022))
+
+    assert totals.to_dict("records") == [
+        {"year": 2021, "report": "Theft", "total": 1},
+        {"year": 2022, "report": "Loss", "total": 1},
+        {"year": 2022, "report": "Theft", "total": 1},
+    ]
+    assert query.run_query("SELECT total FROM region_total WHERE region = ?", ("Lviv",))["total"].tolist() == [2]
+
+
+def test_slice_totals_from_database_file(data_dir, monkeypatch):
+    build_database(data_dir, monkeypatch)
+
+    assert query.database_version() is not None
+    assert query.slice_totals(["region"], report="Theft").to_dict("records") == [
+        {"region": "Kyiv", "total": 2},
+        {"region": "Lviv", "total": 1},
+    ]
+    assert query.slice_totals(["month"], years=(2023, 2023))["total"].tolist() == [1]
+    assert query.run_query("SELECT SUM(total) AS total FROM region_total")["total"].tolist() == [5]
+
+
+def test_rebuilt_database_is_not_served_from_cache(data_dir, monkeypatch):
+    build_database(data_dir, monkeypatch)
+    assert query.slice_totals([])["total"].tolist() == [5]
+
+    # The next pipeline run loads one more record
+    (data_dir / "processed" / "year=2024").mkdir()
+    pq.write_table(
+        pa.table({"date": [dt.datetime(2024, 1, 1)], "region": ["Kyiv"], "report": ["Loss"], "weaponcategory": ["Bladed"]}),
+        data_dir / "processed" / "year=2024" / "part.parquet",
+    )
+    build_database(data_dir, monkeypatch)
+
+    assert query.slice_totals([])["total"].tolist() == [6]
+
+
+def test_unknown_dimension_is_rejected(data_dir):
+    with pytest.raises(ValueError, match="Unknown dimensions: quarter"):
+        query.slice_totals(["region", "quarter"])
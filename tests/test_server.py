@@ -0,0 +1,93 @@
+import os
+import json
+import threading
+import http.client
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from api import server as api
+
+
+@pytest.fixture
+def marts_dir(tmp_path):
+    table = pa.table({"region": ["Kyiv", "Lviv"], "year": [2021, 2022], "total": [10, 20]})
+    pq.write_table(table, tmp_path / "region-year-total.parquet")
+    return tmp_path
+
+
+@pytest.fixture
+def get(marts_dir):
+    server = api.MartServer(("127.0.0.1", 0), str(marts_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def get(path, headers=None):
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response.status, response.getheader("ETag"), body
+
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("year", ["99999999999999999999", "-99999999999999999999", "0", "10000", "%C2%B2", "20x"])
+def test_invalid_year_answers_400(get, year):
+    status, _, body = get(f"/marts/region-year-total?year={year}")
+
+    assert status == 400
+    assert "year" in json.loads(body)["error"]
+
+
+def test_year_filter(get):
+    status, _, body = get("/marts/region-year-total?year=2022")
+
+    assert status == 200
+    assert json.loads(body)["data"] == [{"region": "Lviv", "year": 2022, "total": 20}]
+
+
+def test_etag_follows_served_ipc_copy(get, marts_dir):
+    _, parquet_etag, _ = get("/marts/region-year-total")
+
+    # Copy with different rows than the (unchanged) parquet file is served, so the ETag changes
+    ipc_path = str(marts_dir / "region-year-total.arrow")
+    feather.write_feather(pa.table({"region": ["Kyiv"], "year": [2021], "total": [11]}), ipc_path)
+    _, ipc_etag, body = get("/marts/region-year-total")
+    assert json.loads(body)["data"] == [{"region": "Kyiv", "year": 2021, "total": 11}]
+    assert ipc_etag != parquet_etag
+
+    # Copy older than the parquet file is outdated and not served
+    os.utime(ipc_path, (0, 0))
+    _, etag, body = get("/marts/region-year-total")
+    assert etag == parquet_etag
+    assert json.loads(body)["rows"] == 2
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", False),
+    ("gzip", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000, identity", False),
+    ("br;q=1.0, *;q=0.1", True),
+    ("*;q=0", False),
+    ("*, gzip;q=0", False),
+    ("gzip;q=high", False),
+])
+def test_accepts_gzip(accept_encoding, expected):
+    assert api.accepts_gzip(accept_encoding) is expected
+
+
+def test_gzip_refused_with_zero_q_value(get):
+    _, gzip_etag, _ = get("/marts/region-year-total", {"Accept-Encoding": "gzip"})
+    _, etag, body = get("/marts/region-year-total", {"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert gzip_etag.endswith('-gzip"')
+    assert not etag.endswith('-gzip"')
+    assert json.loads(body)["rows"] == 2